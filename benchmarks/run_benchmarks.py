@@ -0,0 +1,234 @@
+# benchmarks/run_benchmarks.py
+"""
+Reproducible performance benchmarks for the catalog, the simulator and the GA.
+
+Run from the repository root, e.g.:
+
+    python -m benchmarks.run_benchmarks --sizes 1000,10000 --seed 0 --output bench.json
+    python -m benchmarks.run_benchmarks --sizes 1000 --compare bench.json
+    python -m benchmarks.run_benchmarks --sizes 1000 --cold-start-only --compare bench.json
+
+Every benchmark uses synthetic catalogs and scenarios generated from `--seed`, and the
+results are written as JSON so runs of different commits can be compared.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import write_catalog, generate_scenarios
+from src.microservice_catalog import MicroserviceCatalog
+from src.composition_simulator import CompositionSimulator
+from src.genetic_algo_logic.ga_runner import MOGA_Runner
+
+# Modules the runtime core (catalog, simulator, GA core, CLI) must not import on its own: optional
+# extras, DEAP (only the list-based GA needs it) and asyncio (only live QoS providers need it)
+COLD_START_HEAVY_MODULES = ('pandas', 'deap', 'matplotlib', 'seaborn', 'pygad', 'asyncio')
+
+def _timed(func, repeat: int) -> tuple[float, object]:
+    # best-of-`repeat` wall clock (least disturbed by other load) plus the last result
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+def bench_catalog_load(path: str, repeat: int) -> tuple[dict, MicroserviceCatalog]:
+    seconds, catalog = _timed(lambda: MicroserviceCatalog(path), repeat)
+    return {'seconds': seconds, 'services': len(catalog), 'services_per_s': len(catalog) / seconds}, catalog
+
+def bench_scenario_construction(catalog: MicroserviceCatalog, num_scenarios: int, num_slots: int,
+                                seed: int, repeat: int) -> tuple[dict, list]:
+    seconds, scenarios = _timed(lambda: generate_scenarios(catalog, num_scenarios, num_slots, seed), repeat)
+    return {'seconds': seconds, 'scenarios': num_scenarios, 'slots': num_slots,
+            'scenarios_per_s': num_scenarios / seconds}, scenarios
+
+def bench_simulation(catalog: MicroserviceCatalog, scenario, num_compositions: int, seed: int, repeat: int) -> dict:
+    rng = np.random.default_rng(seed)
+    slot_options = scenario.get_slot_option_indices()
+    index_matrix = np.column_stack([options[rng.integers(0, len(options), size=num_compositions)]
+                                    for options in slot_options])
+    compositions = [[catalog.ids[i] for i in row] for row in index_matrix.tolist()]
+    simulator = CompositionSimulator(catalog)
+
+    scalar_seconds, _ = _timed(lambda: [simulator.calculate_composite_metrics(c) for c in compositions], repeat)
+    batch_seconds, _ = _timed(lambda: simulator.calculate_composite_metrics_batch(index_matrix), repeat)
+    return {
+        'compositions': num_compositions,
+        'scalar_seconds': scalar_seconds,
+        'scalar_per_s': num_compositions / scalar_seconds,
+        'batch_seconds': batch_seconds,
+        'batch_per_s': num_compositions / batch_seconds
+    }
+
+def bench_ga(catalog: MicroserviceCatalog, scenario, pop_size: int, num_generations: int, seed: int, repeat: int) -> dict:
+    simulator = CompositionSimulator(catalog)
+    results = {}
+    for mode in ('run', 'run_encoded'):
+        def run_once():
+            runner = MOGA_Runner(scenario, simulator)
+            random.seed(seed)
+            if mode == 'run':
+                front = runner.run(pop_size=pop_size, num_generations=num_generations)
+            else:
+                front = runner.run_encoded(pop_size=pop_size, num_generations=num_generations, seed=seed)
+            return runner, front
+        seconds, (runner, front) = _timed(run_once, repeat)
+        results[mode] = {
+            'seconds': seconds,
+            'evaluations': runner.evaluation_count,
+            'evaluations_per_s': runner.evaluation_count / seconds,
+            'pareto_front_size': len(front)
+        }
+    results['pop_size'] = pop_size
+    results['generations'] = num_generations
+    return results
+
+def _cold_seconds(argv: list[str], repeat: int) -> tuple[float, str]:
+    # best-of-`repeat` wall clock of a fresh interpreter running `argv`, plus its last stdout
+    timings = []
+    stdout = ''
+    for _ in range(repeat):
+        start = time.perf_counter()
+        stdout = subprocess.run([sys.executable] + argv, capture_output=True, text=True, check=True).stdout
+        timings.append(time.perf_counter() - start)
+    return min(timings), stdout
+
+def bench_cold_start(catalog_path: str, capabilities: list[str], repeat: int) -> dict:
+    """
+    Start-up cost of short-lived processes (CLI calls, pool workers), each in a fresh
+    interpreter: the bare interpreter, importing the runtime core, `src.cli --help`, and a
+    complete `src.cli optimize` of a small scenario. Also lists which of
+    COLD_START_HEAVY_MODULES the core import pulled in (should be none).
+    """
+    core = ('import json, sys; import src.cli, src.microservice_catalog, src.composition_simulator, '
+            'src.scenario_definition, src.genetic_algo_logic.ga_runner, src.genetic_algo_logic.exact_solver, '
+            'src.genetic_algo_logic.batch_optimizer; '
+            f'print(json.dumps([m for m in {COLD_START_HEAVY_MODULES!r} if m in sys.modules]))')
+    interpreter_seconds, _ = _cold_seconds(['-c', 'pass'], repeat)
+    import_seconds, loaded = _cold_seconds(['-c', core], repeat)
+    help_seconds, _ = _cold_seconds(['-m', 'src.cli', '--help'], repeat)
+    optimize_seconds, _ = _cold_seconds(['-m', 'src.cli', 'optimize', catalog_path, *capabilities,
+                                         '--pop-size', '50', '--generations', '5'], repeat)
+    return {
+        'interpreter_seconds': interpreter_seconds,
+        'import_core_seconds': import_seconds,
+        'cli_help_seconds': help_seconds,
+        'cli_optimize_seconds': optimize_seconds,
+        'heavy_modules_loaded': json.loads(loaded)
+    }
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_suite(args) -> dict:
+    report = {
+        'meta': {
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'seed': args.seed,
+            'repeat': args.repeat
+        },
+        'results': {}
+    }
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in args.sizes:
+            path = write_catalog(os.path.join(tmp_dir, f'catalog_{size}.json'), size, args.capabilities,
+                                 args.capabilities_per_service, args.seed)
+            if 'cold_start' not in report['results']:
+                # measured once, on the first catalog: it is about process start-up rather than catalog size
+                with contextlib.redirect_stdout(io.StringIO()):
+                    capabilities = MicroserviceCatalog(path).list_capabilities()[:3]
+                cold_start = bench_cold_start(path, capabilities, args.repeat)
+                report['results']['cold_start'] = cold_start
+                print(f"cold start: core import {cold_start['import_core_seconds']:.3f}s, CLI optimize "
+                      f"{cold_start['cli_optimize_seconds']:.3f}s, heavy modules {cold_start['heavy_modules_loaded']}",
+                      file=sys.stderr)
+                if args.cold_start_only:
+                    break
+            load, catalog = bench_catalog_load(path, args.repeat)
+            binary_path = os.path.join(tmp_dir, f'catalog_{size}')
+            catalog.save_binary(binary_path)
+            load_binary, _ = bench_catalog_load(binary_path, args.repeat)
+            scenario_result, scenarios = bench_scenario_construction(catalog, args.scenarios, args.slots, args.seed, args.repeat)
+            result = {
+                'catalog_load': load,
+                'catalog_load_binary': load_binary,
+                'scenario_construction': scenario_result,
+                'simulation': bench_simulation(catalog, scenarios[0], args.compositions, args.seed, args.repeat)
+            }
+            if not args.skip_ga:
+                result['ga'] = bench_ga(catalog, scenarios[0], args.pop_size, args.generations, args.seed, args.repeat)
+            report['results'][str(size)] = result
+            print(f"size {size}: catalog load {load['seconds']:.3f}s, "
+                  f"batch simulation {result['simulation']['batch_per_s']:.0f} compositions/s", file=sys.stderr)
+    return report
+
+def _flatten(result: dict, prefix: str = '') -> dict:
+    flat = {}
+    for key, value in result.items():
+        name = f'{prefix}{key}'
+        if isinstance(value, dict):
+            flat.update(_flatten(value, name + '.'))
+        elif isinstance(value, (int, float)):
+            flat[name] = value
+    return flat
+
+def compare(report: dict, baseline: dict):
+    #prints current/baseline ratios of every timing ("seconds") metric present in both reports.
+    current, previous = _flatten(report['results']), _flatten(baseline['results'])
+    print(f"{'metric':<60} {'baseline':>12} {'current':>12} {'ratio':>8}")
+    for name in sorted(current):
+        if 'seconds' in name and previous.get(name):
+            print(f"{name:<60} {previous[name]:>12.4f} {current[name]:>12.4f} {current[name] / previous[name]:>8.2f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark catalog loading, simulation and GA runs.")
+    parser.add_argument('--sizes', type=lambda text: [int(size) for size in text.split(',')], default=[1000, 10000],
+                        help="comma separated catalog sizes (number of services), 10^3 to 10^6")
+    parser.add_argument('--capabilities', type=int, default=50, help="size of the capability vocabulary")
+    parser.add_argument('--capabilities-per-service', type=float, default=2.0, help="mean capabilities per service (overlap)")
+    parser.add_argument('--scenarios', type=int, default=100, help="scenarios built per catalog")
+    parser.add_argument('--slots', type=int, default=8, help="capability slots per scenario")
+    parser.add_argument('--compositions', type=int, default=10000, help="compositions per simulation benchmark")
+    parser.add_argument('--pop-size', type=int, default=200)
+    parser.add_argument('--generations', type=int, default=20)
+    parser.add_argument('--skip-ga', action='store_true', help="skip the full GA runs")
+    parser.add_argument('--cold-start-only', action='store_true', help="only measure process start-up (core imports and CLI)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help="repetitions per benchmark, the best time is reported")
+    parser.add_argument('--output', help="write the JSON report to this file")
+    parser.add_argument('--compare', help="JSON report of a previous run to compare against")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args)
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(payload)
+    else:
+        print(payload)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+    return report
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# benchmarks/synthetic.py
+import json
+
+import numpy as np
+
+from src.microservice_catalog import MicroserviceCatalog
+from src.scenario_definition import ServiceScenario
+
+SERVICE_TYPES = ('authentication', 'payment', 'database', 'messaging', 'search', 'analytics', 'storage', 'notification')
+
+# services whose capabilities are drawn together, bounding the (services x capabilities) key matrix
+CAPABILITY_SAMPLE_BLOCK = 65536
+
+def generate_catalog_records(num_services: int, num_capabilities: int = 50, capabilities_per_service: float = 2.0,
+                             seed: int = 0) -> list[dict]:
+
+    # synthetic catalog entries in the data/microservices.json format.
+    # capabilities_per_service controls the overlap: every service draws 1 + Poisson(capabilities_per_service - 1)
+    # distinct capabilities from a Zipf-like popularity distribution, so some capabilities have many providers.
+
+    rng = np.random.default_rng(seed)
+    popularity = 1.0 / np.arange(1, num_capabilities + 1)
+    popularity /= popularity.sum()
+    counts = np.minimum(1 + rng.poisson(max(capabilities_per_service - 1.0, 0.0), size=num_services), num_capabilities)
+
+    latency = rng.lognormal(mean=3.5, sigma=0.8, size=num_services).round(1)
+    availability = (100.0 - rng.exponential(scale=0.5, size=num_services)).clip(90.0, 99.999).round(3)
+    throughput = rng.lognormal(mean=5.0, sigma=1.0, size=num_services).round(0).clip(1, None)
+    cost_per_request = rng.lognormal(mean=-6.5, sigma=1.0, size=num_services).round(6)
+    fixed_hourly_cost = rng.lognormal(mean=-2.5, sigma=1.0, size=num_services).round(4)
+    types = rng.integers(0, len(SERVICE_TYPES), size=num_services)
+
+    # Gumbel top-k: the k largest of log(popularity) + Gumbel noise are k distinct capabilities drawn
+    # like successive popularity-weighted draws without replacement, for all services of a block at once
+    max_count = int(counts.max(initial=1))
+    chosen = np.empty((num_services, max_count), dtype=np.int64)
+    for start in range(0, num_services, CAPABILITY_SAMPLE_BLOCK):
+        stop = min(start + CAPABILITY_SAMPLE_BLOCK, num_services)
+        keys = np.log(popularity) + rng.gumbel(size=(stop - start, num_capabilities))
+        chosen[start:stop] = np.argsort(-keys, axis=1)[:, :max_count]
+    # columns past a service's count sort to the end, so row i starts with its sorted capabilities
+    chosen = np.where(np.arange(max_count) < counts[:, None], chosen, num_capabilities)
+    chosen.sort(axis=1)
+
+    records = []
+    for i, row in enumerate(chosen.tolist()):
+        capabilities = row[:counts[i]]
+        records.append({
+            'id': f'svc-{i}',
+            'name': f'Synthetic Service {i}',
+            'type': SERVICE_TYPES[types[i]],
+            'capabilities': [f'cap_{c}' for c in capabilities],
+            'base_latency_ms': float(latency[i]),
+            'base_availability_percent': float(availability[i]),
+            'base_throughput_rps': float(throughput[i]),
+            'cost_per_request': float(cost_per_request[i]),
+            'fixed_hourly_cost': float(fixed_hourly_cost[i])
+        })
+    return records
+
+def write_catalog(path: str, num_services: int, num_capabilities: int = 50, capabilities_per_service: float = 2.0,
+                  seed: int = 0) -> str:
+    #writes a synthetic catalog as JSON and returns the path.
+    with open(path, 'w') as f:
+        json.dump(generate_catalog_records(num_services, num_capabilities, capabilities_per_service, seed), f)
+    return path
+
+def generate_scenarios(catalog: MicroserviceCatalog, num_scenarios: int, num_slots: int, seed: int = 0) -> list[ServiceScenario]:
+    #random scenarios whose required capabilities all have at least one provider in the catalog.
+    rng = np.random.default_rng(seed)
+    provided = catalog.list_capabilities()
+    num_slots = min(num_slots, len(provided))
+    scenarios = []
+    for s in range(num_scenarios):
+        capabilities = [provided[c] for c in rng.choice(len(provided), size=num_slots, replace=False)]
+        scenarios.append(ServiceScenario(f'synthetic-{s}', capabilities, catalog))
+    return scenarios
@@ -0,0 +1,314 @@
+# src/catalog_io.py
+import json
+import os
+from array import array
+from functools import partial
+
+import numpy as np
+
+# the catalog's numeric fields, in the order they are written to disk
+NUMERIC_FIELDS = ('base_latency_ms', 'base_availability_percent', 'base_throughput_rps',
+                  'cost_per_request', 'fixed_hourly_cost')
+
+# characters read from a JSON catalog per step of the streaming parser
+JSON_CHUNK_SIZE = 1 << 20
+
+# bumped whenever the layout of the binary catalog directory changes
+# (2: stored capability / type inverted indices and the live service count)
+BINARY_FORMAT_VERSION = 2
+READABLE_BINARY_FORMAT_VERSIONS = (1, 2)
+MANIFEST_FILE = 'manifest.json'
+
+_WHITESPACE = ' \t\n\r'
+# characters that can continue a JSON number
+_NUMBER_CHARACTERS = '0123456789.eE+-'
+
+def iter_json_array(path: str, chunk_size: int = JSON_CHUNK_SIZE):
+    # yields the elements of a top-level JSON array one at a time, reading the file in chunks,
+    # so the whole document never has to be held (or parsed) in memory at once.
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer, pos, eof = '', 0, False
+
+        def read_more():
+            nonlocal buffer, pos, eof
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+
+        def next_token() -> str:
+            # first non-whitespace character from `pos` on ('' at end of file)
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                    pos += 1
+                if pos < len(buffer) or eof:
+                    return buffer[pos:pos + 1]
+                read_more()
+
+        if next_token() != '[':
+            raise json.JSONDecodeError("Expecting '[' at the start of the catalog", buffer, pos)
+        pos += 1
+        if next_token() == ']':
+            return
+
+        while True:
+            next_token()
+            try:
+                element, end = decoder.raw_decode(buffer, pos)
+                # a number cut by the chunk boundary ('2.' of '2.5e3') decodes as a shorter one, so it is only
+                # complete once the character after it is known
+                complete = eof or (end < len(buffer) and buffer[end] not in _NUMBER_CHARACTERS)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                complete = False
+            if not complete:
+                read_more()
+                continue
+            pos = end
+            yield element
+
+            separator = next_token()
+            pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise json.JSONDecodeError("Expecting ',' or ']' between catalog entries", buffer, pos - 1)
+
+def read_json_columns(path: str, chunk_size: int = JSON_CHUNK_SIZE) -> dict:
+    # streams a JSON catalog straight into columnar buffers: string fields become lists and
+    # each numeric field a typed array, without materializing the list of record dicts.
+    ids, names, types, capabilities = [], [], [], []
+    numeric = {field: array('d') for field in NUMERIC_FIELDS}
+    appenders = [(field, numeric[field].append) for field in NUMERIC_FIELDS]
+    for record in iter_json_array(path, chunk_size):
+        ids.append(record['id'])
+        names.append(record['name'])
+        types.append(record['type'])
+        capabilities.append(record['capabilities'])
+        for field, append in appenders:
+            append(record[field])
+    return {
+        'ids': ids,
+        'names': names,
+        'types': types,
+        'capabilities': capabilities,
+        'numeric': {field: np.frombuffer(values, dtype=np.float64) if len(values) else np.empty(0)
+                    for field, values in numeric.items()}
+    }
+
+def columns_from_records(records: list[dict]) -> dict:
+    #the same columnar layout as read_json_columns, built from already parsed records.
+    return {
+        'ids': [rec['id'] for rec in records],
+        'names': [rec['name'] for rec in records],
+        'types': [rec['type'] for rec in records],
+        'capabilities': [rec['capabilities'] for rec in records],
+        'numeric': {field: np.fromiter((rec[field] for rec in records), dtype=np.float64, count=len(records))
+                    for field in NUMERIC_FIELDS}
+    }
+
+def _write_string_table(directory: str, name: str, strings: list[str]):
+    # string table: one UTF-8 blob plus int64 offsets (string i is blob[offsets[i]:offsets[i + 1]])
+    encoded = [s.encode('utf-8') for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    np.save(os.path.join(directory, f'{name}_offsets.npy'), offsets)
+    np.save(os.path.join(directory, f'{name}_data.npy'), np.frombuffer(b''.join(encoded), dtype=np.uint8))
+
+def _read_string_table(directory: str, name: str, mmap_mode: str | None) -> list[str]:
+    offsets = np.load(os.path.join(directory, f'{name}_offsets.npy'), mmap_mode=mmap_mode).tolist()
+    blob = np.load(os.path.join(directory, f'{name}_data.npy'), mmap_mode=mmap_mode).tobytes()
+    text = blob.decode('utf-8')
+    if len(text) == len(blob): # pure ASCII: byte offsets are character offsets, slice the decoded text
+        return [text[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+    return [blob[start:end].decode('utf-8') for start, end in zip(offsets[:-1], offsets[1:])]
+
+def _encode_labels(labels: list) -> tuple[list[str], np.ndarray]:
+    # dictionary encoding: distinct labels (first-appearance order) and one int32 code per entry
+    table = {}
+    codes = np.fromiter((table.setdefault(label, len(table)) for label in labels), dtype=np.int32, count=len(labels))
+    return list(table), codes
+
+def _write_inverted_index(directory: str, name: str, codes: np.ndarray, rows: np.ndarray, num_labels: int):
+    # label code -> ascending rows, as one rows array grouped by code plus int64 offsets per label
+    order = np.argsort(codes, kind='stable')
+    offsets = np.zeros(num_labels + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=num_labels), out=offsets[1:])
+    np.save(os.path.join(directory, f'{name}_members.npy'), np.ascontiguousarray(rows[order], dtype=np.int64))
+    np.save(os.path.join(directory, f'{name}_member_offsets.npy'), offsets)
+
+def _read_inverted_index(directory: str, name: str, labels: list[str], mmap_mode: str | None) -> dict[str, np.ndarray]:
+    members = np.load(os.path.join(directory, f'{name}_members.npy'), mmap_mode=mmap_mode)
+    bounds = np.load(os.path.join(directory, f'{name}_member_offsets.npy'), mmap_mode=mmap_mode).tolist()
+    return {label: members[start:end] for label, start, end in zip(labels, bounds[:-1], bounds[1:])}
+
+def write_binary_catalog(directory: str, columns: dict):
+    """
+    Writes catalog columns (as returned by read_json_columns) to `directory` in the binary
+    catalog format: one .npy file per numeric field, string tables for ids and names,
+    dictionary-encoded types, capabilities as CSR offsets into a capability table, and the
+    capability -> services and type -> services inverted indices over the live rows (a
+    duplicated id keeps its last row), so opening the catalog does not rebuild them.
+    """
+    os.makedirs(directory, exist_ok=True)
+    count = len(columns['ids'])
+    for field in NUMERIC_FIELDS:
+        np.save(os.path.join(directory, f'{field}.npy'), np.ascontiguousarray(columns['numeric'][field][:count], dtype=np.float64))
+    _write_string_table(directory, 'ids', columns['ids'])
+    _write_string_table(directory, 'names', columns['names'])
+
+    type_table, type_codes = _encode_labels(columns['types'])
+    _write_string_table(directory, 'type_table', type_table)
+    np.save(os.path.join(directory, 'type_codes.npy'), type_codes)
+
+    flat_capabilities = [cap for caps in columns['capabilities'] for cap in caps]
+    capability_table, capability_codes = _encode_labels(flat_capabilities)
+    capability_offsets = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum([len(caps) for caps in columns['capabilities']], out=capability_offsets[1:])
+    _write_string_table(directory, 'capability_table', capability_table)
+    np.save(os.path.join(directory, 'capability_codes.npy'), capability_codes)
+    np.save(os.path.join(directory, 'capability_offsets.npy'), capability_offsets)
+
+    live = np.zeros(count, dtype=bool)
+    live[list({ms_id: row for row, ms_id in enumerate(columns['ids'])}.values())] = True
+    capability_rows = np.repeat(np.arange(count), np.diff(capability_offsets))
+    capability_live = live[capability_rows]
+    _write_inverted_index(directory, 'capability', capability_codes[capability_live], capability_rows[capability_live],
+                          len(capability_table))
+    _write_inverted_index(directory, 'type', type_codes[live], np.flatnonzero(live), len(type_table))
+
+    # the manifest is written last, so a directory without one is an incomplete write
+    with open(os.path.join(directory, MANIFEST_FILE), 'w') as f:
+        json.dump({'format_version': BINARY_FORMAT_VERSION, 'count': count, 'live_count': int(live.sum()),
+                   'numeric_fields': list(NUMERIC_FIELDS)}, f)
+
+def is_binary_catalog(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, MANIFEST_FILE))
+
+def _read_types(directory: str, mmap_mode: str | None) -> list[str]:
+    type_table = np.array(_read_string_table(directory, 'type_table', mmap_mode), dtype=object)
+    return type_table[np.load(os.path.join(directory, 'type_codes.npy'), mmap_mode=mmap_mode)].tolist()
+
+def _read_capabilities(directory: str, mmap_mode: str | None) -> list[list[str]]:
+    capability_table = _read_string_table(directory, 'capability_table', mmap_mode)
+    capability_codes = np.load(os.path.join(directory, 'capability_codes.npy'), mmap_mode=mmap_mode)
+    bounds = np.load(os.path.join(directory, 'capability_offsets.npy'), mmap_mode=mmap_mode).tolist()
+    flat_capabilities = np.array(capability_table, dtype=object)[capability_codes].tolist()
+    return [flat_capabilities[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+def open_binary_catalog(directory: str, mmap_mode: str | None = 'r') -> dict:
+    """
+    Opens a binary catalog directory without decoding more than it has to. With the default
+    `mmap_mode='r'` the numeric columns are read-only memory maps, so every process opening
+    the same directory shares the pages through the OS cache. Only the ids are decoded; the
+    other string columns come as zero-argument loaders under 'strings' (picklable, so they can
+    travel with the catalog). Format 2 directories also give the stored inverted indices
+    ('capability_index', 'type_index': label -> ascending rows) and 'live_count'; for older
+    ones these are None.
+    """
+    with open(os.path.join(directory, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+    version = manifest.get('format_version')
+    if version not in READABLE_BINARY_FORMAT_VERSIONS:
+        raise ValueError(f"Error: Unsupported binary catalog format version {version} in {directory}.")
+
+    catalog = {
+        'ids': _read_string_table(directory, 'ids', mmap_mode),
+        'strings': {
+            'names': partial(_read_string_table, directory, 'names', mmap_mode),
+            'types': partial(_read_types, directory, mmap_mode),
+            'capabilities': partial(_read_capabilities, directory, mmap_mode)
+        },
+        'numeric': {field: np.load(os.path.join(directory, f'{field}.npy'), mmap_mode=mmap_mode)
+                    for field in NUMERIC_FIELDS},
+        'capability_index': None,
+        'type_index': None,
+        'live_count': manifest.get('live_count')
+    }
+    if version >= 2:
+        catalog['capability_index'] = _read_inverted_index(
+            directory, 'capability', _read_string_table(directory, 'capability_table', mmap_mode), mmap_mode)
+        catalog['type_index'] = _read_inverted_index(
+            directory, 'type', _read_string_table(directory, 'type_table', mmap_mode), mmap_mode)
+    return catalog
+
+def read_binary_catalog(directory: str, mmap_mode: str | None = 'r') -> dict:
+    """
+    Reads a binary catalog directory into the columns layout of read_json_columns, with every
+    string column decoded (see open_binary_catalog for the lazy variant the catalog uses).
+    """
+    catalog = open_binary_catalog(directory, mmap_mode)
+    columns = {'ids': catalog['ids'], 'numeric': catalog['numeric']}
+    columns.update({name: load() for name, load in catalog['strings'].items()})
+    return columns
+
+class CatalogDiff:
+
+    # changes between two versions of a catalog: new numeric values of existing services (only the fields that
+    # changed), new services (full records, as in a JSON catalog) and retired service ids.
+    # a service whose name, type or capabilities changed appears as retired and added again.
+
+    def __init__(self, updated: dict[str, dict] | None = None, added: list[dict] | None = None,
+                 removed: list[str] | None = None):
+        self.updated = updated or {}
+        self.added = added or []
+        self.removed = removed or []
+
+    def __len__(self) -> int:
+        return len(self.updated) + len(self.added) + len(self.removed)
+
+    def __repr__(self):
+        return f"CatalogDiff({len(self.updated)} updated, {len(self.added)} added, {len(self.removed)} removed)"
+
+    def to_dict(self) -> dict:
+        return {'updated': self.updated, 'added': self.added, 'removed': self.removed}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CatalogDiff':
+        return cls(data.get('updated'), data.get('added'), data.get('removed'))
+
+def diff_columns(old: dict, new: dict) -> CatalogDiff:
+    """
+    Diff between two sets of catalog columns (as returned by read_json_columns, or a catalog's
+    live rows), matched by service id. Numeric fields are compared as whole arrays.
+    """
+    old_index = {ms_id: i for i, ms_id in enumerate(old['ids'])}
+    new_index = {ms_id: i for i, ms_id in enumerate(new['ids'])}
+    removed = [ms_id for ms_id in old['ids'] if ms_id not in new_index]
+    common = [ms_id for ms_id in new['ids'] if ms_id in old_index]
+    added_rows = [new_index[ms_id] for ms_id in new['ids'] if ms_id not in old_index]
+
+    old_rows = np.array([old_index[ms_id] for ms_id in common], dtype=np.intp)
+    new_rows = np.array([new_index[ms_id] for ms_id in common], dtype=np.intp)
+    changed = {field: old['numeric'][field][old_rows] != new['numeric'][field][new_rows] for field in NUMERIC_FIELDS}
+    updated = {}
+    for position, ms_id in enumerate(common):
+        i, j = old_rows[position], new_rows[position]
+        if (old['names'][i], old['types'][i], list(old['capabilities'][i])) != (new['names'][j], new['types'][j], list(new['capabilities'][j])):
+            removed.append(ms_id)
+            added_rows.append(j)
+            continue
+        fields = {field: float(new['numeric'][field][j]) for field in NUMERIC_FIELDS if changed[field][position]}
+        if fields:
+            updated[ms_id] = fields
+
+    added = [{'id': new['ids'][j], 'name': new['names'][j], 'type': new['types'][j],
+              'capabilities': list(new['capabilities'][j]),
+              **{field: float(new['numeric'][field][j]) for field in NUMERIC_FIELDS}} for j in sorted(added_rows)]
+    return CatalogDiff(updated, added, removed)
+
+def convert_json_to_binary(json_path: str, directory: str, chunk_size: int = JSON_CHUNK_SIZE) -> int:
+    #streams a JSON catalog into a binary catalog directory and returns the number of services.
+    columns = read_json_columns(json_path, chunk_size)
+    write_binary_catalog(directory, columns)
+    return len(columns['ids'])
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) != 3:
+        print("Usage: python -m src.catalog_io <catalog.json> <binary catalog directory>")
+        sys.exit(1)
+    count = convert_json_to_binary(sys.argv[1], sys.argv[2])
+    print(f"Wrote {count} microservices to {sys.argv[2]}.")
@@ -0,0 +1,139 @@
+# src/cli.py
+import argparse
+import json
+import os
+import sys
+
+# Command line entry point: python -m src.cli <command> ...
+# Every command imports what it needs inside its handler, so `--help` and argument errors return
+# at interpreter speed and no command loads pandas or DEAP unless it actually uses them.
+
+# file and directory arguments, made absolute before use: MicroserviceCatalog resolves relative paths
+# against the repository root, but on the command line they are relative to the working directory
+PATH_ARGUMENTS = ('catalog', 'new_catalog', 'scenarios', 'output', 'workflow', 'json_catalog', 'directory')
+
+def _scenario_from_args(args, catalog):
+    #builds the ServiceScenario of the `optimize` command.
+    from src.composition_simulator import SLAConstraints
+    from src.scenario_definition import ServiceScenario
+    from src.workflow_model import workflow_from_dict
+
+    workflow = None
+    if args.workflow:
+        with open(args.workflow, 'r') as f:
+            workflow = workflow_from_dict(json.load(f))
+    sla = None
+    bounds = {'max_cost': args.max_cost, 'max_latency_ms': args.max_latency_ms,
+              'min_availability_percent': args.min_availability, 'min_throughput_rps': args.min_throughput,
+              'max_total_replicas': args.max_total_replicas, 'max_utilization': args.max_utilization}
+    if any(bound is not None for bound in bounds.values()):
+        sla = SLAConstraints(**bounds)
+    return ServiceScenario(args.name, args.capabilities, catalog, workflow=workflow, target_rps=args.target_rps, sla=sla,
+                           max_replicas=args.max_replicas)
+
+def cmd_optimize(args) -> int:
+    from src.microservice_catalog import MicroserviceCatalog
+    from src.composition_simulator import CompositionSimulator
+    from src.genetic_algo_logic.exact_solver import solve
+
+    catalog = MicroserviceCatalog(args.catalog)
+    scenario = _scenario_from_args(args, catalog)
+    ga_settings = {'pop_size': args.pop_size, 'num_generations': args.generations, 'seed': args.seed}
+    if args.adaptive:
+        from src.genetic_algo_logic.adaptive_control import AdaptiveControl
+        ga_settings['adaptive'] = AdaptiveControl()
+    limits = {name: getattr(args, name) for name in ('enumeration_max_size', 'branch_and_bound_max_size')
+              if getattr(args, name) is not None}
+    archive, method = solve(scenario, CompositionSimulator(catalog), **limits, **ga_settings)
+    payload = archive.to_json(args.output, list(scenario.required_capabilities))
+    print(f"{method}: {len(archive)} Pareto-optimal compositions" + (f", written to {args.output}" if args.output else ""))
+    if args.output is None and args.print_front:
+        print(payload)
+    return 0
+
+def cmd_batch(args) -> int:
+    from src.microservice_catalog import MicroserviceCatalog
+    from src.genetic_algo_logic.batch_optimizer import BatchOptimizer, load_scenario_specs
+
+    optimizer = BatchOptimizer(MicroserviceCatalog(args.catalog), n_workers=args.workers)
+    results = optimizer.optimize(load_scenario_specs(args.scenarios), output_path=args.output,
+                                 pop_size=args.pop_size, num_generations=args.generations, seed=args.seed)
+    for result in results:
+        print(f"- {result['name']}: {result['method']}, {len(result['front'])} Pareto-optimal compositions")
+    return 0
+
+def cmd_convert(args) -> int:
+    from src.catalog_io import convert_json_to_binary
+
+    count = convert_json_to_binary(args.json_catalog, args.directory)
+    print(f"Wrote {count} services to binary catalog {args.directory}.")
+    return 0
+
+def cmd_diff(args) -> int:
+    from src.microservice_catalog import MicroserviceCatalog
+
+    diff = MicroserviceCatalog(args.catalog).diff_from(args.new_catalog)
+    print(diff)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(diff.to_dict(), f, indent=2)
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m src.cli', description="Microservice composition optimizer.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    optimize = commands.add_parser('optimize', help="Pareto front of one scenario (exact solver or GA, by size)")
+    optimize.add_argument('catalog', help="JSON catalog or binary catalog directory")
+    optimize.add_argument('capabilities', nargs='+', help="required capabilities, one slot each")
+    optimize.add_argument('--name', default='CLI Scenario')
+    optimize.add_argument('--workflow', help="JSON file with the workflow (see workflow_model.workflow_from_dict)")
+    optimize.add_argument('--target-rps', type=float, help="evaluate under load (M/M/c) at this request rate")
+    optimize.add_argument('--max-replicas', type=int, help="replica cap per service under load (needs --target-rps)")
+    optimize.add_argument('--max-cost', type=float)
+    optimize.add_argument('--max-latency-ms', type=float)
+    optimize.add_argument('--min-availability', type=float, help="minimum availability in percent")
+    optimize.add_argument('--min-throughput', type=float, help="minimum throughput in requests per second")
+    optimize.add_argument('--max-total-replicas', type=float, help="replica budget of the composition (needs --target-rps)")
+    optimize.add_argument('--max-utilization', type=float, help="highest utilization of any service (needs --target-rps)")
+    optimize.add_argument('--pop-size', type=int, default=100)
+    optimize.add_argument('--generations', type=int, default=50)
+    optimize.add_argument('--seed', type=int, default=0)
+    optimize.add_argument('--adaptive', action='store_true', help="adaptive rates and early stopping for the GA")
+    optimize.add_argument('--enumeration-max-size', type=int, help="largest search space solved by enumeration")
+    optimize.add_argument('--branch-and-bound-max-size', type=int, help="largest search space of an SLA scenario solved by branch-and-bound (0 = GA only)")
+    optimize.add_argument('--output', help="write the front as JSON to this file")
+    optimize.add_argument('--print-front', action='store_true', help="print the front as JSON (without --output)")
+    optimize.set_defaults(handler=cmd_optimize)
+
+    batch = commands.add_parser('batch', help="optimize a JSON list of scenarios on one catalog")
+    batch.add_argument('catalog')
+    batch.add_argument('scenarios', help="JSON list of scenario specs (see batch_optimizer.load_scenario_specs)")
+    batch.add_argument('output', help="consolidated JSON results")
+    batch.add_argument('--workers', type=int, default=1)
+    batch.add_argument('--pop-size', type=int, default=100)
+    batch.add_argument('--generations', type=int, default=50)
+    batch.add_argument('--seed', type=int, default=0)
+    batch.set_defaults(handler=cmd_batch)
+
+    convert = commands.add_parser('convert', help="convert a JSON catalog to the memory-mapped binary format")
+    convert.add_argument('json_catalog')
+    convert.add_argument('directory')
+    convert.set_defaults(handler=cmd_convert)
+
+    diff = commands.add_parser('diff', help="diff of a catalog against a newer JSON catalog")
+    diff.add_argument('catalog')
+    diff.add_argument('new_catalog')
+    diff.add_argument('--output', help="write the CatalogDiff as JSON to this file")
+    diff.set_defaults(handler=cmd_diff)
+    return parser
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    for name in PATH_ARGUMENTS:
+        if getattr(args, name, None) is not None:
+            setattr(args, name, os.path.abspath(getattr(args, name)))
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,25 +1,290 @@
+import json
 import math
+from typing import TYPE_CHECKING
+
+import numpy as np
 from src.microservice_catalog import MicroserviceCatalog
 from src.microservice_model import Microservice
+from src.workflow_model import WorkflowPlan
+from src.load_model import LoadModel
+
+if TYPE_CHECKING:
+    # only for annotations: qos_providers pulls in asyncio and ssl, which plain simulations never need
+    from src.qos_providers import LiveQoSCache
+
+# order of the objectives in every fitness tuple
+METRIC_KEYS = ('total_cost', 'total_latency_ms', 'total_availability_percent', 'min_throughput_rps')
+# their directions (minimize cost and latency, maximize availability and throughput), also the weights of creator.FitnessMulti
+METRIC_WEIGHTS = (-1.0, -1.0, 1.0, 1.0)
+
+REQUESTS_PER_HOUR = 1000 # assumed load when turning the per-request cost into an hourly cost
+
+class SLAConstraints:
+
+    # hard service-level bounds on the composite metrics of a scenario (None = unconstrained).
+    # a composition violating any of them is infeasible: it ranks behind every feasible one and never
+    # enters the Pareto archive. the violation is the summed relative excess over the violated bounds,
+    # so infeasible compositions still rank by how far they are from meeting the SLA.
+    # `max_total_replicas` / `max_utilization` bound the deployment of load-aware scenarios (target_rps):
+    # they are not objectives, so the aggregation gives compositions over them the worst-case metrics,
+    # like services that cannot reach a stable queue, and with such bounds an infinite total cost counts
+    # as an infinite violation.
+
+    def __init__(self, max_cost: float | None = None, max_latency_ms: float | None = None,
+                 min_availability_percent: float | None = None, min_throughput_rps: float | None = None,
+                 max_total_replicas: float | None = None, max_utilization: float | None = None):
+        self.max_cost = max_cost
+        self.max_latency_ms = max_latency_ms
+        self.min_availability_percent = min_availability_percent
+        self.min_throughput_rps = min_throughput_rps
+        self.max_total_replicas = max_total_replicas
+        self.max_utilization = max_utilization
+        # metric key -> (is_upper_bound, bound), in METRIC_KEYS order (also the order they are computed in)
+        self.limits = {key: (upper, float(bound)) for key, upper, bound in (
+            ('total_cost', True, max_cost),
+            ('total_latency_ms', True, max_latency_ms),
+            ('total_availability_percent', False, min_availability_percent),
+            ('min_throughput_rps', False, min_throughput_rps)) if bound is not None}
+        # bounds on the extra metrics of the load-aware aggregation, same layout
+        self.load_limits = {key: (True, float(bound)) for key, bound in (
+            ('total_replicas', max_total_replicas),
+            ('max_utilization', max_utilization)) if bound is not None}
+
+    def __repr__(self):
+        bounds = ', '.join(f"{name}={value}" for name, value in (
+            ('max_cost', self.max_cost), ('max_latency_ms', self.max_latency_ms),
+            ('min_availability_percent', self.min_availability_percent),
+            ('min_throughput_rps', self.min_throughput_rps),
+            ('max_total_replicas', self.max_total_replicas),
+            ('max_utilization', self.max_utilization)) if value is not None)
+        return f"SLAConstraints({bounds})"
+
+    def metric_violation(self, key: str, values: np.ndarray) -> np.ndarray:
+        #relative excess of one metric over its bound (0 where met, inf for infinite cost / latency).
+        values = np.asarray(values, dtype=np.float64)
+        limit = self.limits.get(key) or self.load_limits.get(key)
+        if limit is None:
+            return np.zeros(values.shape)
+        upper, bound = limit
+        excess = values - bound if upper else bound - values
+        with np.errstate(invalid='ignore'):
+            return np.maximum(np.nan_to_num(excess / max(abs(bound), 1e-12), nan=np.inf), 0.0)
+
+    def violations(self, objectives: np.ndarray) -> np.ndarray:
+        #total violation per row of an (individuals x METRIC_KEYS) objective matrix, 0 = feasible.
+        objectives = np.asarray(objectives, dtype=np.float64).reshape(-1, len(METRIC_KEYS))
+        total = np.zeros(len(objectives))
+        for column, key in enumerate(METRIC_KEYS):
+            if key in self.limits:
+                total += self.metric_violation(key, objectives[:, column])
+        if self.load_limits:
+            total[~np.isfinite(objectives[:, METRIC_KEYS.index('total_cost')])] = np.inf
+        return total
+
+    def feasible(self, objectives: np.ndarray) -> np.ndarray:
+        return self.violations(objectives) <= 0.0
+
+def _worst_case_metrics(num_individuals: int) -> dict[str, np.ndarray]:
+    # the metrics of a composition without any valid service (and the metrics skipped for infeasible ones)
+    return {
+        'total_cost': np.full(num_individuals, np.inf),
+        'total_latency_ms': np.full(num_individuals, np.inf),
+        'total_availability_percent': np.zeros(num_individuals),
+        'min_throughput_rps': np.zeros(num_individuals)
+    }
+
+# series reducers over the gathered (rows x slots) per-service values, one per composite metric
+_SERIES_REDUCERS = {
+    'total_cost': lambda arrays, index, valid: np.where(valid, arrays['hourly_cost'][index], 0.0).sum(axis=1),
+    'total_latency_ms': lambda arrays, index, valid: np.where(valid, arrays['latency_ms'][index], 0.0).sum(axis=1),
+    'total_availability_percent': lambda arrays, index, valid: np.where(valid, arrays['availability'][index], 1.0).prod(axis=1) * 100.0,
+    'min_throughput_rps': lambda arrays, index, valid: np.where(valid, arrays['throughput_rps'][index], np.inf).min(axis=1)
+}
+
+def aggregate_composite_metrics(metric_arrays: dict[str, np.ndarray], index_matrix: np.ndarray,
+                                workflow_plan: WorkflowPlan | None = None,
+                                load_model: LoadModel | None = None,
+                                sla: SLAConstraints | None = None) -> dict[str, np.ndarray]:
+
+    # vectorized series aggregation over an (individuals x capability slots) matrix of catalog indices (-1 = unknown).
+    # cost and latency are gathered sums, availability a product and throughput the bottleneck min.
+    # with a compiled workflow plan (parallel / branch / loop structure) the plan aggregates instead.
+    # with a load model, services are first sized and slowed down for the target request rate, and
+    # 'total_replicas' / 'max_utilization' are returned as well.
+    # with SLA constraints, only the metrics needed to decide feasibility are computed for infeasible rows,
+    # the others get the worst-case values (see _aggregate_constrained_first); under a load model, rows
+    # over the SLA's replica / utilization bounds get the worst-case values as well.
+    # kept at module level so worker processes can run it on their own copy of `metric_arrays`.
+
+    if sla is not None and (sla.limits or (sla.load_limits and load_model is not None)):
+        return _aggregate_constrained_first(metric_arrays, index_matrix, workflow_plan, load_model, sla)
+    if load_model is not None:
+        return _aggregate_under_load(metric_arrays, index_matrix, workflow_plan, load_model)
+    if workflow_plan is not None:
+        return workflow_plan.aggregate(metric_arrays, index_matrix)
+    index_matrix = np.asarray(index_matrix, dtype=np.intp)
+    num_individuals = index_matrix.shape[0]
+    valid = index_matrix >= 0
+    has_services = valid.any(axis=1)
+
+    if not has_services.any():
+        return _worst_case_metrics(num_individuals)
+
+    safe_index = np.where(valid, index_matrix, 0)
+    total_cost = np.where(valid, metric_arrays['hourly_cost'][safe_index], 0.0).sum(axis=1)
+    total_latency_ms = np.where(valid, metric_arrays['latency_ms'][safe_index], 0.0).sum(axis=1)
+    total_availability_percent = np.where(valid, metric_arrays['availability'][safe_index], 1.0).prod(axis=1) * 100.0
+    min_throughput_rps = np.where(valid, metric_arrays['throughput_rps'][safe_index], np.inf).min(axis=1)
+
+    # same "worst case" metrics as the scalar path for rows without any valid service
+    empty = ~has_services
+    total_cost[empty] = np.inf
+    total_latency_ms[empty] = np.inf
+    total_availability_percent[empty] = 0.0
+    min_throughput_rps[empty] = 0.0
+
+    return {
+        'total_cost': total_cost,
+        'total_latency_ms': total_latency_ms,
+        'total_availability_percent': total_availability_percent,
+        'min_throughput_rps': min_throughput_rps
+    }
+
+def _aggregate_constrained_first(metric_arrays: dict[str, np.ndarray], index_matrix: np.ndarray,
+                                 workflow_plan: WorkflowPlan | None, load_model: LoadModel | None,
+                                 sla: SLAConstraints) -> dict[str, np.ndarray]:
+    # series: the constrained metrics are computed in full for every row first, and the remaining ones
+    # only for the rows that meet every bound; infeasible rows keep the worst case there (their violation,
+    # and so their rank, only depends on the constrained metrics). this saves the gathers of the
+    # unconstrained metrics for infeasible rows, not those of the constrained ones: no row is dropped
+    # part-way through its slots (bounding the slots still to come per row costs more NumPy passes than
+    # the gathers it skips). metrics of feasible rows are exactly the unconstrained path's.
+    # workflow / load: the summed fixed hourly cost is a lower bound of the total cost in every mode
+    # (invocations only scale the per-request part, replicas only multiply the fixed part), so rows
+    # over the cost bound skip the plan and the queueing model altogether and rank behind all others.
+    index_matrix = np.asarray(index_matrix, dtype=np.intp)
+    num_individuals = index_matrix.shape[0]
+    valid = index_matrix >= 0
+    metrics = _worst_case_metrics(num_individuals)
+    alive = np.flatnonzero(valid.any(axis=1))
+
+    if workflow_plan is None and load_model is None:
+        def reduce(key: str, rows: np.ndarray):
+            rows_valid = valid[rows]
+            metrics[key][rows] = _SERIES_REDUCERS[key](metric_arrays, np.where(rows_valid, index_matrix[rows], 0), rows_valid)
+
+        violation = np.zeros(len(alive))
+        for key in sla.limits:
+            reduce(key, alive)
+            violation += sla.metric_violation(key, metrics[key][alive])
+        feasible = alive[violation <= 0.0]
+        for key in METRIC_KEYS:
+            if key not in sla.limits and len(feasible):
+                reduce(key, feasible)
+        return metrics
+
+    if 'total_cost' in sla.limits and len(alive):
+        rows_valid = valid[alive]
+        fixed_cost = np.where(rows_valid, metric_arrays['fixed_hourly_cost'][np.where(rows_valid, index_matrix[alive], 0)], 0.0).sum(axis=1)
+        alive = alive[sla.metric_violation('total_cost', fixed_cost) <= 0.0]
+    if load_model is not None:
+        metrics['total_replicas'] = np.zeros(num_individuals)
+        metrics['max_utilization'] = np.zeros(num_individuals)
+    if len(alive):
+        survivors = aggregate_composite_metrics(metric_arrays, index_matrix[alive], workflow_plan, load_model)
+        for key, values in survivors.items():
+            metrics[key][alive] = values
+    if load_model is not None and sla.load_limits and len(alive):
+        violation = sum(sla.metric_violation(key, metrics[key][alive]) for key in sla.load_limits)
+        over = alive[violation > 0.0]
+        for key, values in _worst_case_metrics(len(over)).items():
+            metrics[key][over] = values
+    return metrics
+
+def _aggregate_under_load(metric_arrays: dict[str, np.ndarray], index_matrix: np.ndarray,
+                          workflow_plan: WorkflowPlan | None, load_model: LoadModel) -> dict[str, np.ndarray]:
+    index_matrix = np.asarray(index_matrix, dtype=np.intp)
+    valid = index_matrix >= 0
+    if not valid.any():
+        metrics = aggregate_composite_metrics(metric_arrays, index_matrix, workflow_plan)
+        metrics['total_replicas'] = np.zeros(len(index_matrix))
+        metrics['max_utilization'] = np.zeros(len(index_matrix))
+        return metrics
+
+    invocations = workflow_plan.invocations if workflow_plan is not None else None
+    loaded, remapped = load_model.loaded_metric_arrays(metric_arrays, index_matrix, invocations)
+    metrics = aggregate_composite_metrics(loaded, remapped, workflow_plan)
+    safe_index = np.where(valid, remapped, 0)
+    metrics['total_replicas'] = np.where(valid, loaded['replicas'][safe_index], 0.0).sum(axis=1)
+    metrics['max_utilization'] = np.where(valid, loaded['utilization'][safe_index], 0.0).max(axis=1)
+    return metrics
 
 class CompositionSimulator:
 
     #Simulates the aggregated QoS and Cost for a composite service based on selected individual microservices.
 
-    def __init__(self, microservice_catalog: MicroserviceCatalog):
+    def __init__(self, microservice_catalog: MicroserviceCatalog, live_qos: 'LiveQoSCache | None' = None):
         self.catalog = microservice_catalog
+        # optional live measurements; measured latency/availability/throughput replace the static base values
+        self.live_qos = live_qos
+        self._build_metric_arrays()
+
+    @property
+    def version(self) -> tuple:
+        # changes whenever the per-service metrics may have changed: catalog edits or a new live QoS snapshot.
+        return (self.catalog.version, self.live_qos.version if self.live_qos is not None else 0)
+
+    def changed_indices_since(self, version: tuple) -> np.ndarray | None:
+        # services whose metrics changed after `version` (see MicroserviceCatalog.changed_indices_since);
+        # None when unknown, in particular after any new live QoS snapshot.
+        if version[1] != self.version[1]:
+            return None
+        return self.catalog.changed_indices_since(version[0])
+
+    def _build_metric_arrays(self):
+        # per-service metric columns in catalog index order, derived once from the catalog's columnar storage.
+        self._metrics_version = self.version
+        columns = dict(self.catalog.columns)
+        if self.live_qos is not None:
+            for column, measured in self.live_qos.overlay().items():
+                columns[column] = np.where(np.isnan(measured), columns[column], measured)
+        request_cost = columns['cost_per_request'] * REQUESTS_PER_HOUR
+        self._metric_arrays = {
+            'hourly_cost': request_cost + columns['fixed_hourly_cost'],
+            'request_cost': request_cost, # per-request part, scaled by the invocations of a workflow plan
+            'fixed_hourly_cost': columns['fixed_hourly_cost'],
+            'cost_per_request': columns['cost_per_request'], # the load model prices the actual request volume
+            'latency_ms': columns['base_latency_ms'],
+            'availability': columns['base_availability_percent'] / 100.0,
+            'throughput_rps': columns['base_throughput_rps']
+        }
 
-    def calculate_composite_metrics(self, selected_microservice_ids: list[str]) -> dict:
+    def metric_arrays(self) -> dict[str, np.ndarray]:
+        # derived per-service arrays used by both paths, rebuilt if services or live measurements changed since.
+        if self._metrics_version != self.version:
+            self._build_metric_arrays()
+        return self._metric_arrays
+
+    def calculate_composite_metrics(self, selected_microservice_ids: list[str], workflow_plan: WorkflowPlan | None = None,
+                                    load_model: LoadModel | None = None, sla: SLAConstraints | None = None) -> dict:
 
         #finds aggregated QoS and total Cost for a given list of selected microservice IDs.
         # 'series' composition for latency and availability degradation, summation for cost. 
         # Throughput might be bottlenecked by the lowest.
+        # with a workflow plan (one ID per capability slot) the composition structure of the plan is used instead,
+        # with a load model the metrics under the scenario's target request rate, with SLA constraints the
+        # constrained batch path.
+
+        if workflow_plan is not None or load_model is not None or sla is not None:
+            batch = self.calculate_composite_metrics_batch(self.encode_compositions([selected_microservice_ids]),
+                                                           workflow_plan, load_model, sla)
+            return {key: values[0].item() for key, values in batch.items()}
         
-        selected_services: list[Microservice] = []
+        selected_services: list[int] = []
         for ms_id in selected_microservice_ids:
-            ms = self.catalog.get_microservice_by_id(ms_id)
-            if ms:
-                selected_services.append(ms)
+            index = self.catalog.index_of(ms_id)
+            if index >= 0:
+                selected_services.append(index)
             else:
                 print(f"Warning: Microservice with ID '{ms_id}' not found in catalog. Skipping.")
                 # You might want to assign a very high penalty cost/low QoS here
@@ -41,11 +306,13 @@ class CompositionSimulator:
         total_availability_product = 1.0 # For availability in series (multiplied)
         min_throughput_rps = float('inf') # Bottleneck for throughput
 
-        for ms in selected_services:
-            total_cost += (ms.cost_per_request * 1000) + ms.fixed_hourly_cost # assuming 1000 requests per hour for per-request cost
-            total_latency_ms += ms.base_latency_ms
-            total_availability_product *= (ms.base_availability_percent / 100.0) # Convert to decimal for multiplication
-            min_throughput_rps = min(min_throughput_rps, ms.base_throughput_rps)
+        # per-service values come from the derived metric arrays, so live QoS measurements apply here as well
+        metric_arrays = self.metric_arrays()
+        for index in selected_services:
+            total_cost += metric_arrays['hourly_cost'][index].item() # cost_per_request * REQUESTS_PER_HOUR + fixed_hourly_cost
+            total_latency_ms += metric_arrays['latency_ms'][index].item()
+            total_availability_product *= metric_arrays['availability'][index].item() # already a decimal for multiplication
+            min_throughput_rps = min(min_throughput_rps, metric_arrays['throughput_rps'][index].item())
 
         # convert back availability to percentage
         total_availability_percent = total_availability_product * 100.0
@@ -57,6 +324,29 @@ class CompositionSimulator:
             'min_throughput_rps': min_throughput_rps
         }
 
+    def encode_compositions(self, compositions: list[list[str]]) -> np.ndarray:
+
+        # turns lists of microservice IDs into an (individuals x capability slots) matrix of catalog indices.
+        # unknown IDs are encoded as -1 and skipped during aggregation, like in calculate_composite_metrics.
+
+        index_by_id = self.catalog.index_by_id
+        rows = [[index_by_id.get(ms_id, -1) for ms_id in composition] for composition in compositions]
+        if not rows:
+            return np.empty((0, 0), dtype=np.intp)
+        index_matrix = np.array(rows, dtype=np.intp)
+        if (index_matrix < 0).any():
+            print(f"Warning: {int((index_matrix < 0).sum())} microservice ID(s) not found in catalog. Skipping.")
+        return index_matrix
+
+    def calculate_composite_metrics_batch(self, index_matrix: np.ndarray, workflow_plan: WorkflowPlan | None = None,
+                                          load_model: LoadModel | None = None,
+                                          sla: SLAConstraints | None = None) -> dict[str, np.ndarray]:
+
+        # vectorized counterpart of calculate_composite_metrics for a whole population at once.
+        # index_matrix holds one row per individual and one catalog index per capability slot (-1 = unknown).
+
+        return aggregate_composite_metrics(self.metric_arrays(), index_matrix, workflow_plan, load_model, sla)
+
 if __name__ == "__main__":
     catalog = MicroserviceCatalog()
     simulator = CompositionSimulator(catalog)
@@ -77,4 +367,10 @@ if __name__ == "__main__":
     composition_ids_3 = ["non-existent-id", "auth-v1"]
     metrics_3 = simulator.calculate_composite_metrics(composition_ids_3)
     print("\n--- Composition 3 Metrics (Invalid ID + Auth V1) ---")
-    print(json.dumps(metrics_3, indent=2))
\ No newline at end of file
+    print(json.dumps(metrics_3, indent=2))
+
+    #Whole population in one vectorized pass
+    index_matrix = simulator.encode_compositions([composition_ids_1, composition_ids_2])
+    batch_metrics = simulator.calculate_composite_metrics_batch(index_matrix)
+    print("\n--- Batch Metrics (Composition 1 + 2) ---")
+    print({key: values.tolist() for key, values in batch_metrics.items()})
\ No newline at end of file
@@ -0,0 +1,38 @@
+# src/dominance.py
+import numpy as np
+
+# Pareto dominance between weighted objective rows, shared by the scenario's option pruning, the
+# exact solver and the Pareto archive (kept outside the GA package so scenarios do not depend on it).
+
+# Candidate rows compared against the dominators per broadcast block
+ARCHIVE_BLOCK_ROWS = 1024
+
+# Dominator rows tried per round before dominated candidates are dropped
+DOMINATOR_BLOCK_ROWS = 64
+
+def dominated_mask(dominators: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+    """
+    For weighted objective rows (larger is better), flags every row of `candidates`
+    that is dominated by at least one row of `dominators`.
+    Dominators are tried in blocks and candidates found dominated drop out of later blocks,
+    so batches that are mostly dominated cost far less than the full comparison.
+    """
+    mask = np.zeros(len(candidates), dtype=bool)
+    if len(dominators) == 0 or len(candidates) == 0:
+        return mask
+    remaining = np.arange(len(candidates))
+    for start in range(0, len(dominators), DOMINATOR_BLOCK_ROWS):
+        block = dominators[start:start + DOMINATOR_BLOCK_ROWS]
+        for offset in range(0, len(remaining), ARCHIVE_BLOCK_ROWS):
+            rows = remaining[offset:offset + ARCHIVE_BLOCK_ROWS]
+            worse = np.zeros((len(block), len(rows)), dtype=bool)
+            better = np.zeros_like(worse)
+            for obj in range(candidates.shape[1]):
+                column = candidates[rows, obj]
+                worse |= block[:, obj, None] < column[None, :]
+                better |= block[:, obj, None] > column[None, :]
+            mask[rows] = (better & ~worse).any(axis=0)
+        remaining = remaining[~mask[remaining]]
+        if len(remaining) == 0:
+            break
+    return mask
@@ -0,0 +1,190 @@
+# src/genetic_algo_logic/adaptive_control.py
+import numpy as np
+
+from src.genetic_algo_logic.pareto_archive import ParetoArchive, hypervolume_reference
+
+# Progress below which a generation counts as stagnating: relative hypervolume gain, or share of new front members
+DEFAULT_TOLERANCE = {'hypervolume': 1e-3, 'front_change': 0.05}
+
+class AdaptiveControl:
+    """
+    Convergence-based parameter control and early stopping for MOGA_Runner.run / run_encoded.
+
+    After every generation `update` measures the progress of the archive. With
+    measure='hypervolume' it is the relative hypervolume gain over the previous generation,
+    with the reference point fixed from the first non-empty front. With
+    measure='front_change' it is the share of archive members that are new in that
+    generation, which is cheaper and needs no reference point.
+
+    The rates follow the progress. A generation that improves by at least `tolerance`
+    (default: DEFAULT_TOLERANCE of the measure) shifts towards exploitation: mutation and
+    per-gene swap probability shrink by `step` and crossover grows. A stagnating one does
+    the opposite to explore more. All rates stay within their (low, high) bounds. Once
+    `min_generations` have run and progress has stayed below `tolerance` for `window`
+    generations in a row, `update` returns True and the run stops early.
+
+    `state_dict` / `load_state` carry the configuration and the run state (rates,
+    stagnation counter, reference point, history) through a checkpoint, so a resumed run
+    adapts and stops exactly like the uninterrupted one.
+
+    `summary` reports the evaluations actually requested next to the budget of the fixed
+    run. That budget is extrapolated from the evaluations per generation so far, since
+    encoded runs only evaluate modified rows. `history` keeps one entry per generation.
+    """
+    def __init__(self, measure: str = 'hypervolume', tolerance: float | None = None, window: int = 10,
+                 min_generations: int = 10, step: float = 1.2,
+                 cx_bounds: tuple = (0.5, 0.95), mut_bounds: tuple = (0.05, 0.6), indpb_bounds: tuple = (0.02, 0.5)):
+        if measure not in ('hypervolume', 'front_change'):
+            raise ValueError(f"Error: Unknown progress measure '{measure}', use 'hypervolume' or 'front_change'.")
+        if window < 1 or step <= 1.0:
+            raise ValueError("Error: AdaptiveControl needs window >= 1 and step > 1.")
+        self.measure = measure
+        self.tolerance = tolerance if tolerance is not None else DEFAULT_TOLERANCE[measure]
+        self.window = window
+        self.min_generations = min_generations
+        self.step = step
+        self.cx_bounds = cx_bounds
+        self.mut_bounds = mut_bounds
+        self.indpb_bounds = indpb_bounds
+        self.summary = None
+        self.history = []
+
+    def start(self, runner, pop_size: int, num_generations: int, cx_prob: float, mut_prob: float, indpb: float):
+        """Resets the controller for a new run with the run's initial rates."""
+        self.cx_prob = float(np.clip(cx_prob, *self.cx_bounds))
+        self.mut_prob = float(np.clip(mut_prob, *self.mut_bounds))
+        self.indpb = float(np.clip(indpb, *self.indpb_bounds))
+        self.num_generations = num_generations
+        self.pop_size = pop_size
+        self.summary = None
+        self.history = []
+        self._first_evaluation = runner.evaluation_count
+        self._initial_evaluations = None
+        self._reference = None
+        self._previous_hypervolume = None
+        self._previous_members = None
+        self._stagnant = 0
+
+    def _progress(self, archive: ParetoArchive) -> float | None:
+        # relative improvement of this generation, None while there is nothing to compare (empty archive)
+        if len(archive) == 0:
+            return None
+        if self.measure == 'front_change':
+            members = {row.tobytes() for row in archive.genotypes}
+            previous, self._previous_members = self._previous_members, members
+            if previous is None:
+                return None
+            return len(members - previous) / len(members)
+
+        if self._reference is None:
+            self._reference = hypervolume_reference(archive.objectives, archive.weights)
+        volume = archive.hypervolume(self._reference)
+        previous, self._previous_hypervolume = self._previous_hypervolume, volume
+        if previous is None:
+            return None
+        if previous <= 0.0:
+            return np.inf if volume > 0.0 else 0.0
+        return (volume - previous) / previous
+
+    def update(self, runner, generation: int, archive: ParetoArchive) -> bool:
+        """
+        Records the progress of `generation` (0 = initial population), adapts the rates and
+        returns True if the run should stop.
+        """
+        if self._initial_evaluations is None:
+            self._initial_evaluations = runner.evaluation_count - self._first_evaluation
+        progress = self._progress(archive)
+        if progress is not None and generation > 0:
+            if progress >= self.tolerance:
+                self._stagnant = 0
+                factor = 1.0 / self.step # exploit: less disruption, more recombination
+            else:
+                self._stagnant += 1
+                factor = self.step # explore
+            self.mut_prob = float(np.clip(self.mut_prob * factor, *self.mut_bounds))
+            self.indpb = float(np.clip(self.indpb * factor, *self.indpb_bounds))
+            self.cx_prob = float(np.clip(self.cx_prob / factor, *self.cx_bounds))
+        self.history.append({'generation': generation, 'progress': progress, 'cx_prob': self.cx_prob,
+                             'mut_prob': self.mut_prob, 'indpb': self.indpb})
+        return self.converged(generation)
+
+    def converged(self, generation: int) -> bool:
+        """True once the stopping rule holds after `generation`."""
+        return generation >= self.min_generations and self._stagnant >= self.window
+
+    def state_dict(self) -> dict:
+        """Configuration and run state as plain JSON values, for checkpoints."""
+        return {
+            'config': {'measure': self.measure, 'tolerance': self.tolerance, 'window': self.window,
+                       'min_generations': self.min_generations, 'step': self.step,
+                       'cx_bounds': list(self.cx_bounds), 'mut_bounds': list(self.mut_bounds),
+                       'indpb_bounds': list(self.indpb_bounds)},
+            'cx_prob': self.cx_prob,
+            'mut_prob': self.mut_prob,
+            'indpb': self.indpb,
+            'num_generations': self.num_generations,
+            'pop_size': self.pop_size,
+            'first_evaluation': self._first_evaluation,
+            'initial_evaluations': self._initial_evaluations,
+            'reference': None if self._reference is None else self._reference.tolist(),
+            'previous_hypervolume': self._previous_hypervolume,
+            'has_previous_members': self._previous_members is not None,
+            'stagnant': self._stagnant,
+            'history': self.history
+        }
+
+    @classmethod
+    def from_state(cls, state: dict, archive: ParetoArchive) -> 'AdaptiveControl':
+        """New controller with the configuration of a `state_dict`, positioned at its run state."""
+        config = dict(state['config'])
+        for name in ('cx_bounds', 'mut_bounds', 'indpb_bounds'):
+            config[name] = tuple(config[name])
+        controller = cls(**config)
+        controller.load_state(state, archive)
+        return controller
+
+    def load_state(self, state: dict, archive: ParetoArchive):
+        """
+        Restores the run state of a `state_dict`. `archive` is the checkpointed archive: the
+        front-change measure compares against its members, which is exactly what the
+        controller had seen at that generation.
+        """
+        self.cx_prob = state['cx_prob']
+        self.mut_prob = state['mut_prob']
+        self.indpb = state['indpb']
+        self.num_generations = state['num_generations']
+        self.pop_size = state['pop_size']
+        self.summary = None
+        self.history = [dict(entry) for entry in state['history']]
+        self._first_evaluation = state['first_evaluation']
+        self._initial_evaluations = state['initial_evaluations']
+        self._reference = None if state['reference'] is None else np.array(state['reference'], dtype=np.float64)
+        self._previous_hypervolume = state['previous_hypervolume']
+        self._previous_members = ({row.tobytes() for row in archive.genotypes}
+                                  if state['has_previous_members'] else None)
+        self._stagnant = state['stagnant']
+
+    def finish(self, runner, last_generation: int) -> dict:
+        """Builds (and prints) the summary of evaluations used vs the fixed budget of `num_generations`."""
+        evaluations = runner.evaluation_count - self._first_evaluation
+        initial = self._initial_evaluations or 0
+        per_generation = (evaluations - initial) / last_generation if last_generation > 0 else float(self.pop_size)
+        budget = initial + per_generation * self.num_generations
+        saved = max(budget - evaluations, 0.0)
+        self.summary = {
+            'generations_run': last_generation,
+            'num_generations': self.num_generations,
+            'stopped_early': last_generation < self.num_generations,
+            'evaluations': evaluations,
+            'estimated_fixed_budget': int(round(budget)),
+            'evaluations_saved': int(round(saved)),
+            'evaluations_saved_percent': 100.0 * saved / budget if budget else 0.0,
+            'final_rates': {'cx_prob': self.cx_prob, 'mut_prob': self.mut_prob, 'indpb': self.indpb}
+        }
+        if self.summary['stopped_early']:
+            print(f"Adaptive control: converged after {last_generation}/{self.num_generations} generations, "
+                  f"{evaluations} evaluations instead of ~{self.summary['estimated_fixed_budget']} "
+                  f"(saved ~{self.summary['evaluations_saved']}, {self.summary['evaluations_saved_percent']:.1f}%).")
+        else:
+            print(f"Adaptive control: ran all {self.num_generations} generations ({evaluations} evaluations).")
+        return self.summary
@@ -0,0 +1,291 @@
+# src/genetic_algo_logic/batch_optimizer.py
+import json
+import os
+import time
+
+import numpy as np
+
+from src.microservice_catalog import MicroserviceCatalog
+from src.composition_simulator import CompositionSimulator, SLAConstraints
+from src.scenario_definition import ServiceScenario
+from src.workflow_model import WorkflowNode, workflow_from_dict
+from src.genetic_algo_logic.fitness_cache import FitnessCache
+from src.genetic_algo_logic.exact_solver import solve
+
+# Scenarios handed to a worker per task: consecutive scenarios (sorted by capabilities) share a worker's
+# warm fitness cache
+SCENARIOS_PER_TASK = 8
+
+# Consecutive scenarios (sorted by capabilities) that warm-start from each other's fronts. Tasks hold
+# whole chains, so results do not depend on the number of workers or on scenarios_per_task
+WARM_START_CHAIN = 8
+
+# Share of the population seeded from fronts of earlier scenarios with overlapping capabilities
+WARM_START_FRACTION = 0.5
+
+# Solver limits of a batch (see exact_solver.solve): an exact solution should cost about as much as the GA
+# run it replaces (well under a second, i.e. ~200k enumerated compositions), not the seconds a single
+# scenario may take
+BATCH_ENUMERATION_MAX_SIZE = 200_000
+BATCH_BRANCH_AND_BOUND_MAX_SIZE = 1_000_000
+
+# Per-process shared state, installed once by the pool initializer (or by the serial path)
+_batch_state = None
+
+def scenario_spec(scenario: ServiceScenario) -> dict:
+    """Constructor arguments of a scenario without its catalog, so it can be rebuilt in a worker."""
+    load = scenario.load_model
+    return {
+        'name': scenario.name,
+        'required_capabilities': list(scenario.required_capabilities),
+        'workflow': scenario.workflow,
+        'target_rps': scenario.target_rps,
+        'target_utilization': load.target_utilization if load is not None else 0.7,
+        'max_replicas': load.max_replicas if load is not None else None,
+        'sla': scenario.sla
+    }
+
+def scenario_from_spec(spec: dict, catalog: MicroserviceCatalog) -> ServiceScenario:
+    """
+    Builds a scenario on `catalog` from a spec as returned by `scenario_spec` or read from JSON
+    (there `workflow` is the dict form of workflow_model.workflow_from_dict and `sla` a dict of
+    SLAConstraints arguments).
+    """
+    workflow = spec.get('workflow')
+    if workflow is not None and not isinstance(workflow, WorkflowNode):
+        workflow = workflow_from_dict(workflow)
+    sla = spec.get('sla')
+    if isinstance(sla, dict):
+        sla = SLAConstraints(**sla)
+    return ServiceScenario(spec['name'], list(spec['required_capabilities']), catalog, workflow=workflow,
+                           target_rps=spec.get('target_rps'), target_utilization=spec.get('target_utilization', 0.7),
+                           sla=sla, max_replicas=spec.get('max_replicas'))
+
+def load_scenario_specs(path: str) -> list[dict]:
+    #reads a JSON list of scenario specs: {"name", "required_capabilities", optional "workflow", "target_rps",
+    # "target_utilization", "max_replicas", "sla"}.
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def _init_batch_worker(catalog: MicroserviceCatalog, cache_size: int):
+    """
+    Pool initializer: one catalog, simulator (metric arrays) and fitness cache per worker, shared by
+    every scenario the worker optimizes. A memory-mapped binary catalog travels as its path only.
+    """
+    global _batch_state
+    simulator = CompositionSimulator(catalog)
+    _batch_state = {
+        'catalog': catalog,
+        'simulator': simulator,
+        'fitness_cache': FitnessCache(catalog, maxsize=cache_size, simulator=simulator)
+    }
+
+def _warm_start_rows(scenario: ServiceScenario, solved: list[tuple[list[str], np.ndarray]], limit: int) -> np.ndarray | None:
+    # rows of catalog indices for `scenario` taken from earlier fronts: every slot whose capability the
+    # earlier scenario also had gets that scenario's choice, the other slots stay -1 (random gene)
+    rows = []
+    for capabilities, genotypes in reversed(solved):
+        columns = [capabilities.index(cap) if cap in capabilities else -1 for cap in scenario.required_capabilities]
+        if all(column < 0 for column in columns):
+            continue
+        for genotype in genotypes.tolist():
+            rows.append([genotype[column] if column >= 0 else -1 for column in columns])
+            if len(rows) >= limit:
+                return np.array(rows, dtype=np.int64)
+    return np.array(rows, dtype=np.int64) if rows else None
+
+def _optimize_group(task: list[list[tuple[int, dict]]], settings: dict) -> dict:
+    """
+    Worker task: optimizes the warm-start chains of (position, spec) scenarios in `task` one
+    after another with the worker's shared catalog, simulator and fitness cache. Later scenarios
+    of a chain are warm-started from the fronts of earlier ones of the same chain that share
+    capabilities. Returns the results with the worker's process id and its cache statistics.
+    """
+    state = _batch_state
+    catalog, simulator, fitness_cache = state['catalog'], state['simulator'], state['fitness_cache']
+    results = []
+    for chain in task:
+        results.extend(_optimize_chain(chain, settings, catalog, simulator, fitness_cache))
+    return {'worker': os.getpid(), 'results': results, 'fitness_cache': fitness_cache.stats()}
+
+def _optimize_chain(chain: list[tuple[int, dict]], settings: dict, catalog: MicroserviceCatalog,
+                    simulator: CompositionSimulator, fitness_cache: FitnessCache) -> list[dict]:
+    solved = []
+    results = []
+    for position, spec in chain:
+        start = time.perf_counter()
+        hits_before = fitness_cache.hits
+        scenario = scenario_from_spec(spec, catalog)
+        ga_settings = dict(settings)
+        if ga_settings.get('seed') is not None:
+            ga_settings['seed'] += position
+        warm_rows = None
+        if settings.get('warm_start', True):
+            warm_rows = _warm_start_rows(scenario, solved, int(settings['pop_size'] * WARM_START_FRACTION))
+            if warm_rows is not None:
+                ga_settings['initial_population'] = warm_rows
+        ga_settings.pop('warm_start', None)
+
+        archive, method = solve(scenario, simulator, fitness_cache=fitness_cache, **ga_settings)
+        solved.append((list(scenario.required_capabilities), archive.genotypes))
+        result = {
+            'position': position,
+            'name': scenario.name,
+            'required_capabilities': list(scenario.required_capabilities),
+            'method': method,
+            'warm_started_rows': 0 if warm_rows is None or method != 'ga' else len(warm_rows),
+            'seconds': time.perf_counter() - start,
+            'front': archive.to_records()
+        }
+        if method == 'ga': # the exact solvers simulate every composition they visit, without the cache
+            result['fitness_cache_hits'] = fitness_cache.hits - hits_before
+        results.append(result)
+    return results
+
+class BatchOptimizer:
+    """
+    Optimizes many scenarios against one catalog per planning cycle.
+
+    The catalog is loaded once and shared by every scenario, together with its capability
+    index, the simulator's metric arrays and one fitness cache. Cache keys are namespaced by
+    the scenario's evaluation signature, so scenarios that evaluate compositions the same way
+    reuse each other's fitnesses. Each scenario goes through exact_solver.solve with the
+    batch's smaller size limits, so small ones get their exact front and the rest the GA.
+    Only GA runs use the cache, so its statistics are reported only when a GA ran.
+
+    Results are reused across scenarios in two ways. Duplicates (same capability slots and
+    evaluation signature) are solved once and the front is copied. Scenarios are ordered by
+    their capabilities and cut into chains of `warm_start_chain`, within which GA runs
+    warm-start from fronts of earlier scenarios with common capabilities. Tasks hold whole
+    chains (`scenarios_per_task` rounded down to whole chains, at least one), so overlapping
+    scenarios usually share a worker and its warm cache, and the fronts only depend on the
+    scenarios, the GA settings and the chain length, not on `n_workers` or
+    `scenarios_per_task`. Without warm starts, chains are single scenarios.
+
+    With `n_workers` > 1 the tasks run on a process pool, and each worker receives the
+    catalog once. A memory-mapped binary catalog is sent as its path, so the mapped pages are
+    shared. Each worker then has its own cache, and the run info reports the statistics of
+    each. With one worker everything runs in-process on a single cache.
+    """
+    def __init__(self, catalog: MicroserviceCatalog, n_workers: int | None = 1, cache_size: int = 500_000,
+                 scenarios_per_task: int = SCENARIOS_PER_TASK, warm_start_chain: int = WARM_START_CHAIN):
+        self.catalog = catalog
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.cache_size = cache_size
+        self.scenarios_per_task = scenarios_per_task
+        self.warm_start_chain = warm_start_chain
+        self._local_state = None
+
+    def _use_local_state(self):
+        # in-process runs keep their simulator and fitness cache across optimize() calls, so the next
+        # planning cycle starts warm (after a catalog diff the cache drops only the entries of changed services)
+        global _batch_state
+        if self._local_state is None:
+            _init_batch_worker(self.catalog, self.cache_size)
+            self._local_state = _batch_state
+        _batch_state = self._local_state
+
+    def _tasks(self, specs: list[dict], warm_start: bool) -> tuple[list[list[list[tuple[int, dict]]]], dict[int, int]]:
+        # unique scenarios sorted by capabilities, cut into warm-start chains and grouped into tasks,
+        # plus duplicate position -> original position
+        first_by_key = {}
+        duplicates = {}
+        unique = []
+        for position, spec in enumerate(specs):
+            scenario_key = (tuple(spec['required_capabilities']), repr(spec.get('workflow')), spec.get('target_rps'),
+                            spec.get('target_utilization', 0.7), spec.get('max_replicas'), repr(spec.get('sla')))
+            if scenario_key in first_by_key:
+                duplicates[position] = first_by_key[scenario_key]
+            else:
+                first_by_key[scenario_key] = position
+                unique.append((position, spec))
+        unique.sort(key=lambda item: sorted(item[1]['required_capabilities']))
+        chain = max(1, self.warm_start_chain) if warm_start else 1
+        chains = [unique[start:start + chain] for start in range(0, len(unique), chain)]
+        per_task = max(1, self.scenarios_per_task // chain)
+        return [chains[start:start + per_task] for start in range(0, len(chains), per_task)], duplicates
+
+    def optimize(self, scenarios: list, output_path: str | None = None, pop_size: int = 100, num_generations: int = 50,
+                 cx_prob: float = 0.7, mut_prob: float = 0.2, indpb: float = 0.1, seed: int | None = 0,
+                 warm_start: bool = True, enumeration_max_size: int = BATCH_ENUMERATION_MAX_SIZE,
+                 branch_and_bound_max_size: int = BATCH_BRANCH_AND_BOUND_MAX_SIZE) -> list[dict]:
+        """
+        Optimizes every scenario (ServiceScenario objects or spec dicts) and returns one result per
+        scenario in input order: name, capabilities, the method used ('enumeration',
+        'branch_and_bound', 'ga' or 'duplicate'), timing and the Pareto front as records. GA runs
+        of scenario i use `seed + i`, and their results also report 'fitness_cache_hits'. The size
+        limits choose between the exact solvers and the GA per scenario (see exact_solver.solve;
+        0 forces the GA). With `output_path` the results are also written there as one
+        consolidated JSON file, whose run info has the cache statistics of every worker if any
+        scenario ran the GA.
+        """
+        specs = [scenario_spec(s) if isinstance(s, ServiceScenario) else s for s in scenarios]
+        tasks, duplicates = self._tasks(specs, warm_start)
+        settings = {'pop_size': pop_size, 'num_generations': num_generations, 'cx_prob': cx_prob,
+                    'mut_prob': mut_prob, 'indpb': indpb, 'seed': seed, 'warm_start': warm_start,
+                    'enumeration_max_size': enumeration_max_size, 'branch_and_bound_max_size': branch_and_bound_max_size}
+        print(f"--- Batch optimization of {len(specs)} scenarios ({len(duplicates)} duplicates) "
+              f"in {len(tasks)} tasks on {self.n_workers} worker(s) ---")
+
+        start = time.perf_counter()
+        by_position = {}
+        if self.n_workers == 1 or len(tasks) <= 1:
+            self._use_local_state()
+            outputs = [_optimize_group(task, settings) for task in tasks]
+        else:
+            from concurrent.futures import ProcessPoolExecutor # deferred: serial batches never start a pool
+            with ProcessPoolExecutor(max_workers=self.n_workers, initializer=_init_batch_worker,
+                                     initargs=(self.catalog, self.cache_size)) as executor:
+                outputs = list(executor.map(_optimize_group, tasks, [settings] * len(tasks)))
+        # the statistics are cumulative per worker: keep each worker's latest (largest) snapshot
+        latest_by_worker = {}
+        for output in outputs:
+            for result in output['results']:
+                by_position[result['position']] = result
+            stats = output['fitness_cache']
+            previous = latest_by_worker.get(output['worker'])
+            if previous is None or stats['hits'] + stats['misses'] >= previous['hits'] + previous['misses']:
+                latest_by_worker[output['worker']] = stats
+        cache_stats = list(latest_by_worker.values())
+        if not cache_stats and self._local_state is not None:
+            cache_stats = [self._local_state['fitness_cache'].stats()]
+
+        for position, original in duplicates.items():
+            result = dict(by_position[original], position=position, name=specs[position]['name'],
+                          method='duplicate', reused_from=by_position[original]['name'], seconds=0.0)
+            by_position[position] = result
+        results = [by_position[position] for position in range(len(specs))]
+        elapsed = time.perf_counter() - start
+        print(f"--- Batch optimization complete in {elapsed:.2f}s ---")
+
+        if output_path is not None:
+            run_info = {'catalog': self.catalog.data_file_path, 'seconds': elapsed, 'settings': settings}
+            if any(result['method'] == 'ga' for result in results):
+                run_info['fitness_cache'] = cache_stats
+            write_batch_results(output_path, results, run_info)
+        return results
+
+def write_batch_results(path: str, results: list[dict], run_info: dict | None = None):
+    """Writes the consolidated output: run info plus every scenario's result (infinite objectives become null)."""
+    scenarios = []
+    for result in results:
+        result = dict(result)
+        result.pop('position', None)
+        result['front'] = [{key: (value if not isinstance(value, float) or np.isfinite(value) else None)
+                            for key, value in record.items()} for record in result['front']]
+        scenarios.append(result)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'run': run_info or {}, 'scenarios': scenarios}, f, indent=2)
+    os.replace(tmp_path, path)
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) < 4:
+        print("Usage: python -m src.genetic_algo_logic.batch_optimizer <catalog> <scenarios.json> <output.json> [workers]")
+        sys.exit(1)
+    catalog = MicroserviceCatalog(sys.argv[1])
+    optimizer = BatchOptimizer(catalog, n_workers=int(sys.argv[4]) if len(sys.argv) > 4 else 1)
+    results = optimizer.optimize(load_scenario_specs(sys.argv[2]), output_path=sys.argv[3])
+    for result in results:
+        print(f"- {result['name']}: {result['method']}, {len(result['front'])} Pareto-optimal compositions")
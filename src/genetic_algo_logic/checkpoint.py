@@ -0,0 +1,55 @@
+# src/genetic_algo_logic/checkpoint.py
+import json
+import os
+
+import numpy as np
+
+# bumped whenever the checkpoint layout changes
+CHECKPOINT_FORMAT_VERSION = 1
+
+def python_rng_state_to_array(state: tuple) -> tuple[np.ndarray, dict]:
+    """
+    Splits a `random.getstate()` tuple into its 625 Mersenne Twister words (as uint32) and the
+    small remainder (version and cached gaussian), which goes into the checkpoint metadata.
+    """
+    version, internal_state, gauss_next = state
+    return np.array(internal_state, dtype=np.uint32), {'version': version, 'gauss_next': gauss_next}
+
+def python_rng_state_from_array(words: np.ndarray, extra: dict) -> tuple:
+    """Inverse of `python_rng_state_to_array`, ready for `random.setstate`."""
+    return extra['version'], tuple(int(word) for word in words.tolist()), extra['gauss_next']
+
+def numpy_rng_state(rng: np.random.Generator) -> dict:
+    #bit generator state of a NumPy generator (plain ints and strings, JSON serializable).
+    return rng.bit_generator.state
+
+def numpy_rng_from_state(state: dict) -> np.random.Generator:
+    #rebuilds a generator of the same bit generator type, positioned exactly at `state`.
+    bit_generator = getattr(np.random, state['bit_generator'])()
+    bit_generator.state = state
+    return np.random.Generator(bit_generator)
+
+def save_checkpoint(path: str, arrays: dict, meta: dict):
+    """
+    Writes a checkpoint: the GA arrays (population genotypes and objectives, archive rows,
+    RNG words) stored uncompressed in one .npz file, plus a JSON metadata record.
+    The file is written next to `path` and atomically renamed over it, so a crash while
+    writing leaves the previous checkpoint intact.
+    """
+    tmp_path = f'{path}.tmp'
+    payload = dict(arrays)
+    payload['meta'] = np.array(json.dumps(dict(meta, format_version=CHECKPOINT_FORMAT_VERSION)))
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def load_checkpoint(path: str) -> tuple[dict, dict]:
+    """Reads a checkpoint written by `save_checkpoint` and returns (arrays, meta)."""
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {name: data[name] for name in data.files if name != 'meta'}
+        meta = json.loads(data['meta'].item())
+    if meta.get('format_version') != CHECKPOINT_FORMAT_VERSION:
+        raise ValueError(f"Error: Unsupported checkpoint format version {meta.get('format_version')} in {path}.")
+    return arrays, meta
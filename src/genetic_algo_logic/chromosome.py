@@ -1,4 +1,6 @@
 # genetic_algo_logic/chromosome.py
+import numpy as np
+
 #simple list of strings/complex object
 class ServiceComposition:
     def __init__(self, microservice_ids: list[str]):
@@ -9,4 +11,58 @@ class ServiceComposition:
     def __repr__(self):
         return f"Composition({self.microservice_ids}, Fitness={self.fitness})"
 
-    # You might need methods here for mutation/crossover specific logic if not using DEAP's defaults
\ No newline at end of file
+    # You might need methods here for mutation/crossover specific logic if not using DEAP's defaults
+
+class SlotEncoding:
+    """
+    Integer encoding of compositions for a scenario: gene `g` in capability slot `s` is an
+    index into that slot's option array, so a whole population is one int32 matrix
+    (individuals x slots). Genes are turned into catalog indices for evaluation with a single
+    gather, and into microservice ids only when results are reported.
+    """
+    def __init__(self, scenario):
+        slot_options = scenario.get_slot_option_indices()
+        for capability, options in zip(scenario.required_capabilities, slot_options):
+            if len(options) == 0:
+                raise ValueError(f"Error: No microservice options found for capability '{capability}'. Check data/scenario.")
+        self.catalog = scenario.catalog
+        self.num_slots = len(slot_options)
+        self.option_counts = np.array([len(options) for options in slot_options], dtype=np.int32)
+        # padded (slots x max options) table of catalog indices, -1 past each slot's option count
+        self.option_table = np.full((self.num_slots, int(self.option_counts.max(initial=0))), -1, dtype=np.int32)
+        for slot, options in enumerate(slot_options):
+            self.option_table[slot, :len(options)] = options
+
+    def to_catalog_indices(self, genes: np.ndarray) -> np.ndarray:
+        """(individuals x slots) genes -> catalog indices, as expected by the batch simulator."""
+        return self.option_table[np.arange(self.num_slots), genes]
+
+    def from_catalog_indices(self, catalog_indices: np.ndarray) -> np.ndarray:
+        """Inverse of `to_catalog_indices`; services that are not an option of their slot become -1."""
+        catalog_indices = np.asarray(catalog_indices)
+        genes = np.full(catalog_indices.shape, -1, dtype=np.int32)
+        for slot in range(self.num_slots):
+            options = self.option_table[slot, :self.option_counts[slot]]
+            position = np.minimum(np.searchsorted(options, catalog_indices[:, slot]), len(options) - 1)
+            found = options[position] == catalog_indices[:, slot]
+            genes[found, slot] = position[found]
+        return genes
+
+    def decode_ids(self, genes: np.ndarray) -> list[list[str]]:
+        """Genes -> lists of microservice ids."""
+        ids = self.catalog.ids
+        return [[ids[index] for index in row] for row in self.to_catalog_indices(genes).tolist()]
+
+def create_encoded_population(pop_size: int, encoding: SlotEncoding, rng: np.random.Generator) -> np.ndarray:
+    #vectorized counterpart of create_population: one uniform option per slot for every individual, as an int32 gene matrix.
+    return rng.integers(0, encoding.option_counts, size=(pop_size, encoding.num_slots), dtype=np.int32)
+
+def seed_encoded_population(genes: np.ndarray, encoding: SlotEncoding, seeds: np.ndarray) -> int:
+    #overwrites the first rows of a gene matrix with seed compositions (catalog indices per slot, e.g. a previous front).
+    # slots whose seed service is -1 or not an option of the slot keep their random gene. returns the rows seeded.
+    seeds = np.asarray(seeds)[:len(genes)]
+    if len(seeds) == 0:
+        return 0
+    seeded = encoding.from_catalog_indices(seeds)
+    genes[:len(seeded)] = np.where(seeded >= 0, seeded, genes[:len(seeded)])
+    return len(seeded)
@@ -1,8 +1,16 @@
 # src/genetic_algorithm_logic/custom_operators.py
+from __future__ import annotations
+
 import random
-from deap import creator #type hinting Individual
+from typing import TYPE_CHECKING
+
+import numpy as np
 from src.microservice_catalog import MicroserviceCatalog
 from src.scenario_definition import ServiceScenario
+from src.genetic_algo_logic.chromosome import SlotEncoding
+
+if TYPE_CHECKING:
+    from deap import creator #type hinting Individual
 
 def mut_swap_microservice(individual: creator.Individual, scenario: ServiceScenario, indpb: float) -> tuple:
 
@@ -21,15 +29,21 @@ def mut_swap_microservice(individual: creator.Individual, scenario: ServiceScena
                 print(f"Warning: Individual index {i} out of bounds for scenario capabilities. Skipping mutation.")
                 continue
             
-            # get all valid microservice options for this specific capability
-            options_for_capability = scenario.get_options_for_capability(capability)
-            
-            # filter out the current microservice = true "swap"
-            available_for_swap = [ms.id for ms in options_for_capability if ms.id != current_ms_id]
-            
-            if available_for_swap:
-                # select new random microservice ID from the filtered options
-                individual[i] = random.choice(available_for_swap)
+            # get the catalog indices of all valid options for this specific capability (ascending)
+            options_for_capability = scenario.get_option_indices(capability)
+
+            # leave out the current microservice = true "swap", without building a filtered list
+            current_index = scenario.catalog.index_of(current_ms_id)
+            position = int(np.searchsorted(options_for_capability, current_index))
+            is_current_option = position < len(options_for_capability) and options_for_capability[position] == current_index
+            num_available = len(options_for_capability) - int(is_current_option)
+
+            if num_available > 0:
+                # select new random microservice ID from the remaining options
+                choice = random.randrange(num_available)
+                if is_current_option and choice >= position:
+                    choice += 1
+                individual[i] = scenario.catalog.ids[options_for_capability[choice]]
                 # invalidate fitness so DEAP &needs re-evaluation
                 del individual.fitness.values
             else:
@@ -39,14 +53,55 @@ def mut_swap_microservice(individual: creator.Individual, scenario: ServiceScena
     # DEAP return a tuple of the modified individuals.
     return individual,
 
+def cx_two_point_matrix(genes: np.ndarray, cx_prob: float, rng: np.random.Generator) -> np.ndarray:
+
+    # two-point crossover over a whole gene matrix, pairing rows (0, 1), (2, 3), ... like the DEAP loop.
+    # each pair is crossed with probability cx_prob using tools.cxTwoPoint's choice of cut points.
+    # genes are modified in place; returns the mask of rows that were crossed.
+
+    num_rows, size = genes.shape
+    crossed = np.zeros(num_rows, dtype=bool)
+    num_pairs = num_rows // 2
+    if size < 2 or num_pairs == 0:
+        return crossed
+
+    mates = rng.random(num_pairs) < cx_prob
+    first = 2 * np.flatnonzero(mates)
+    point1 = rng.integers(1, size + 1, size=len(first))
+    point2 = rng.integers(1, size, size=len(first))
+    point2 = np.where(point2 >= point1, point2 + 1, point2)
+    low, high = np.minimum(point1, point2), np.maximum(point1, point2)
+
+    columns = np.arange(size)
+    segment = (columns >= low[:, None]) & (columns < high[:, None])
+    left, right = genes[first], genes[first + 1]
+    genes[first] = np.where(segment, right, left)
+    genes[first + 1] = np.where(segment, left, right)
+    crossed[first] = True
+    crossed[first + 1] = True
+    return crossed
+
+def mut_swap_matrix(genes: np.ndarray, encoding: SlotEncoding, mut_prob: float, indpb: float,
+                    rng: np.random.Generator) -> np.ndarray:
+
+    # vectorized mut_swap_microservice: each row mutates with probability mut_prob, then each of its genes
+    # with probability indpb is replaced by a different option of the same slot (uniform over the others).
+    # genes are modified in place; returns the mask of rows whose genes actually changed.
+
+    num_rows, num_slots = genes.shape
+    mutants = rng.random(num_rows) < mut_prob
+    swap = (rng.random((num_rows, num_slots)) < indpb) & mutants[:, None] & (encoding.option_counts > 1)
+    rows, slots = np.nonzero(swap)
+    # draw among the count-1 other options, skipping over the current one
+    replacement = rng.integers(0, np.maximum(encoding.option_counts[slots] - 1, 1), dtype=np.int32)
+    current = genes[rows, slots]
+    genes[rows, slots] = np.where(replacement >= current, replacement + 1, replacement)
+    return swap.any(axis=1)
+
 if __name__ == "__main__":
     try:
-        # re-create DEAP types if not already present
-        try:
-            creator.create("FitnessMulti", base.Fitness, weights=(-1.0, -1.0, 1.0, 1.0))
-            creator.create("Individual", list, fitness=creator.FitnessMulti)
-        except RuntimeError:
-            pass
+        # importing individual_creator creates the DEAP types
+        from src.genetic_algo_logic.individual_creator import creator
 
         # mock objects for testing:  imports/instances
         catalog = MicroserviceCatalog()
@@ -0,0 +1,166 @@
+# src/genetic_algo_logic/fast_selection.py
+import numpy as np
+
+# Rows of the dominance matrix computed per broadcast block (block x n booleans per objective)
+DOMINANCE_BLOCK_ROWS = 256
+
+def packed_dominance_matrix(wvalues: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Computes which rows of `wvalues` (weighted objectives, larger is better) dominate which.
+    Row i of the returned bit-packed matrix has bit j set when i dominates j, following
+    DEAP's Fitness.dominates (no objective worse and at least one strictly better).
+    Also returns, per column, how many rows dominate it.
+    """
+    n = len(wvalues)
+    packed = np.zeros((n, (n + 7) // 8), dtype=np.uint8)
+    dominated_counts = np.zeros(n, dtype=np.int64)
+    columns = [np.ascontiguousarray(wvalues[:, obj]) for obj in range(wvalues.shape[1])]
+    for start in range(0, n, DOMINANCE_BLOCK_ROWS):
+        # one 2-D comparison per objective is much faster than reducing over a short last axis
+        worse = np.zeros((min(DOMINANCE_BLOCK_ROWS, n - start), n), dtype=bool)
+        better = np.zeros_like(worse)
+        for column in columns:
+            block = column[start:start + DOMINANCE_BLOCK_ROWS, None]
+            worse |= block < column[None, :]
+            better |= block > column[None, :]
+        dominates = better & ~worse
+        packed[start:start + DOMINANCE_BLOCK_ROWS] = np.packbits(dominates, axis=1)
+        dominated_counts += dominates.sum(axis=0)
+    return packed, dominated_counts
+
+def sort_nondominated_indices(wvalues: np.ndarray, k: int, first_front_only: bool = False) -> list[np.ndarray]:
+    """
+    Array counterpart of deap.tools.sortNondominated: returns the Pareto fronts as arrays of
+    row indices, stopping once at least `k` rows are sorted. Identical objective vectors are
+    ranked together, and both the fronts and the order inside each front match DEAP's, so
+    the subsequent crowding-distance ordering is the same as well.
+    """
+    if k == 0 or len(wvalues) == 0:
+        return []
+
+    # group identical fitnesses, uniques ordered by first appearance (like DEAP's fitness dict)
+    uniques, first_index, inverse = np.unique(wvalues, axis=0, return_index=True, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    appearance = np.argsort(first_index, kind='stable')
+    rank_of_unique = np.empty(len(uniques), dtype=np.int64)
+    rank_of_unique[appearance] = np.arange(len(uniques))
+    fit_of_row = rank_of_unique[inverse]
+    fits = uniques[appearance]
+    rows_of_fit = np.split(np.argsort(fit_of_row, kind='stable'),
+                           np.cumsum(np.bincount(fit_of_row, minlength=len(fits)))[:-1])
+
+    num_fits = len(fits)
+    packed, counts = packed_dominance_matrix(fits)
+
+    current_front = np.flatnonzero(counts == 0)
+    fronts = [np.concatenate([rows_of_fit[fit] for fit in current_front])]
+    pareto_sorted = len(fronts[-1])
+
+    if not first_front_only:
+        target = min(len(wvalues), k)
+        while pareto_sorted < target:
+            dominated = np.unpackbits(packed[current_front], axis=1, count=num_fits).astype(bool)
+            remaining = counts - dominated.sum(axis=0)
+            released = np.flatnonzero((counts > 0) & (remaining == 0))
+            counts = remaining
+            # DEAP releases a fitness when its last dominator in the current front is processed
+            last_dominator = len(current_front) - 1 - np.argmax(dominated[::-1, released], axis=0)
+            current_front = released[np.lexsort((released, last_dominator))]
+            fronts.append(np.concatenate([rows_of_fit[fit] for fit in current_front]) if len(current_front) else np.empty(0, dtype=np.intp))
+            pareto_sorted += len(fronts[-1])
+
+    return fronts
+
+def sort_constrained_indices(wvalues: np.ndarray, violations: np.ndarray, k: int) -> list[np.ndarray]:
+    """
+    Fronts under constraint dominance (Deb's rules): a feasible row (violation 0) dominates
+    every infeasible one, feasible rows compare by Pareto dominance and infeasible rows by
+    their total violation only. So the feasible rows' non-dominated fronts come first,
+    followed by the infeasible rows grouped by equal violation in increasing order.
+    Stops once at least `k` rows are sorted, like sort_nondominated_indices.
+    """
+    violations = np.asarray(violations, dtype=np.float64)
+    feasible = np.flatnonzero(violations <= 0.0)
+    fronts = [feasible[front] for front in sort_nondominated_indices(wvalues[feasible], k)]
+    sorted_count = sum(map(len, fronts))
+    target = min(len(wvalues), k)
+    if sorted_count < target:
+        infeasible = np.flatnonzero(violations > 0.0)
+        infeasible = infeasible[np.argsort(violations[infeasible], kind='stable')]
+        starts = np.flatnonzero(np.r_[True, violations[infeasible][1:] != violations[infeasible][:-1]])
+        for group in np.split(infeasible, starts[1:]):
+            fronts.append(group)
+            sorted_count += len(group)
+            if sorted_count >= target:
+                break
+    return fronts
+
+def crowding_distances(values: np.ndarray) -> np.ndarray:
+    """
+    Crowding distance of each row of one front, computed exactly like
+    deap.tools.assignCrowdingDist (successive stable sorts on the raw objective values).
+    """
+    num_rows, num_objectives = values.shape
+    distances = np.zeros(num_rows)
+    if num_rows == 0:
+        return distances
+
+    order = np.arange(num_rows)
+    for i in range(num_objectives):
+        order = order[np.argsort(values[order, i], kind='stable')]
+        sorted_values = values[order, i]
+        distances[order[0]] = np.inf
+        distances[order[-1]] = np.inf
+        if sorted_values[-1] == sorted_values[0]:
+            continue
+        norm = num_objectives * float(sorted_values[-1] - sorted_values[0])
+        with np.errstate(invalid='ignore'): # worst-case (infinite) objectives of rejected rows
+            distances[order[1:-1]] += (sorted_values[2:] - sorted_values[:-2]) / norm
+    return distances
+
+def _select_from_fronts(values: np.ndarray, fronts: list[np.ndarray], k: int) -> tuple[np.ndarray, np.ndarray]:
+    # whole fronts first, then the last front by decreasing crowding distance (stable, like sorted(reverse=True))
+    crowding = np.zeros(len(values))
+    for front in fronts:
+        crowding[front] = crowding_distances(values[front])
+
+    chosen = np.concatenate(fronts[:-1]) if len(fronts) > 1 else np.empty(0, dtype=np.intp)
+    remaining = k - len(chosen)
+    if fronts and remaining > 0:
+        last_front = fronts[-1]
+        by_crowding = last_front[np.argsort(-crowding[last_front], kind='stable')]
+        chosen = np.concatenate([chosen, by_crowding[:remaining]])
+    return chosen.astype(np.intp), crowding
+
+def _sort_fronts(wvalues: np.ndarray, k: int, violations: np.ndarray | None) -> list[np.ndarray]:
+    if violations is None:
+        return sort_nondominated_indices(wvalues, k)
+    return sort_constrained_indices(wvalues, violations, k)
+
+def nsga2_select_indices(values: np.ndarray, weights: tuple, k: int, violations: np.ndarray | None = None) -> np.ndarray:
+    """
+    NSGA-II selection on an (individuals x objectives) matrix of raw objective values,
+    returning the indices of the `k` chosen rows in DEAP's selNSGA2 order.
+    With per-row constraint `violations` the fronts follow constraint dominance instead.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    wvalues = values * np.asarray(weights, dtype=np.float64)
+    chosen, _ = _select_from_fronts(values, _sort_fronts(wvalues, k, violations), k)
+    return chosen
+
+def sel_nsga2_fast(individuals: list, k: int, constraints=None) -> list:
+    """
+    Drop-in replacement for deap.tools.selNSGA2 working on the objective matrix.
+    Returns the same individuals in the same order and, like DEAP, stores the crowding
+    distance on `fitness.crowding_dist` of every individual sorted into a front.
+    `constraints` (an SLAConstraints) switches to constraint-dominance ranking.
+    """
+    if not individuals or k == 0:
+        return []
+    values = np.array([ind.fitness.values for ind in individuals], dtype=np.float64)
+    wvalues = np.array([ind.fitness.wvalues for ind in individuals], dtype=np.float64)
+    fronts = _sort_fronts(wvalues, k, constraints.violations(values) if constraints is not None else None)
+    chosen, crowding = _select_from_fronts(values, fronts, k)
+    for i in np.concatenate(fronts).tolist():
+        individuals[i].fitness.crowding_dist = crowding[i].item()
+    return [individuals[i] for i in chosen.tolist()]
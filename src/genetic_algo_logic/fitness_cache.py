@@ -0,0 +1,149 @@
+# src/genetic_algo_logic/fitness_cache.py
+from collections import OrderedDict
+
+from src.microservice_catalog import MicroserviceCatalog
+from src.composition_simulator import CompositionSimulator
+
+class FitnessCache:
+    """
+    Bounded LRU cache of fitness tuples keyed by the encoded genotype of a composition,
+    i.e. the tuple of catalog indices of its microservices (one per capability slot).
+    The cache is bound to a catalog and follows its version, so a fitness is never served for
+    services that were changed, added or removed since. When the catalog can tell which
+    services changed (see MicroserviceCatalog.changed_indices_since) only the entries that
+    contain one of them are dropped, otherwise everything is.
+    Pass the `simulator` when it uses live QoS measurements: the cache then follows the
+    simulator's version, which also changes with every new measurement snapshot.
+    MOGA_Runner reads and writes a cache through the view of its scenario's evaluation
+    signature (see `namespace`), so one cache can serve scenarios that evaluate differently.
+    """
+    def __init__(self, catalog: MicroserviceCatalog, maxsize: int = 100_000,
+                 simulator: CompositionSimulator | None = None):
+        if maxsize <= 0:
+            raise ValueError("Error: FitnessCache maxsize must be positive.")
+        self.catalog = catalog
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._version_source = simulator if simulator is not None else catalog
+        self._catalog_version = self._version_source.version
+
+    def _check_catalog(self):
+        # invalidate the entries of changed services once the backing catalog (or the simulator's metrics) has changed
+        version = self._version_source.version
+        if self._catalog_version != version:
+            changed = self._version_source.changed_indices_since(self._catalog_version)
+            if changed is None:
+                self._entries.clear()
+            else:
+                self.invalidate_services(changed)
+            self._catalog_version = version
+
+    def invalidate_services(self, indices) -> int:
+        """Drops every entry whose genotype contains one of the catalog `indices`, returns how many."""
+        changed = set(int(index) for index in indices)
+        if not changed:
+            return 0
+        # keys of namespaced views start with their prefix, which never equals a catalog index
+        stale = [key for key in self._entries if not changed.isdisjoint(key)]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    def get(self, key: tuple) -> tuple | None:
+        """Returns the cached fitness for `key` (and marks it recently used), or None."""
+        self._check_catalog()
+        fitness = self._entries.get(key)
+        if fitness is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return fitness
+
+    def get_many(self, keys: list[tuple]) -> list[tuple | None]:
+        """Batch lookup, one result (or None) per key in order."""
+        return [self.get(key) for key in keys]
+
+    def put(self, key: tuple, fitness: tuple):
+        """Stores a fitness, evicting the least recently used entry once `maxsize` is reached."""
+        self._check_catalog()
+        self._entries[key] = fitness
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def put_many(self, keys: list[tuple], fitnesses: list[tuple]):
+        for key, fitness in zip(keys, fitnesses):
+            self.put(key, fitness)
+
+    def namespace(self, prefix) -> 'FitnessCacheView':
+        """View of this cache whose keys are prefixed with `prefix` (see FitnessCacheView)."""
+        return FitnessCacheView(self, prefix)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate
+        }
+
+    def __len__(self) -> int:
+        self._check_catalog()
+        return len(self._entries)
+
+    def __contains__(self, key: tuple) -> bool:
+        self._check_catalog()
+        return key in self._entries
+
+class FitnessCacheView:
+    """
+    One scenario's window onto a shared FitnessCache: keys become (prefix, *genotype), so
+    several scenarios can share one cache (and its size budget) without their entries
+    colliding. Scenarios that evaluate compositions the same way (same evaluation
+    signature, see ServiceScenario.evaluation_signature) share the prefix and therefore
+    reuse each other's entries for the genotypes they have in common.
+    """
+    def __init__(self, cache: FitnessCache, prefix):
+        self.cache = cache
+        self.prefix = prefix
+
+    def get(self, key: tuple) -> tuple | None:
+        return self.cache.get((self.prefix,) + key)
+
+    def get_many(self, keys: list[tuple]) -> list[tuple | None]:
+        return [self.cache.get((self.prefix,) + key) for key in keys]
+
+    def put(self, key: tuple, fitness: tuple):
+        self.cache.put((self.prefix,) + key, fitness)
+
+    def put_many(self, keys: list[tuple], fitnesses: list[tuple]):
+        for key, fitness in zip(keys, fitnesses):
+            self.cache.put((self.prefix,) + key, fitness)
+
+    @property
+    def hits(self) -> int:
+        return self.cache.hits
+
+    @property
+    def misses(self) -> int:
+        return self.cache.misses
+
+    def stats(self) -> dict:
+        return self.cache.stats()
+
+    def __contains__(self, key: tuple) -> bool:
+        return (self.prefix,) + key in self.cache
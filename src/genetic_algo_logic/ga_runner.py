@@ -1,51 +1,106 @@
 # src/ga_logic/genetic_algorithm_runner.py
+from __future__ import annotations
+
 import random
-from deap import base, tools
+from typing import TYPE_CHECKING
+
+import numpy as np
 
 # Import your custom modules
-from src.genetic_algo_logic.individual_creator import creator, create_population # Import creator here!
-from src.genetic_algo_logic.custom_operators import mut_swap_microservice # If you use your custom mutation
+# DEAP (and the creator types of individual_creator) are only imported once the list-based `run` needs the toolbox,
+# so run_encoded and the exact solvers start without it
+from src.genetic_algo_logic.chromosome import SlotEncoding, create_encoded_population, seed_encoded_population
+from src.genetic_algo_logic.custom_operators import mut_swap_microservice, cx_two_point_matrix, mut_swap_matrix # If you use your custom mutation
+from src.genetic_algo_logic.fitness_cache import FitnessCache
+from src.genetic_algo_logic.parallel_evaluator import ParallelEvaluator
+from src.genetic_algo_logic.fast_selection import sel_nsga2_fast, nsga2_select_indices
+from src.genetic_algo_logic.pareto_archive import ParetoArchive
+from src.genetic_algo_logic.instrumentation import NullInstrumentation, RunInstrumentation
+from src.genetic_algo_logic.adaptive_control import AdaptiveControl
+from src.genetic_algo_logic.checkpoint import (save_checkpoint, load_checkpoint, python_rng_state_to_array,
+                                               python_rng_state_from_array, numpy_rng_state, numpy_rng_from_state)
 
 # Import Person 2's modules (these will be available after your first merge)
-from src.composition_simulator import CompositionSimulator
+from src.composition_simulator import CompositionSimulator, METRIC_KEYS, METRIC_WEIGHTS
 from src.microservice_catalog import MicroserviceCatalog
 from src.scenario_definition import ServiceScenario
 
+if TYPE_CHECKING:
+    from src.genetic_algo_logic.individual_creator import creator
+
 class MOGA_Runner:
     """
     Orchestrates the Multi-Objective Genetic Algorithm for service composition.
     """
-    def __init__(self, scenario: ServiceScenario, simulator: CompositionSimulator):
+    def __init__(self, scenario: ServiceScenario, simulator: CompositionSimulator,
+                 fitness_cache: FitnessCache | None = None, evaluator: ParallelEvaluator | None = None,
+                 instrumentation: RunInstrumentation | None = None):
         self.scenario = scenario
         self.simulator = simulator
-        self.toolbox = base.Toolbox()
-        self._setup_toolbox()
+        # Optional memo of already simulated genotypes; duplicates are common late in a run.
+        # A whole cache is used through the view of this scenario's evaluation signature, so runners
+        # whose scenarios evaluate differently (workflow, load, SLA) can share it without collisions
+        if isinstance(fitness_cache, FitnessCache):
+            fitness_cache = fitness_cache.namespace(scenario.evaluation_signature())
+        self.fitness_cache = fitness_cache
+        # Optional process-pool evaluation (opt-in); None keeps everything in this process
+        self.evaluator = evaluator
+        # Per-generation telemetry; the null object keeps every hook a no-op when disabled
+        self.instrumentation = instrumentation or NullInstrumentation()
+        self.evaluation_count = 0 # fitness evaluations requested (including cache hits)
+        self.simulation_count = 0 # compositions actually run through the simulator
+        self._toolbox = None
+
+    @property
+    def toolbox(self):
+        """DEAP toolbox of the list-based GA, built (and DEAP imported) on first use."""
+        if self._toolbox is None:
+            from deap import base
+            self._toolbox = base.Toolbox()
+            self._setup_toolbox()
+        return self._toolbox
 
     def _setup_toolbox(self):
         """
         Configures the DEAP toolbox with genetic operators:
         individual creation, fitness evaluation, selection, crossover, and mutation.
         """
+        from deap import tools
+        from src.genetic_algo_logic.individual_creator import create_population
+
         # 1. Individual and Population Creation
         self.toolbox.register("individual_creator", create_population, scenario=self.scenario)
         self.toolbox.register("population", self.toolbox.individual_creator) # Wrapper for DEAP's initRepeat
 
         # 2. Fitness Evaluation (CRITICAL LINK TO PERSON 2's SIMULATOR)
         self.toolbox.register("evaluate", self._evaluate_composition)
+        # Batch variant used by run(): one vectorized simulator call per generation
+        self.toolbox.register("evaluate_population", self._evaluate_population)
 
         # 3. Genetic Operators
         # Selection: NSGA-II is widely used for multi-objective problems
-        self.toolbox.register("select", tools.selNSGA2)
+        # sel_nsga2_fast sorts on the objective matrix and returns exactly what tools.selNSGA2 would
+        # with SLA constraints of the scenario, infeasible compositions rank behind every feasible one
+        self.toolbox.register("select", sel_nsga2_fast, constraints=self.scenario.sla)
 
         # Crossover: Combines two individuals (e.g., swapping segments of their MS IDs lists)
         self.toolbox.register("mate", tools.cxTwoPoint) # Example: Two-point crossover for lists
 
         # Mutation: Randomly alters an individual (e.g., swapping a MS for another valid one)
         # Using your custom mutation:
-        self.toolbox.register("mutate", mut_swap_microservice, scenario=self.scenario, indpb=0.1)
+        self._set_mutation_indpb(0.1)
         # Or a DEAP built-in, e.g., tools.mutShuffleIndexes:
         # self.toolbox.register("mutate", tools.mutShuffleIndexes, indpb=0.1) # Shuffles elements within the list
 
+    def _set_mutation_indpb(self, indpb: float):
+        # (re-)registers the list mutation with a per-gene swap probability
+        self.toolbox.register("mutate", mut_swap_microservice, scenario=self.scenario, indpb=indpb)
+
+    def new_archive(self) -> ParetoArchive:
+        """Empty ParetoArchive for this scenario (feasible compositions only when it has SLA constraints)."""
+        return ParetoArchive(weights=METRIC_WEIGHTS, catalog=self.scenario.catalog,
+                             constraints=self.scenario.sla)
+
     def _evaluate_composition(self, individual: creator.Individual) -> tuple:
         """
         Evaluates a service composition (individual) by calling Person 2's simulator.
@@ -53,9 +108,16 @@ class MOGA_Runner:
         in the exact order expected by `creator.FitnessMulti`'s weights.
         """
         ms_ids = list(individual) # Ensure individual is treated as a list of IDs
-        
+
+        if self.fitness_cache is not None:
+            cache_key = tuple(self.scenario.catalog.index_of(ms_id) for ms_id in ms_ids)
+            cached = self.fitness_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         # --- THIS IS THE CALL TO PERSON 2'S SIMULATOR ---
-        metrics = self.simulator.calculate_composite_metrics(ms_ids)
+        metrics = self.simulator.calculate_composite_metrics(ms_ids, self.scenario.workflow_plan, self.scenario.load_model,
+                                                             self.scenario.sla)
 
         # Validate that required metrics are present
         required_metrics = ['total_cost', 'total_latency_ms', 'total_availability_percent', 'min_throughput_rps']
@@ -66,12 +128,112 @@ class MOGA_Runner:
 
         # IMPORTANT: The order of values in this tuple MUST match the weights in individual_creator.py
         # weights=(-1.0, -1.0, 1.0, 1.0) -> (cost, latency, availability, throughput)
-        return (metrics['total_cost'],
-                metrics['total_latency_ms'],
-                metrics['total_availability_percent'],
-                metrics['min_throughput_rps'])
+        fitness = (metrics['total_cost'],
+                   metrics['total_latency_ms'],
+                   metrics['total_availability_percent'],
+                   metrics['min_throughput_rps'])
+        if self.fitness_cache is not None:
+            self.fitness_cache.put(cache_key, fitness)
+        return fitness
+
+    def _evaluate_population(self, individuals: list[creator.Individual]) -> list[tuple]:
+        """
+        Evaluates many service compositions with a single vectorized simulator call.
+        Returns one fitness tuple per individual, in the same order and objective layout
+        as `_evaluate_composition`.
+        """
+        if not individuals:
+            return []
+
+        index_matrix = self.simulator.encode_compositions([list(ind) for ind in individuals])
+        return [tuple(row) for row in self._evaluate_index_matrix(index_matrix).tolist()]
+
+    def _evaluate_index_matrix(self, index_matrix: np.ndarray) -> np.ndarray:
+        """
+        Evaluates an (individuals x slots) matrix of catalog indices and returns an
+        (individuals x 4) objective array. With a fitness cache, only the distinct
+        genotypes the cache has not seen are simulated.
+        """
+        self.evaluation_count += len(index_matrix)
+        if self.fitness_cache is None:
+            return self._simulate_batch(index_matrix)
+
+        keys = [tuple(row) for row in index_matrix.tolist()]
+        fitnesses = self.fitness_cache.get_many(keys)
+        missing = {}
+        for row, (key, fitness) in enumerate(zip(keys, fitnesses)):
+            if fitness is None:
+                missing.setdefault(key, row)
+        if missing:
+            computed = [tuple(row) for row in self._simulate_batch(index_matrix[list(missing.values())]).tolist()]
+            self.fitness_cache.put_many(list(missing), computed)
+            computed_by_key = dict(zip(missing, computed))
+            fitnesses = [fitness if fitness is not None else computed_by_key[key]
+                         for key, fitness in zip(keys, fitnesses)]
+        return np.array(fitnesses, dtype=np.float64).reshape(len(keys), len(METRIC_KEYS))
+
+    def _simulate_batch(self, index_matrix: np.ndarray) -> np.ndarray:
+        """Runs the vectorized simulator (or the parallel evaluator) on an index matrix."""
+        self.simulation_count += len(index_matrix)
+        if self.evaluator is not None:
+            return self.evaluator.evaluate(index_matrix, self.scenario.workflow_plan, self.scenario.load_model,
+                                           self.scenario.sla)
+        metrics = self.simulator.calculate_composite_metrics_batch(index_matrix, self.scenario.workflow_plan,
+                                                          self.scenario.load_model, self.scenario.sla)
+        return np.column_stack([metrics[key] for key in METRIC_KEYS])
+
+    def _evaluate_invalid(self, individuals: list[creator.Individual]):
+        """Evaluates the individuals with an invalid fitness (i.e., new or modified ones) in one batch."""
+        invalid_ind = [ind for ind in individuals if not ind.fitness.valid]
+        fitnesses = self.toolbox.evaluate_population(invalid_ind)
+        for ind, fit in zip(invalid_ind, fitnesses):
+            ind.fitness.values = fit
 
-    def run(self, pop_size: int = 100, num_generations: int = 50, cx_prob: float = 0.7, mut_prob: float = 0.2) -> tools.ParetoFront:
+    def _evolve_generation(self, population: list[creator.Individual], cx_prob: float, mut_prob: float) -> list[creator.Individual]:
+        """
+        Produces and evaluates the offspring of one generation: selection, cloning,
+        crossover and mutation, followed by a batch evaluation of the modified individuals.
+        Shared by `run` and the island model so both evolve populations the same way.
+        """
+        # Select the next generation individuals (using NSGA-II)
+        # The 'select' operator returns a new list of individuals, which are clones
+        # of the fittest ones from the current population.
+        instrumentation = self.instrumentation
+        with instrumentation.phase('selection'):
+            offspring = self.toolbox.select(population, len(population))
+
+        with instrumentation.phase('variation'):
+            offspring = self._vary(offspring, cx_prob, mut_prob)
+
+        with instrumentation.phase('evaluation'):
+            self._evaluate_invalid(offspring)
+        return offspring
+
+    def _vary(self, offspring: list[creator.Individual], cx_prob: float, mut_prob: float) -> list[creator.Individual]:
+        """Clones the selected individuals and applies crossover and mutation to the clones."""
+        # Clone the selected individuals to ensure operations affect new instances
+        offspring = list(map(self.toolbox.clone, offspring))
+
+        # Apply crossover on the offspring
+        # Iterate over pairs of individuals (every other one)
+        for child1, child2 in zip(offspring[::2], offspring[1::2]):
+            if random.random() < cx_prob:
+                self.toolbox.mate(child1, child2)
+                # Invalidate fitness values of modified children
+                del child1.fitness.values
+                del child2.fitness.values
+
+        # Apply mutation on the offspring
+        for mutant in offspring:
+            if random.random() < mut_prob:
+                self.toolbox.mutate(mutant)
+                # Invalidate fitness value of the mutated individual
+                del mutant.fitness.values
+        return offspring
+
+    def run(self, pop_size: int = 100, num_generations: int = 50, cx_prob: float = 0.7, mut_prob: float = 0.2,
+            checkpoint_path: str | None = None, checkpoint_interval: int = 10, indpb: float = 0.1,
+            adaptive: AdaptiveControl | None = None) -> ParetoArchive:
         """
         Runs the main Multi-Objective Genetic Algorithm loop.
 
@@ -80,69 +242,340 @@ class MOGA_Runner:
             num_generations: Number of generations to evolve.
             cx_prob: Probability of crossover operation.
             mut_prob: Probability of mutation operation.
+            checkpoint_path: If given, the GA state is saved to this file every `checkpoint_interval`
+                generations and after the last one; `resume` continues from it.
+            checkpoint_interval: Generations between two checkpoints.
+            indpb: Per-gene swap probability of a mutated individual.
+            adaptive: Optional AdaptiveControl that tunes cx_prob, mut_prob and indpb from the
+                archive's progress and stops the run once it has converged; its `summary`
+                reports the evaluations saved compared with `num_generations`.
 
         Returns:
-            A DEAP ParetoFront object containing the non-dominated solutions.
+            A ParetoArchive containing the non-dominated solutions (iterates like a DEAP ParetoFront).
         """
         print(f"--- Starting GA Evolution ---")
         print(f"Population Size: {pop_size}, Generations: {num_generations}")
         print(f"Crossover Prob: {cx_prob}, Mutation Prob: {mut_prob}")
 
-        # Initialize the population
-        population = self.toolbox.population(n=pop_size) # Using toolbox.population for convenience
+        instrumentation = self.instrumentation
+        instrumentation.start_run(self, pop_size=pop_size, num_generations=num_generations)
+        self._set_mutation_indpb(indpb)
+        if adaptive is not None:
+            adaptive.start(self, pop_size, num_generations, cx_prob, mut_prob, indpb)
 
-        # Evaluate the initial population
-        # map() applies evaluate to each individual; results are assigned to individual.fitness.values
-        fitnesses = list(map(self.toolbox.evaluate, population))
-        for ind, fit in zip(population, fitnesses):
-            ind.fitness.values = fit
+        with instrumentation.phase('initialization'):
+            # Initialize the population
+            population = self.toolbox.population(pop_size=pop_size) # Using toolbox.population for convenience
 
-        # Keep track of the best (non-dominated) solutions found so far
-        # ParetoFront automatically handles non-dominated solutions
-        hall_of_fame = tools.ParetoFront()
-        hall_of_fame.update(population)
+        with instrumentation.phase('evaluation'):
+            # Evaluate the initial population
+            # evaluate_population scores the whole list at once; results are assigned to individual.fitness.values
+            self._evaluate_invalid(population)
 
-        # Main evolutionary loop
-        for gen in range(1, num_generations + 1):
-            # Select the next generation individuals (using NSGA-II)
-            # The 'select' operator returns a new list of individuals, which are clones
-            # of the fittest ones from the current population.
-            offspring = self.toolbox.select(population, len(population))
-            
-            # Clone the selected individuals to ensure operations affect new instances
-            offspring = list(map(self.toolbox.clone, offspring))
-
-            # Apply crossover on the offspring
-            # Iterate over pairs of individuals (every other one)
-            for child1, child2 in zip(offspring[::2], offspring[1::2]):
-                if random.random() < cx_prob:
-                    self.toolbox.mate(child1, child2)
-                    # Invalidate fitness values of modified children
-                    del child1.fitness.values
-                    del child2.fitness.values
-
-            # Apply mutation on the offspring
-            for mutant in offspring:
-                if random.random() < mut_prob:
-                    self.toolbox.mutate(mutant)
-                    # Invalidate fitness value of the mutated individual
-                    del mutant.fitness.values
-
-            # Evaluate the individuals with an invalid fitness (i.e., new or modified ones)
-            invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
-            fitnesses = map(self.toolbox.evaluate, invalid_ind)
-            for ind, fit in zip(invalid_ind, fitnesses):
-                ind.fitness.values = fit
+        with instrumentation.phase('archive'):
+            # Keep track of the best (non-dominated) solutions found so far
+            # ParetoArchive keeps them as arrays and filters each generation in one vectorized update
+            hall_of_fame = self.new_archive()
+            hall_of_fame.update_population(population)
+        if adaptive is not None:
+            adaptive.update(self, 0, hall_of_fame)
+        instrumentation.end_generation(self, hall_of_fame, len(population))
+
+        settings = {'pop_size': pop_size, 'num_generations': num_generations, 'cx_prob': cx_prob, 'mut_prob': mut_prob,
+                    'indpb': indpb, 'checkpoint_interval': checkpoint_interval}
+        return self._run_generations(population, hall_of_fame, 1, settings, checkpoint_path, adaptive)
+
+    def _run_generations(self, population: list[creator.Individual], hall_of_fame: ParetoArchive, first_gen: int,
+                         settings: dict, checkpoint_path: str | None,
+                         adaptive: AdaptiveControl | None = None) -> ParetoArchive:
+        """Main evolutionary loop of `run` from generation `first_gen` on (also used by `resume`)."""
+        instrumentation = self.instrumentation
+        num_generations = settings['num_generations']
+        gen = first_gen - 1
+        # a resumed adaptive run whose checkpoint was written at convergence does not evolve any further
+        last_gen = gen if adaptive is not None and adaptive.converged(gen) else num_generations
+        for gen in range(first_gen, last_gen + 1):
+            instrumentation.start_generation(gen)
+            if adaptive is not None:
+                self._set_mutation_indpb(adaptive.indpb)
+                offspring = self._evolve_generation(population, adaptive.cx_prob, adaptive.mut_prob)
+            else:
+                offspring = self._evolve_generation(population, settings['cx_prob'], settings['mut_prob'])
 
             # Replace the old population by the offspring
             population[:] = offspring
-            
-            # Update the Pareto front with the current population's non-dominated solutions
-            hall_of_fame.update(population)
+
+            with instrumentation.phase('archive'):
+                # Update the Pareto front with the current population's non-dominated solutions
+                hall_of_fame.update_population(population)
+            converged = adaptive is not None and adaptive.update(self, gen, hall_of_fame)
+            if self._checkpoint_due(checkpoint_path, gen, settings) or (converged and checkpoint_path is not None):
+                with instrumentation.phase('checkpoint'):
+                    index_by_id = self.scenario.catalog.index_by_id
+                    self._save_checkpoint(checkpoint_path, 'run', gen, settings, hall_of_fame, {
+                        'genotypes': np.array([[index_by_id.get(ms_id, -1) for ms_id in ind] for ind in population], dtype=np.int32),
+                        'objectives': np.array([ind.fitness.values for ind in population], dtype=np.float64)
+                    }, python_rng=random.getstate(), adaptive=adaptive)
+            instrumentation.end_generation(self, hall_of_fame, len(population))
 
             # Log progress
-            if gen % 10 == 0 or gen == num_generations:
+            if gen % 10 == 0 or gen == num_generations or converged:
                 print(f"  Gen {gen}/{num_generations} | Pop Size: {len(population)} | Pareto Front Size: {len(hall_of_fame)}")
-                
+            if converged:
+                break
+
+        if adaptive is not None:
+            adaptive.finish(self, gen)
+        instrumentation.end_run(self, hall_of_fame)
         print("--- GA Evolution Complete ---")
-        return hall_of_fame # Return the collection of non-dominated solutions
\ No newline at end of file
+        return hall_of_fame # Return the collection of non-dominated solutions
+
+    def run_encoded(self, pop_size: int = 100, num_generations: int = 50, cx_prob: float = 0.7, mut_prob: float = 0.2,
+                    indpb: float = 0.1, seed: int | None = None,
+                    checkpoint_path: str | None = None, checkpoint_interval: int = 10,
+                    initial_population: np.ndarray | None = None, archive: ParetoArchive | None = None,
+                    adaptive: AdaptiveControl | None = None) -> ParetoArchive:
+        """
+        Runs the same NSGA-II loop as `run` on an integer-encoded population: one int32 gene
+        matrix (individuals x capability slots) where each gene indexes its slot's option array.
+        Initialization, selection, crossover and swap mutation are vectorized over the whole
+        matrix, and ids are only decoded when the resulting archive is reported.
+
+        Args:
+            pop_size: Number of individuals in the population.
+            num_generations: Number of generations to evolve.
+            cx_prob: Probability of crossover operation.
+            mut_prob: Probability of mutation operation.
+            indpb: Per-gene swap probability of a mutated individual.
+            seed: Seed of the NumPy generator driving all operators (None = random).
+            checkpoint_path: If given, the GA state is saved to this file every `checkpoint_interval`
+                generations and after the last one; `resume` continues from it.
+            checkpoint_interval: Generations between two checkpoints.
+            initial_population: Optional warm start, an (individuals x slots) matrix of catalog
+                indices (e.g. a previous front) that replaces the first random rows; -1 or services
+                that are not an option of their slot keep a random gene.
+            archive: Optional archive to continue (e.g. the still valid part of a previous front);
+                the run merges its solutions into it instead of starting an empty one.
+            adaptive: Optional AdaptiveControl, as for `run`.
+
+        Returns:
+            A ParetoArchive containing the non-dominated solutions.
+        """
+        print(f"--- Starting Encoded GA Evolution ---")
+        print(f"Population Size: {pop_size}, Generations: {num_generations}")
+        print(f"Crossover Prob: {cx_prob}, Mutation Prob: {mut_prob}")
+
+        instrumentation = self.instrumentation
+        instrumentation.start_run(self, pop_size=pop_size, num_generations=num_generations)
+        rng = np.random.default_rng(seed)
+        encoding = SlotEncoding(self.scenario)
+        if adaptive is not None:
+            adaptive.start(self, pop_size, num_generations, cx_prob, mut_prob, indpb)
+
+        with instrumentation.phase('initialization'):
+            genes = create_encoded_population(pop_size, encoding, rng)
+            if initial_population is not None:
+                seed_encoded_population(genes, encoding, initial_population)
+        with instrumentation.phase('evaluation'):
+            objectives = self._evaluate_index_matrix(encoding.to_catalog_indices(genes))
+
+        with instrumentation.phase('archive'):
+            hall_of_fame = archive if archive is not None else self.new_archive()
+            hall_of_fame.update(encoding.to_catalog_indices(genes), objectives)
+        if adaptive is not None:
+            adaptive.update(self, 0, hall_of_fame)
+        instrumentation.end_generation(self, hall_of_fame, len(genes))
+
+        settings = {'pop_size': pop_size, 'num_generations': num_generations, 'cx_prob': cx_prob, 'mut_prob': mut_prob,
+                    'indpb': indpb, 'checkpoint_interval': checkpoint_interval}
+        return self._run_encoded_generations(genes, objectives, encoding, rng, hall_of_fame, 1, settings, checkpoint_path,
+                                             adaptive)
+
+    def reoptimize(self, previous: ParetoArchive, changed_indices, pop_size: int = 100, num_generations: int = 10,
+                   cx_prob: float = 0.7, mut_prob: float = 0.2, indpb: float = 0.1,
+                   seed: int | None = None, adaptive: AdaptiveControl | None = None) -> ParetoArchive:
+        """
+        Incremental `run_encoded` after a small catalog change (see MicroserviceCatalog.apply_diff,
+        which returns `changed_indices`: the dense indices of updated, retired and added services).
+
+        Members of the `previous` front that use a changed service are dropped from the archive,
+        the others keep their (still exact) objectives. The whole previous front seeds the
+        population: genes of retired services, or of services that are no longer an option of
+        their slot, are repaired with random options, and compositions of updated services are
+        re-evaluated with their new values. With a FitnessCache only those need to be simulated,
+        since the cache drops just the entries of changed services. A few generations then
+        adapt the front to the change, including the newly added services.
+
+        Returns:
+            A new ParetoArchive; `previous` is left unchanged.
+        """
+        changed_indices = np.asarray(changed_indices, dtype=np.int64)
+        archive = self.new_archive()
+        archive.genotypes = previous.genotypes.copy()
+        archive.objectives = previous.objectives.copy()
+        stale = archive.invalidate_services(changed_indices)
+        print(f"--- Incremental re-optimization: {len(changed_indices)} changed services, "
+              f"{len(stale)} of {len(previous)} front members affected ---")
+        # affected members first, so they are re-evaluated (and repaired) even when the front exceeds pop_size
+        seeds = np.concatenate([stale, archive.genotypes]) if len(previous) else None
+        return self.run_encoded(pop_size=pop_size, num_generations=num_generations, cx_prob=cx_prob,
+                                mut_prob=mut_prob, indpb=indpb, seed=seed, initial_population=seeds, archive=archive,
+                                adaptive=adaptive)
+
+    def _run_encoded_generations(self, genes: np.ndarray, objectives: np.ndarray, encoding: SlotEncoding,
+                                 rng: np.random.Generator, hall_of_fame: ParetoArchive, first_gen: int,
+                                 settings: dict, checkpoint_path: str | None,
+                                 adaptive: AdaptiveControl | None = None) -> ParetoArchive:
+        """Generation loop of `run_encoded` from generation `first_gen` on (also used by `resume`)."""
+        instrumentation = self.instrumentation
+        weights = METRIC_WEIGHTS
+        sla = self.scenario.sla
+        num_generations = settings['num_generations']
+        rates = settings
+        gen = first_gen - 1
+        last_gen = gen if adaptive is not None and adaptive.converged(gen) else num_generations
+        for gen in range(first_gen, last_gen + 1):
+            instrumentation.start_generation(gen)
+            if adaptive is not None:
+                rates = {'cx_prob': adaptive.cx_prob, 'mut_prob': adaptive.mut_prob, 'indpb': adaptive.indpb}
+            with instrumentation.phase('selection'):
+                # NSGA-II selection on the objective matrix, then copies of the chosen rows
+                violations = sla.violations(objectives) if sla is not None else None
+                chosen = nsga2_select_indices(objectives, weights, len(genes), violations)
+                offspring = genes[chosen]
+                offspring_objectives = objectives[chosen]
+
+            with instrumentation.phase('variation'):
+                changed = cx_two_point_matrix(offspring, rates['cx_prob'], rng)
+                changed |= mut_swap_matrix(offspring, encoding, rates['mut_prob'], rates['indpb'], rng)
+
+            with instrumentation.phase('evaluation'):
+                # Evaluate only the modified rows
+                if changed.any():
+                    offspring_objectives[changed] = self._evaluate_index_matrix(encoding.to_catalog_indices(offspring[changed]))
+
+            genes, objectives = offspring, offspring_objectives
+            with instrumentation.phase('archive'):
+                hall_of_fame.update(encoding.to_catalog_indices(genes), objectives)
+            converged = adaptive is not None and adaptive.update(self, gen, hall_of_fame)
+            if self._checkpoint_due(checkpoint_path, gen, settings) or (converged and checkpoint_path is not None):
+                with instrumentation.phase('checkpoint'):
+                    self._save_checkpoint(checkpoint_path, 'run_encoded', gen, settings, hall_of_fame,
+                                          {'genes': genes, 'objectives': objectives}, numpy_rng=rng,
+                                          adaptive=adaptive)
+            instrumentation.end_generation(self, hall_of_fame, len(genes))
+
+            if gen % 10 == 0 or gen == num_generations or converged:
+                print(f"  Gen {gen}/{num_generations} | Pop Size: {len(genes)} | Pareto Front Size: {len(hall_of_fame)}")
+            if converged:
+                break
+
+        if adaptive is not None:
+            adaptive.finish(self, gen)
+        instrumentation.end_run(self, hall_of_fame)
+        print("--- Encoded GA Evolution Complete ---")
+        return hall_of_fame
+
+    @staticmethod
+    def _checkpoint_due(checkpoint_path: str | None, gen: int, settings: dict) -> bool:
+        if checkpoint_path is None:
+            return False
+        return gen % max(settings['checkpoint_interval'], 1) == 0 or gen == settings['num_generations']
+
+    def _save_checkpoint(self, path: str, mode: str, gen: int, settings: dict, hall_of_fame: ParetoArchive,
+                         population_arrays: dict, python_rng: tuple | None = None,
+                         numpy_rng: np.random.Generator | None = None, adaptive: AdaptiveControl | None = None):
+        """
+        Writes the state needed to continue a run after generation `gen`: the population
+        arrays, the archive, the RNG state, the counters and the adaptive control state, if
+        any (the fitness cache is not saved, it only affects how many evaluations are
+        simulated, never their results).
+        """
+        arrays = {f'population_{name}': values for name, values in population_arrays.items()}
+        arrays['archive_genotypes'] = hall_of_fame.genotypes
+        arrays['archive_objectives'] = hall_of_fame.objectives
+        meta = {
+            'mode': mode,
+            'generation': gen,
+            'settings': settings,
+            'scenario': {'name': self.scenario.name, 'required_capabilities': list(self.scenario.required_capabilities)},
+            'catalog_size': len(self.scenario.catalog.ids),
+            'evaluation_count': self.evaluation_count,
+            'simulation_count': self.simulation_count
+        }
+        if python_rng is not None:
+            arrays['python_rng'], meta['python_rng'] = python_rng_state_to_array(python_rng)
+        if numpy_rng is not None:
+            meta['numpy_rng'] = numpy_rng_state(numpy_rng)
+        if adaptive is not None:
+            meta['adaptive'] = adaptive.state_dict()
+        save_checkpoint(path, arrays, meta)
+
+    def resume(self, checkpoint_path: str, num_generations: int | None = None,
+               checkpoint_interval: int | None = None, adaptive: AdaptiveControl | None = None) -> ParetoArchive:
+        """
+        Continues a `run` or `run_encoded` from a checkpoint. The population, archive, RNG
+        state, counters and adaptive control state are restored exactly, so the result is
+        bit-identical to the uninterrupted run. Checkpoints keep being written to
+        `checkpoint_path`.
+
+        Args:
+            checkpoint_path: Checkpoint file written by `run` or `run_encoded`.
+            num_generations: Total number of generations (default: the original run's).
+            checkpoint_interval: Generations between two checkpoints (default: the original run's).
+            adaptive: Controller to continue an adaptive run with; its run state is replaced by the
+                checkpointed one (default: a new controller with the checkpointed configuration).
+                Ignored for checkpoints of non-adaptive runs.
+
+        Returns:
+            A ParetoArchive containing the non-dominated solutions.
+        """
+        arrays, meta = load_checkpoint(checkpoint_path)
+        catalog = self.scenario.catalog
+        if (meta['scenario']['required_capabilities'] != list(self.scenario.required_capabilities)
+                or meta['catalog_size'] != len(catalog.ids)):
+            raise ValueError(f"Error: Checkpoint {checkpoint_path} was written for a different scenario or catalog.")
+
+        settings = dict(meta['settings'])
+        if num_generations is not None:
+            settings['num_generations'] = num_generations
+        if checkpoint_interval is not None:
+            settings['checkpoint_interval'] = checkpoint_interval
+        gen = meta['generation']
+        self.evaluation_count = meta['evaluation_count']
+        self.simulation_count = meta['simulation_count']
+
+        hall_of_fame = self.new_archive()
+        hall_of_fame.genotypes = arrays['archive_genotypes']
+        hall_of_fame.objectives = arrays['archive_objectives']
+        if 'adaptive' in meta:
+            if adaptive is None:
+                adaptive = AdaptiveControl.from_state(meta['adaptive'], hall_of_fame)
+            else:
+                adaptive.load_state(meta['adaptive'], hall_of_fame)
+            adaptive.num_generations = settings['num_generations']
+        else:
+            adaptive = None
+
+        print(f"--- Resuming GA Evolution from generation {gen} ({meta['mode']}) ---")
+        print(f"Population Size: {settings['pop_size']}, Generations: {settings['num_generations']}")
+        self.instrumentation.start_run(self, pop_size=settings['pop_size'], num_generations=settings['num_generations'])
+
+        if meta['mode'] == 'run':
+            from src.genetic_algo_logic.individual_creator import creator
+            ids = catalog.ids
+            population = []
+            for genotype, fitness in zip(arrays['population_genotypes'].tolist(), arrays['population_objectives'].tolist()):
+                # -1 is a service the catalog did not know when the checkpoint was written; it stays an
+                # unknown gene (None), which the simulator skips just like it skipped the original id
+                individual = creator.Individual([ids[index] if index >= 0 else None for index in genotype])
+                individual.fitness.values = tuple(fitness)
+                population.append(individual)
+            random.setstate(python_rng_state_from_array(arrays['python_rng'], meta['python_rng']))
+            self._set_mutation_indpb(settings.get('indpb', 0.1))
+            return self._run_generations(population, hall_of_fame, gen + 1, settings, checkpoint_path, adaptive)
+
+        rng = numpy_rng_from_state(meta['numpy_rng'])
+        return self._run_encoded_generations(arrays['population_genes'], arrays['population_objectives'],
+                                             SlotEncoding(self.scenario), rng, hall_of_fame, gen + 1,
+                                             settings, checkpoint_path, adaptive)
@@ -9,7 +9,6 @@ try:
 except RuntimeError:
     pass
 
-#modules-import ?? [NOT]
 from src.microservice_catalog import MicroserviceCatalog
 from src.scenario_definition import ServiceScenario
 
@@ -18,16 +17,17 @@ def create_random_individual(scenario: ServiceScenario) -> creator.Individual:
     #single random service composition based on the scenario's required capabilities = 1 capability slot.
     
     individual_ms_ids = []
+    catalog_ids = scenario.catalog.ids
     # authentication, storage
     for capability in scenario.required_capabilities:
-        # all microservices
-        options = scenario.get_options_for_capability(capability)
-        if not options:
+        # catalog indices of all microservices providing the capability
+        options = scenario.get_option_indices(capability)
+        if len(options) == 0:
             raise ValueError(f"Error: No microservice options found for capability '{capability}'. Check data/scenario.")
 
         # Randomly select one microservice id
-        selected_ms = random.choice(options)
-        individual_ms_ids.append(selected_ms.id)
+        selected_index = options[random.randrange(len(options))]
+        individual_ms_ids.append(catalog_ids[selected_index])
 
     # Return as DEAP Individual type
     return creator.Individual(individual_ms_ids)
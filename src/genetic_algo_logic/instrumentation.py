@@ -0,0 +1,128 @@
+# src/genetic_algo_logic/instrumentation.py
+import json
+import time
+
+from src.genetic_algo_logic.pareto_archive import ParetoArchive, hypervolume_reference
+
+class _NullPhase:
+    # shared no-op context manager, so disabled instrumentation costs one method call per phase
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_PHASE = _NullPhase()
+
+class NullInstrumentation:
+    """Default instrumentation of MOGA_Runner: every hook is a no-op."""
+    enabled = False
+
+    def start_run(self, runner, **run_args):
+        pass
+
+    def start_generation(self, generation: int):
+        pass
+
+    def phase(self, name: str):
+        return _NULL_PHASE
+
+    def end_generation(self, runner, archive: ParetoArchive, population_size: int):
+        pass
+
+    def end_run(self, runner, archive: ParetoArchive):
+        pass
+
+class _TimedPhase:
+    def __init__(self, timings: dict, name: str):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.timings[self.name] = self.timings.get(self.name, 0.0) + time.perf_counter() - self.start
+        return False
+
+class RunInstrumentation(NullInstrumentation):
+    """
+    Records one structured entry per generation of a MOGA_Runner run: seconds spent in each
+    phase (selection, variation, evaluation, archive update), evaluations requested and
+    actually simulated, fitness-cache hit rate, Pareto front size and hypervolume.
+    Every record is passed to the `callbacks` and, if `jsonl_path` is given, appended to
+    that file as one JSON line. Records are also kept in `self.records`.
+
+    The hypervolume reference point is fixed from the initial Pareto front unless
+    `hypervolume_reference` is given; set `compute_hypervolume=False` to skip it.
+    """
+    enabled = True
+
+    def __init__(self, callbacks: tuple = (), jsonl_path: str | None = None,
+                 compute_hypervolume: bool = True, hypervolume_reference=None):
+        self.callbacks = list(callbacks)
+        self.jsonl_path = jsonl_path
+        self.compute_hypervolume = compute_hypervolume
+        self.reference = hypervolume_reference
+        self.records = []
+
+    def start_run(self, runner, **run_args):
+        self.records = []
+        self._reference_from_run = self.reference is None
+        self._run_start = time.perf_counter()
+        self._last_evaluations = runner.evaluation_count
+        self._last_simulations = runner.simulation_count
+        self._last_cache = self._cache_counts(runner)
+        self.start_generation(0)
+
+    def start_generation(self, generation: int):
+        self._generation = generation
+        self._timings = {}
+
+    def phase(self, name: str):
+        return _TimedPhase(self._timings, name)
+
+    def end_generation(self, runner, archive: ParetoArchive, population_size: int):
+        hits, misses = self._cache_counts(runner)
+        lookups = (hits - self._last_cache[0]) + (misses - self._last_cache[1])
+        record = {
+            'generation': self._generation,
+            'timings': self._timings,
+            'population_size': population_size,
+            'evaluations': runner.evaluation_count - self._last_evaluations,
+            'simulations': runner.simulation_count - self._last_simulations,
+            'cache_hit_rate': (hits - self._last_cache[0]) / lookups if lookups else None,
+            'pareto_front_size': len(archive),
+            'hypervolume': self._hypervolume(archive),
+            'elapsed_s': time.perf_counter() - self._run_start
+        }
+        self._last_evaluations = runner.evaluation_count
+        self._last_simulations = runner.simulation_count
+        self._last_cache = (hits, misses)
+        self._emit(record)
+
+    def end_run(self, runner, archive: ParetoArchive):
+        # a reference derived from this run must not leak into the next one
+        if self._reference_from_run:
+            self.reference = None
+
+    def _hypervolume(self, archive: ParetoArchive) -> float | None:
+        if not self.compute_hypervolume or len(archive) == 0:
+            return None
+        if self.reference is None:
+            self.reference = hypervolume_reference(archive.objectives, archive.weights)
+        return archive.hypervolume(self.reference)
+
+    def _emit(self, record: dict):
+        self.records.append(record)
+        if self.jsonl_path is not None:
+            with open(self.jsonl_path, 'a') as f:
+                f.write(json.dumps(record) + '\n')
+        for callback in self.callbacks:
+            callback(record)
+
+    @staticmethod
+    def _cache_counts(runner) -> tuple:
+        cache = runner.fitness_cache
+        return (cache.hits, cache.misses) if cache is not None else (0, 0)
@@ -0,0 +1,175 @@
+# src/genetic_algo_logic/island_model.py
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from src.genetic_algo_logic.individual_creator import creator
+from src.genetic_algo_logic.ga_runner import MOGA_Runner
+from src.genetic_algo_logic.fitness_cache import FitnessCache
+from src.genetic_algo_logic.pareto_archive import ParetoArchive
+from src.composition_simulator import CompositionSimulator
+from src.scenario_definition import ServiceScenario
+
+TOPOLOGIES = ('ring', 'fully_connected')
+
+# Per-process runner used to evolve islands, installed once by the pool initializer
+_island_runner = None
+
+def _init_island_worker(scenario: ServiceScenario, simulator: CompositionSimulator, fitness_cache: FitnessCache | None):
+    """
+    Pool initializer: builds one MOGA_Runner per worker from the scenario, simulator and fitness
+    cache of the IslandModelRunner, sent once, so islands evaluate exactly like the caller would.
+    """
+    global _island_runner
+    _island_runner = MOGA_Runner(scenario, simulator, fitness_cache=fitness_cache)
+
+def _evolve_island(genotypes: list[list[str]] | None, fitnesses: list[tuple] | None, rng_state: tuple,
+                   pop_size: int, num_generations: int, cx_prob: float, mut_prob: float) -> tuple:
+    """
+    Worker task: evolves one island for `num_generations` with the shared toolbox.
+    Islands travel as plain id lists, fitness tuples and RNG state, so the result does not
+    depend on which worker process picks up the island. Every generation is archived in a
+    local ParetoArchive, whose rows (genotype and objective arrays) are returned for the
+    caller to merge into its hall of fame, as MOGA_Runner.run does per generation.
+    """
+    random.setstate(rng_state)
+    runner = _island_runner
+    archive = runner.new_archive()
+    if genotypes is None:
+        population = runner.toolbox.population(pop_size=pop_size)
+        runner._evaluate_invalid(population)
+        archive.update_population(population)
+    else:
+        population = [_to_individual(genotype, fitness) for genotype, fitness in zip(genotypes, fitnesses)]
+
+    for _ in range(num_generations):
+        population = runner._evolve_generation(population, cx_prob, mut_prob)
+        archive.update_population(population)
+
+    return ([list(ind) for ind in population],
+            [ind.fitness.values for ind in population],
+            random.getstate(),
+            (archive.genotypes, archive.objectives))
+
+def _to_individual(genotype: list[str], fitness: tuple) -> creator.Individual:
+    individual = creator.Individual(genotype)
+    individual.fitness.values = fitness
+    return individual
+
+class IslandModelRunner:
+    """
+    Island-model variant of MOGA_Runner: `num_islands` sub-populations evolve independently
+    in worker processes and, every `migration_interval` generations, send their best
+    non-dominated individuals to their neighbours. Immigrants compete with the residents
+    through the toolbox's NSGA-II selection, so each island keeps its size.
+
+    Islands are evaluated by `simulator`, which every worker receives once (with live QoS
+    measurements, as the snapshot taken when the run starts), and, if given, by a copy of
+    `fitness_cache` per worker; the serial fallback uses both directly.
+    """
+    def __init__(self, scenario: ServiceScenario, simulator: CompositionSimulator, num_islands: int = 4,
+                 migration_interval: int = 5, migration_size: int = 2, topology: str = 'ring',
+                 n_workers: int | None = None, seed: int | None = None, fitness_cache: FitnessCache | None = None):
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Error: Unknown migration topology '{topology}'. Expected one of {TOPOLOGIES}.")
+        self.scenario = scenario
+        self.simulator = simulator
+        self.num_islands = num_islands
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.topology = topology
+        self.n_workers = min(n_workers or os.cpu_count() or 1, num_islands)
+        self.seed = seed
+        self.fitness_cache = fitness_cache
+        # Main-process runner, only used for its toolbox (select / clone) during migration
+        self.runner = MOGA_Runner(scenario, simulator)
+        self.islands = []
+
+    def _neighbours(self, island: int) -> list[int]:
+        if self.num_islands < 2:
+            return []
+        if self.topology == 'ring':
+            return [(island + 1) % self.num_islands]
+        return [other for other in range(self.num_islands) if other != island]
+
+    def _migrate(self, populations: list[list[creator.Individual]]) -> list[list[creator.Individual]]:
+        """Sends each island's best non-dominated individuals to its neighbours and re-selects every island."""
+        select = self.runner.toolbox.select
+        emigrants = [select(population, min(self.migration_size, len(population))) for population in populations]
+        immigrants = [[] for _ in populations]
+        for island, migrants in enumerate(emigrants):
+            for target in self._neighbours(island):
+                immigrants[target].extend(map(self.runner.toolbox.clone, migrants))
+        return [select(population + arrivals, len(population)) if arrivals else population
+                for population, arrivals in zip(populations, immigrants)]
+
+    def run(self, pop_size: int = 100, num_generations: int = 50, cx_prob: float = 0.7, mut_prob: float = 0.2) -> ParetoArchive:
+        """
+        Runs the island-model GA.
+
+        Args:
+            pop_size: Number of individuals per island.
+            num_generations: Number of generations every island evolves.
+            cx_prob: Probability of crossover operation.
+            mut_prob: Probability of mutation operation.
+
+        Returns:
+            A ParetoArchive merged from all islands.
+        """
+        print(f"--- Starting Island-Model GA Evolution ---")
+        print(f"Islands: {self.num_islands} ({self.topology}), Workers: {self.n_workers}, Population Size per Island: {pop_size}")
+        print(f"Generations: {num_generations}, Migration every {self.migration_interval} generations ({self.migration_size} migrants)")
+
+        seed = self.seed if self.seed is not None else random.randrange(2**32)
+        rng_states = [random.Random(seed + island).getstate() for island in range(self.num_islands)]
+        genotypes = [None] * self.num_islands
+        fitnesses = [None] * self.num_islands
+        hall_of_fame = self.runner.new_archive()
+
+        if self.n_workers > 1:
+            executor = ProcessPoolExecutor(max_workers=self.n_workers, initializer=_init_island_worker,
+                                           initargs=(self.scenario, self.simulator, self.fitness_cache))
+            submit = lambda *args: executor.submit(_evolve_island, *args)
+        else:
+            # Serial fallback runs the very same task functions in-process
+            executor = None
+            _init_island_worker(self.scenario, self.simulator, self.fitness_cache)
+            submit = lambda *args: _ImmediateResult(_evolve_island(*args))
+
+        caller_rng_state = random.getstate() # islands reseed the global RNG, restore it for the caller
+        try:
+            gen = 0
+            while gen < num_generations:
+                epoch = min(self.migration_interval, num_generations - gen)
+                futures = [submit(genotypes[i], fitnesses[i], rng_states[i], pop_size, epoch, cx_prob, mut_prob)
+                           for i in range(self.num_islands)]
+                results = [future.result() for future in futures]
+                gen += epoch
+
+                populations = [[_to_individual(genotype, fitness) for genotype, fitness in zip(island_genotypes, island_fitnesses)]
+                               for island_genotypes, island_fitnesses, _, _ in results]
+                rng_states = [rng_state for _, _, rng_state, _ in results]
+                for _, _, _, (front_genotypes, front_objectives) in results:
+                    hall_of_fame.update(front_genotypes, front_objectives)
+
+                if gen < num_generations:
+                    populations = self._migrate(populations)
+                genotypes = [[list(ind) for ind in population] for population in populations]
+                fitnesses = [[ind.fitness.values for ind in population] for population in populations]
+                self.islands = populations
+                print(f"  Gen {gen}/{num_generations} | Islands: {self.num_islands} | Pareto Front Size: {len(hall_of_fame)}")
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            random.setstate(caller_rng_state)
+
+        print("--- Island-Model GA Evolution Complete ---")
+        return hall_of_fame
+
+class _ImmediateResult:
+    # future-like wrapper for the serial fallback
+    def __init__(self, value):
+        self._value = value
+
+    def result(self):
+        return self._value
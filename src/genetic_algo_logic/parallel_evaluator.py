@@ -0,0 +1,94 @@
+# src/genetic_algo_logic/parallel_evaluator.py
+import os
+from functools import partial
+
+import numpy as np
+
+from src.composition_simulator import CompositionSimulator, SLAConstraints, METRIC_KEYS, aggregate_composite_metrics
+from src.workflow_model import WorkflowPlan
+from src.load_model import LoadModel
+
+# Per-process copy of the simulator's metric arrays, installed once by the pool initializer
+_worker_metric_arrays = None
+
+def init_worker(metric_arrays: dict[str, np.ndarray]):
+    """
+    Pool initializer: receives the per-service metric arrays once per worker process,
+    so tasks only carry small integer index chunks. Usable with any process pool, e.g.
+    multiprocessing.Pool(initializer=init_worker, initargs=evaluator.initargs).
+    """
+    global _worker_metric_arrays
+    _worker_metric_arrays = metric_arrays
+
+def evaluate_chunk(index_matrix: np.ndarray, workflow_plan: WorkflowPlan | None = None,
+                   load_model: LoadModel | None = None, sla: SLAConstraints | None = None) -> np.ndarray:
+    """Worker task: aggregates one chunk of compositions into an (n x 4) objective array."""
+    metrics = aggregate_composite_metrics(_worker_metric_arrays, index_matrix, workflow_plan, load_model, sla)
+    return np.column_stack([metrics[key] for key in METRIC_KEYS])
+
+class ParallelEvaluator:
+    """
+    Evaluates index-encoded populations across worker processes with chunked dispatch.
+    Only integer index matrices cross the process boundary (no DEAP individuals), so the
+    module-level creator types never need to be pickled, and every row is aggregated by
+    the same function as the serial path, giving identical fitness values.
+
+    By default a ProcessPoolExecutor is created whose workers receive the catalog metrics
+    through `init_worker`. Any other `map`-like callable can be plugged in via `map_func`,
+    as long as its workers were started with `init_worker` and `initargs`.
+    """
+    def __init__(self, simulator: CompositionSimulator, n_workers: int | None = None,
+                 chunksize: int = 1024, map_func=None):
+        self.simulator = simulator
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self._external_map = map_func
+        self._executor = None
+        self._catalog_version = None
+
+    @property
+    def initargs(self) -> tuple:
+        return (self.simulator.metric_arrays(),)
+
+    def _get_map(self):
+        if self._external_map is not None:
+            return self._external_map
+        # (re)start the pool when the catalog or live measurements changed, so workers never see stale metrics
+        if self._executor is None or self._catalog_version != self.simulator.version:
+            self.close()
+            self._catalog_version = self.simulator.version
+            from concurrent.futures import ProcessPoolExecutor # deferred: in-process runs never start a pool
+            self._executor = ProcessPoolExecutor(max_workers=self.n_workers,
+                                                 initializer=init_worker, initargs=self.initargs)
+        return self._executor.map
+
+    def evaluate(self, index_matrix: np.ndarray, workflow_plan: WorkflowPlan | None = None,
+                 load_model: LoadModel | None = None, sla: SLAConstraints | None = None) -> np.ndarray:
+        """
+        Returns an (individuals x 4) array of objectives in METRIC_KEYS order, aggregated in
+        series or with the compiled `workflow_plan` of the scenario, optionally under its `load_model`
+        and rejecting rows early against its `sla`.
+        Batches no larger than one chunk are evaluated in-process to skip the IPC round trip.
+        """
+        index_matrix = np.asarray(index_matrix, dtype=np.intp)
+        if len(index_matrix) <= self.chunksize:
+            metrics = aggregate_composite_metrics(self.simulator.metric_arrays(), index_matrix, workflow_plan, load_model, sla)
+            return np.column_stack([metrics[key] for key in METRIC_KEYS])
+
+        chunks = [index_matrix[start:start + self.chunksize]
+                  for start in range(0, len(index_matrix), self.chunksize)]
+        task = evaluate_chunk
+        if workflow_plan is not None or load_model is not None or sla is not None:
+            task = partial(evaluate_chunk, workflow_plan=workflow_plan, load_model=load_model, sla=sla)
+        return np.concatenate(list(self._get_map()(task, chunks)))
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,238 @@
+# src/genetic_algo_logic/pareto_archive.py
+import json
+
+import numpy as np
+
+from src.composition_simulator import METRIC_KEYS, SLAConstraints
+from src.microservice_catalog import MicroserviceCatalog
+from src.dominance import ARCHIVE_BLOCK_ROWS, dominated_mask # dominated_mask re-exported for existing imports
+from src.genetic_algo_logic.fast_selection import crowding_distances, sort_nondominated_indices
+
+# Samples used by the Monte Carlo hypervolume estimate when moocore is not installed
+HYPERVOLUME_SAMPLES = 20_000
+
+def hypervolume_reference(objectives: np.ndarray, weights: tuple, margin: float = 0.1) -> np.ndarray:
+    """
+    Reference point for hypervolume in minimization space (-weighted objectives): the worst
+    finite value of every objective, pushed out by `margin` of its range. Fix it once per run
+    so hypervolumes of different generations are comparable.
+    """
+    minimized = -np.asarray(objectives, dtype=np.float64) * np.asarray(weights, dtype=np.float64)
+    minimized = np.where(np.isfinite(minimized), minimized, np.nan)
+    worst, best = np.nanmax(minimized, axis=0), np.nanmin(minimized, axis=0)
+    return worst + margin * np.maximum(worst - best, 1e-12)
+
+def hypervolume(objectives: np.ndarray, weights: tuple, reference: np.ndarray) -> float:
+    """
+    Hypervolume dominated by the objective rows with respect to `reference` (as returned by
+    hypervolume_reference). Uses moocore's exact algorithm when it is installed (it ships with
+    recent DEAP releases), otherwise a fixed-seed Monte Carlo estimate.
+    """
+    minimized = -np.asarray(objectives, dtype=np.float64) * np.asarray(weights, dtype=np.float64)
+    inside = np.isfinite(minimized).all(axis=1) & (minimized < reference).all(axis=1)
+    points = minimized[inside]
+    if len(points) == 0:
+        return 0.0
+    try:
+        import moocore
+        return float(moocore.hypervolume(points, ref=reference))
+    except ImportError:
+        pass
+
+    low = points.min(axis=0)
+    box_volume = float(np.prod(reference - low))
+    samples = np.random.default_rng(0).uniform(low, reference, size=(HYPERVOLUME_SAMPLES, len(reference)))
+    covered = np.zeros(len(samples), dtype=bool)
+    for start in range(0, len(points), ARCHIVE_BLOCK_ROWS):
+        block = points[start:start + ARCHIVE_BLOCK_ROWS]
+        dominates = np.ones((len(block), len(samples)), dtype=bool)
+        for obj in range(points.shape[1]):
+            dominates &= block[:, obj, None] <= samples[None, :, obj]
+        covered |= dominates.any(axis=0)
+    return box_volume * float(covered.mean())
+
+class ParetoArchive:
+    """
+    Array-backed replacement for tools.ParetoFront. Objective vectors are kept in one
+    float64 matrix and genotypes as int32 rows of catalog indices; `update` filters a whole
+    batch of candidates against the archive with vectorized dominance checks instead of
+    comparing and deep-copying individuals one at a time.
+
+    Like ParetoFront, members with identical genotypes are stored once, and equal objective
+    vectors from different genotypes are all kept. Optionally the archive can be bounded by
+    epsilon-dominance (one member per epsilon box of the objective space) or by `max_size`
+    (members with the smallest crowding distance are dropped first). With SLA `constraints`
+    only feasible rows are archived.
+    Iterating yields DEAP individuals (best first, like ParetoFront), so it can be used
+    wherever the hall of fame was used before.
+    """
+    def __init__(self, weights: tuple = (-1.0, -1.0, 1.0, 1.0), catalog: MicroserviceCatalog | None = None,
+                 epsilon: float | tuple | None = None, max_size: int | None = None,
+                 objective_names: tuple = METRIC_KEYS, constraints: SLAConstraints | None = None):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.catalog = catalog
+        self.epsilon = None if epsilon is None else np.broadcast_to(np.asarray(epsilon, dtype=np.float64), self.weights.shape)
+        self.max_size = max_size
+        self.constraints = constraints
+        self.objective_names = tuple(objective_names)
+        self.objectives = np.empty((0, len(self.weights)), dtype=np.float64)
+        self.genotypes = np.empty((0, 0), dtype=np.int32)
+        self._order = None
+
+    def __len__(self) -> int:
+        return len(self.objectives)
+
+    def update(self, genotypes: np.ndarray, objectives: np.ndarray) -> int:
+        """
+        Merges a batch of (genotype, objective vector) rows into the archive and returns how
+        many of them were added. Genotypes are rows of catalog indices, one per capability slot.
+        """
+        genotypes = np.asarray(genotypes, dtype=np.int32)
+        objectives = np.asarray(objectives, dtype=np.float64)
+        if self.constraints is not None and len(objectives):
+            feasible = self.constraints.feasible(objectives)
+            genotypes, objectives = genotypes[feasible], objectives[feasible]
+        if len(objectives) == 0:
+            return 0
+        if len(self.objectives) == 0:
+            self.genotypes = np.empty((0, genotypes.shape[1]), dtype=np.int32)
+
+        weighted = objectives * self.weights
+        archive_weighted = self.objectives * self.weights
+
+        # 1. not dominated by the archive, 2. non-dominated within the batch, 3. not already stored
+        # (filtering against the archive first keeps the quadratic batch sort small for large batches;
+        # a row dominated by an archive-dominated row is archive-dominated too, so the result is the same)
+        keep = np.flatnonzero(~dominated_mask(archive_weighted, weighted))
+        if len(keep) == 0:
+            return 0
+        keep = np.sort(keep[sort_nondominated_indices(weighted[keep], len(keep), first_front_only=True)[0]])
+        known = {row.tobytes() for row in self.genotypes}
+        unique_keep = []
+        for i in keep.tolist():
+            key = genotypes[i].tobytes()
+            if key not in known:
+                known.add(key)
+                unique_keep.append(i)
+        if not unique_keep:
+            return 0
+        keep = np.asarray(unique_keep, dtype=np.intp)
+
+        # drop archive members the new rows dominate, then append (rows stay in insertion order)
+        survivors = ~dominated_mask(weighted[keep], archive_weighted)
+        self.objectives = np.concatenate([self.objectives[survivors], objectives[keep]])
+        self.genotypes = np.concatenate([self.genotypes[survivors], genotypes[keep]])
+        self._order = None
+
+        if self.epsilon is not None:
+            self._apply_epsilon_boxes()
+        if self.max_size is not None and len(self.objectives) > self.max_size:
+            self._truncate_by_crowding()
+        return len(keep)
+
+    def update_population(self, population: list) -> int:
+        """Convenience for DEAP populations of microservice id lists (needs `catalog` to encode them)."""
+        if not population:
+            return 0
+        if self.catalog is None:
+            raise ValueError("Error: ParetoArchive needs a catalog to encode DEAP individuals.")
+        index_by_id = self.catalog.index_by_id
+        genotypes = np.array([[index_by_id.get(ms_id, -1) for ms_id in ind] for ind in population], dtype=np.int32)
+        objectives = np.array([ind.fitness.values for ind in population], dtype=np.float64)
+        return self.update(genotypes, objectives)
+
+    def invalidate_services(self, indices) -> np.ndarray:
+        """
+        Removes the members that use one of the catalog `indices` (services that were changed
+        or retired, so their objectives are stale) and returns the removed genotypes.
+        """
+        stale = np.isin(self.genotypes, np.asarray(indices, dtype=np.int64)).any(axis=1) if len(self) else np.zeros(0, dtype=bool)
+        removed = self.genotypes[stale]
+        self.objectives = self.objectives[~stale]
+        self.genotypes = self.genotypes[~stale]
+        self._order = None
+        return removed
+
+    def _apply_epsilon_boxes(self):
+        # keep one member per non-dominated epsilon box: the one closest to the box's best corner
+        weighted = self.objectives * self.weights
+        boxes = np.floor(weighted / self.epsilon)
+        box_front = sort_nondominated_indices(boxes, len(boxes), first_front_only=True)[0]
+        gap = np.nan_to_num((boxes[box_front] + 1.0) * self.epsilon - weighted[box_front], nan=np.inf)
+        order = box_front[np.argsort(np.linalg.norm(gap, axis=1), kind='stable')]
+        _, first_in_box = np.unique(boxes[order], axis=0, return_index=True)
+        keep = np.sort(order[first_in_box])
+        self.objectives = self.objectives[keep]
+        self.genotypes = self.genotypes[keep]
+
+    def _truncate_by_crowding(self):
+        distances = crowding_distances(self.objectives)
+        keep = np.sort(np.argsort(-distances, kind='stable')[:self.max_size])
+        self.objectives = self.objectives[keep]
+        self.genotypes = self.genotypes[keep]
+
+    def hypervolume(self, reference: np.ndarray) -> float:
+        """Hypervolume of the archived front, see the module-level `hypervolume`."""
+        return hypervolume(self.objectives, self.weights, reference)
+
+    def _sorted_order(self) -> np.ndarray:
+        # lexicographically best-first by weighted objectives, the order tools.ParetoFront keeps;
+        # ParetoFront inserts each member in front of equal fitnesses, so ties go newest first
+        if self._order is None:
+            weighted = self.objectives * self.weights
+            keys = (-np.arange(len(weighted)),) + tuple(-weighted[:, obj] for obj in reversed(range(weighted.shape[1])))
+            self._order = np.lexsort(keys)
+        return self._order
+
+    def decode(self, genotype: np.ndarray) -> list[str]:
+        """Catalog indices back to microservice ids (only done when results are reported)."""
+        if self.catalog is None:
+            return [int(index) for index in genotype]
+        ids = self.catalog.ids
+        return [ids[index] if index >= 0 else None for index in genotype.tolist()]
+
+    def __getitem__(self, position: int):
+        # deferred import keeps the archive usable without DEAP installed
+        from src.genetic_algo_logic.individual_creator import creator
+        row = self._sorted_order()[position]
+        individual = creator.Individual(self.decode(self.genotypes[row]))
+        individual.fitness.values = tuple(self.objectives[row].tolist())
+        return individual
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
+
+    def to_records(self, slot_names: list[str] | None = None) -> list[dict]:
+        """One dict per member (best first): the decoded composition plus every objective."""
+        records = []
+        for row in self._sorted_order().tolist():
+            composition = self.decode(self.genotypes[row])
+            record = {'composition': dict(zip(slot_names, composition)) if slot_names else composition}
+            record.update(zip(self.objective_names, self.objectives[row].tolist()))
+            records.append(record)
+        return records
+
+    def to_dataframe(self, slot_names: list[str] | None = None):
+        """Front as a pandas DataFrame, one column per capability slot and per objective."""
+        import pandas as pd
+        slot_names = slot_names or [f'slot_{i}' for i in range(self.genotypes.shape[1])]
+        rows = []
+        for record in self.to_records(slot_names):
+            row = dict(record.pop('composition'))
+            row.update(record)
+            rows.append(row)
+        return pd.DataFrame(rows, columns=list(slot_names) + list(self.objective_names))
+
+    def to_json(self, path: str | None = None, slot_names: list[str] | None = None) -> str:
+        """Front as a JSON string (infinite objectives become null), also written to `path` if given."""
+        records = self.to_records(slot_names)
+        for record in records:
+            for name in self.objective_names:
+                if not np.isfinite(record[name]):
+                    record[name] = None
+        payload = json.dumps(records, indent=2)
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(payload)
+        return payload
@@ -0,0 +1,135 @@
+# src/load_model.py
+import math
+
+import numpy as np
+
+SECONDS_PER_HOUR = 3600
+
+# above this many replicas Erlang B comes from a Poisson ratio instead of the O(c) recursion
+ERLANG_EXACT_SERVERS = 256
+
+_lgamma = np.vectorize(math.lgamma, otypes=[np.float64])
+_erfc = np.vectorize(math.erfc, otypes=[np.float64])
+
+def erlang_c(offered_load: np.ndarray, servers: np.ndarray) -> np.ndarray:
+    """
+    Probability that a request has to queue in an M/M/c system (Erlang C), vectorized over
+    services. `offered_load` is a = lambda / mu in Erlangs and `servers` the replica count c.
+    Erlang B uses the stable recursion B(k) = a B(k-1) / (k + a B(k-1)) up to
+    ERLANG_EXACT_SERVERS replicas; beyond that B = P(X = c) / P(X <= c) for X ~ Poisson(a),
+    with the CDF from the normal approximation (accurate to well below 1% at that size).
+    """
+    offered_load = np.asarray(offered_load, dtype=np.float64)
+    servers = np.asarray(servers, dtype=np.int64)
+    erlang_b = np.ones_like(offered_load)
+    for k in range(1, min(int(servers.max(initial=0)), ERLANG_EXACT_SERVERS) + 1):
+        step = offered_load * erlang_b / (k + offered_load * erlang_b)
+        erlang_b = np.where(k <= servers, step, erlang_b)
+
+    large = servers > ERLANG_EXACT_SERVERS
+    if large.any():
+        a, c = offered_load[large], servers[large].astype(np.float64)
+        log_pmf = c * np.log(a) - a - _lgamma(c + 1.0)
+        cdf = 0.5 * _erfc(-(c + 0.5 - a) / np.sqrt(2.0 * a))
+        erlang_b[large] = np.exp(log_pmf) / cdf
+
+    utilization = offered_load / np.maximum(servers, 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(utilization < 1.0, erlang_b / (1.0 - utilization * (1.0 - erlang_b)), 1.0)
+
+class LoadModel:
+    """
+    Load-aware service metrics for a target request rate of the composite service.
+
+    Each chosen service receives `target_rps` times its expected invocations per request and is
+    modelled as an M/M/c queue whose replicas each serve `base_throughput_rps` requests per
+    second. Replicas are sized so utilization stays at or below `target_utilization`
+    (c = ceil(lambda / (mu * target_utilization)), capped at `max_replicas` if given), the mean
+    queueing delay W_q = C(c, a) / (c mu - lambda) is added to the base latency, the fixed
+    hourly cost is paid per replica and the per-request cost for the actual hourly volume.
+    Services that cannot reach a stable queue (no throughput, or the replica cap) get
+    infinite latency and cost.
+    """
+    def __init__(self, target_rps: float, target_utilization: float = 0.7, max_replicas: int | None = None):
+        if target_rps <= 0:
+            raise ValueError(f"Error: target_rps must be positive, got {target_rps}.")
+        if not 0.0 < target_utilization < 1.0:
+            raise ValueError(f"Error: target_utilization must be in (0, 1), got {target_utilization}.")
+        self.target_rps = float(target_rps)
+        self.target_utilization = float(target_utilization)
+        self.max_replicas = max_replicas
+
+    def __repr__(self):
+        return f"LoadModel(target_rps={self.target_rps}, target_utilization={self.target_utilization}, max_replicas={self.max_replicas})"
+
+    def service_metrics(self, metric_arrays: dict[str, np.ndarray], service_indices: np.ndarray,
+                        arrival_rps: float) -> dict[str, np.ndarray]:
+        #loaded metrics of the given services when each receives `arrival_rps` requests per second.
+        service_rate = metric_arrays['throughput_rps'][service_indices]
+        serviceable = service_rate > 0
+        with np.errstate(divide='ignore'):
+            offered_load = np.where(serviceable, arrival_rps / np.where(serviceable, service_rate, 1.0), np.inf)
+        replicas = np.where(serviceable, np.ceil(np.minimum(offered_load, 1e12) / self.target_utilization), np.inf)
+        replicas = np.maximum(replicas, 1.0)
+        if self.max_replicas is not None:
+            replicas = np.minimum(replicas, self.max_replicas)
+
+        # a service without throughput is saturated at any load (not NaN, which every SLA bound would let pass)
+        utilization = np.where(serviceable, offered_load / np.where(serviceable, replicas, 1.0), np.inf)
+        stable = serviceable & (utilization < 1.0)
+        servers = np.where(stable, replicas, 0).astype(np.int64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            wait_s = np.where(stable, erlang_c(np.where(stable, offered_load, 0.0), servers)
+                              / (servers * service_rate - arrival_rps), np.inf)
+
+        fixed_hourly_cost = metric_arrays['fixed_hourly_cost'][service_indices]
+        return {
+            'latency_ms': metric_arrays['latency_ms'][service_indices] + wait_s * 1000.0,
+            'availability': metric_arrays['availability'][service_indices],
+            'throughput_rps': np.where(serviceable, replicas, 0.0) * service_rate,
+            'fixed_hourly_cost': np.where(stable, replicas * fixed_hourly_cost, np.inf),
+            'replicas': replicas,
+            'utilization': utilization
+        }
+
+    def loaded_metric_arrays(self, metric_arrays: dict[str, np.ndarray], index_matrix: np.ndarray,
+                             invocations: np.ndarray | None = None) -> tuple[dict[str, np.ndarray], np.ndarray]:
+        """
+        Evaluates the queueing model once per distinct service of each slot column (so at most
+        population-size services per slot, whatever the catalog size) and returns metric arrays
+        over those (slot, service) entries plus the index matrix remapped onto them, ready for
+        the usual series or workflow aggregation. Per-request cost is taken at the target
+        hourly volume, and workflow plans still scale it by the slot's invocations.
+        """
+        index_matrix = np.asarray(index_matrix, dtype=np.intp)
+        num_slots = index_matrix.shape[1]
+        if invocations is None:
+            invocations = np.ones(num_slots)
+        remapped = np.full(index_matrix.shape, -1, dtype=np.intp)
+        parts = []
+        offset = 0
+        for slot in range(num_slots):
+            column = index_matrix[:, slot]
+            valid = column >= 0
+            services, positions = np.unique(column[valid], return_inverse=True)
+            remapped[valid, slot] = offset + positions.reshape(-1)
+            parts.append(self.service_metrics(metric_arrays, services, self.target_rps * invocations[slot]))
+            parts[-1]['request_cost'] = metric_arrays['cost_per_request'][services] * (self.target_rps * SECONDS_PER_HOUR)
+            offset += len(services)
+
+        loaded = {key: np.concatenate([part[key] for part in parts]) if parts else np.empty(0) for key in
+                  ('latency_ms', 'availability', 'throughput_rps', 'fixed_hourly_cost', 'request_cost', 'replicas', 'utilization')}
+        loaded['hourly_cost'] = loaded['request_cost'] + loaded['fixed_hourly_cost']
+        return loaded, remapped
+
+if __name__ == "__main__":
+    # one service with 100 rps per replica under increasing load
+    metric_arrays = {
+        'throughput_rps': np.array([100.0]), 'latency_ms': np.array([20.0]), 'availability': np.array([0.999]),
+        'fixed_hourly_cost': np.array([0.05])
+    }
+    model = LoadModel(target_rps=1.0, target_utilization=0.8)
+    for arrival_rps in (10, 50, 80, 150, 1000):
+        metrics = model.service_metrics(metric_arrays, np.array([0]), arrival_rps)
+        print(f"{arrival_rps:>5} rps: {int(metrics['replicas'][0])} replica(s), utilization {metrics['utilization'][0]:.2f}, "
+              f"latency {metrics['latency_ms'][0]:.2f}ms, fixed cost {metrics['fixed_hourly_cost'][0]:.2f}/h")
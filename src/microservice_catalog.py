@@ -1,48 +1,339 @@
 import json
 import os
-import pandas as pd
+from typing import TYPE_CHECKING
+
+import numpy as np
 from src.microservice_model import Microservice
+from src.catalog_io import (NUMERIC_FIELDS, CatalogDiff, columns_from_records, diff_columns, is_binary_catalog,
+                            open_binary_catalog, read_json_columns, write_binary_catalog)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# catalog versions whose changed service indices are remembered for selective cache invalidation
+CHANGE_LOG_SIZE = 64
+# string columns besides the ids; binary catalogs decode them on first access
+STRING_COLUMNS = ('names', 'types', 'capabilities')
 
 class MicroserviceCatalog:
+
+    # columnar catalog: service ids are interned to dense integer indices (row i of every column),
+    # numeric fields live in NumPy arrays and Microservice objects are only built when requested.
+
+    # `data_file_path` is either a JSON catalog, which is parsed incrementally, or a binary
+    # catalog directory (see src/catalog_io.py), whose numeric columns are memory-mapped.
+
     def __init__(self, data_file_path='data/simulated_microservices.json'):
         self.data_file_path = data_file_path
+        self._catalog_df = None
+        self._mapped_from = None # binary catalog directory the columns are memory-mapped from
+        self.version = 0 # bumped on every add/remove so dependent caches can tell they are stale
+        self._change_log = [] # (version, changed service indices) of the latest changes
         self._load_catalog()
 
     def _load_catalog(self):
-        #loads microservice data from the JSON file.
+        #loads microservice data from the JSON file or binary catalog directory.
         current_dir = os.path.dirname(__file__)
         abs_data_path = os.path.join(current_dir, '..', self.data_file_path)
 
         try:
-            with open(abs_data_path, 'r') as f:
-                data = json.load(f)
-            # store as a DataFrame for efficient lookup and filtering
-            self.catalog_df = pd.DataFrame(data)
-            self.microservices_by_id = {
-                row['id']: Microservice(**row) for index, row in self.catalog_df.iterrows()
-            }
-            print(f"Loaded {len(self.microservices_by_id)} microservices into catalog.")
+            if is_binary_catalog(abs_data_path):
+                self._build_columns(open_binary_catalog(abs_data_path))
+                self._mapped_from = abs_data_path
+            else:
+                self._build_columns(read_json_columns(abs_data_path))
+            print(f"Loaded {len(self)} microservices into catalog.")
         except FileNotFoundError:
             print(f"Error: Microservice data file not found at {abs_data_path}")
-            self.microservices_by_id = {}
-            self.catalog_df = pd.DataFrame() # Initialize empty DataFrame
+            self._build_columns(columns_from_records([]))
         except json.JSONDecodeError:
             print(f"Error: Could not decode JSON from {abs_data_path}")
-            self.microservices_by_id = {}
-            self.catalog_df = pd.DataFrame()
+            self._build_columns(columns_from_records([]))
+
+    def _build_columns(self, columns: dict):
+        # string columns stay as python lists, numeric ones are contiguous (possibly memory-mapped) arrays.
+        # `columns` is read_json_columns output or open_binary_catalog output, whose string columns come
+        # as loaders and whose inverted indices are stored, so opening a binary catalog is O(#labels).
+        self.ids = columns['ids']
+        self._strings = {name: columns[name] for name in STRING_COLUMNS if name in columns}
+        self._string_loaders = columns.get('strings', {})
+        self._buffers = dict(columns['numeric'])
+        self._refresh_column_views()
+
+        self._index_by_id = None # id -> dense index, built on first use
+        self._live_count = columns.get('live_count')
+        # inverted indices capability / type -> ascending service indices, kept up to date by add/remove.
+        # stored ones are read-only array slices until a change turns the touched entry into a list.
+        if columns.get('capability_index') is not None:
+            self._indices_by_capability = dict(columns['capability_index'])
+            self._indices_by_type = dict(columns['type_index'])
+        else:
+            self._indices_by_type = {}
+            self._indices_by_capability = {}
+            for i in sorted(self.index_by_id.values()): # duplicated ids keep only their last row, as before
+                self._indices_by_type.setdefault(self.types[i], []).append(i)
+                for cap in self.capabilities[i]:
+                    self._indices_by_capability.setdefault(cap, []).append(i)
+        self._capability_arrays = {}
+        self._catalog_df = None
+
+    def _string_column(self, name: str) -> list:
+        column = self._strings.get(name)
+        if column is None:
+            column = self._strings[name] = self._string_loaders[name]()
+        return column
+
+    @property
+    def names(self) -> list[str]:
+        return self._string_column('names')
+
+    @property
+    def types(self) -> list[str]:
+        return self._string_column('types')
+
+    @property
+    def capabilities(self) -> list[list[str]]:
+        return self._string_column('capabilities')
+
+    @property
+    def index_by_id(self) -> dict[str, int]:
+        if self._index_by_id is None:
+            self._index_by_id = dict(zip(self.ids, range(len(self.ids)))) # a duplicated id keeps its last row
+        return self._index_by_id
+
+    @staticmethod
+    def _mutable_indices(index: dict, label: str) -> list[int]:
+        # entry of an inverted index as a list that add/remove can change in place
+        indices = index.get(label)
+        if not isinstance(indices, list):
+            indices = index[label] = [] if indices is None else indices.tolist()
+        return indices
+
+    def save_binary(self, directory: str):
+        # writes the live services to a binary catalog directory that later loads memory-mapped.
+        live = sorted(self.index_by_id.values())
+        write_binary_catalog(directory, {
+            'ids': [self.ids[i] for i in live],
+            'names': [self.names[i] for i in live],
+            'types': [self.types[i] for i in live],
+            'capabilities': [self.capabilities[i] for i in live],
+            'numeric': {field: column[live] for field, column in self.columns.items()}
+        })
+
+    def __getstate__(self):
+        # an unmodified memory-mapped catalog is pickled (e.g. to worker processes) as its path,
+        # so every process maps the same files instead of receiving a copy of the columns.
+        if self._mapped_from is not None and self.version == 0:
+            return {'data_file_path': self.data_file_path, '_mapped_from': self._mapped_from}
+        state = self.__dict__.copy()
+        state['_catalog_df'] = None
+        return state
+
+    def __setstate__(self, state):
+        if 'ids' in state:
+            self.__dict__.update(state)
+            return
+        self.data_file_path = state['data_file_path']
+        self._catalog_df = None
+        self._mapped_from = state['_mapped_from']
+        self.version = 0
+        self._change_log = []
+        self._build_columns(open_binary_catalog(self._mapped_from))
+
+    def _refresh_column_views(self):
+        # columns are views over over-allocated buffers so appends are amortized O(1).
+        size = len(self.ids)
+        self.columns = {field: buffer[:size] for field, buffer in self._buffers.items()}
+
+    def __len__(self) -> int:
+        if self._index_by_id is None and self._live_count is not None:
+            return self._live_count
+        return len(self.index_by_id)
+
+    @property
+    def catalog_df(self) -> 'pd.DataFrame':
+        # DataFrame view of the columns, only built when someone asks for it.
+        if self._catalog_df is None:
+            import pandas as pd # deferred: pandas is only needed for reporting, not on the hot path
+            live = sorted(self.index_by_id.values())
+            self._catalog_df = pd.DataFrame({
+                'id': [self.ids[i] for i in live],
+                'name': [self.names[i] for i in live],
+                'type': [self.types[i] for i in live],
+                'capabilities': [self.capabilities[i] for i in live],
+                **{field: column[live] for field, column in self.columns.items()}
+            }, index=live)
+        return self._catalog_df
+
+    def column(self, field: str) -> np.ndarray:
+        #numeric column indexed by the dense service index.
+        return self.columns[field]
+
+    def index_of(self, ms_id: str) -> int:
+        #dense index of a service id, -1 if it is not in the catalog.
+        return self.index_by_id.get(ms_id, -1)
+
+    def get_microservice_at(self, index: int) -> Microservice:
+        #lightweight Microservice view of row `index`.
+        columns = self.columns
+        return Microservice(
+            self.ids[index], self.names[index], self.types[index], self.capabilities[index],
+            columns['base_latency_ms'][index].item(),
+            columns['base_availability_percent'][index].item(),
+            columns['base_throughput_rps'][index].item(),
+            columns['cost_per_request'][index].item(),
+            columns['fixed_hourly_cost'][index].item()
+        )
+
+    def get_microservices_at(self, indices) -> list[Microservice]:
+        #Microservice views for a sequence of dense indices.
+        return [self.get_microservice_at(int(index)) for index in indices]
 
     def get_microservice_by_id(self, ms_id: str) -> Microservice | None:
         #microservice object by its ID.
-        return self.microservices_by_id.get(ms_id)
+        index = self.index_by_id.get(ms_id)
+        if index is None:
+            return None
+        return self.get_microservice_at(index)
 
     def get_microservices_by_type(self, ms_type: str) -> list[Microservice]:
         #list of Microservice objects of a specific type.
-        filtered_ids = self.catalog_df[self.catalog_df['type'] == ms_type]['id'].tolist()
-        return [self.microservices_by_id[ms_id] for ms_id in filtered_ids]
+        return self.get_microservices_at(self._indices_by_type.get(ms_type, []))
 
     def get_all_microservices(self) -> list[Microservice]:
         #list of all Microservice objects.
-        return list(self.microservices_by_id.values())
+        return self.get_microservices_at(self.index_by_id.values())
+
+    def get_capability_indices(self, capability: str) -> np.ndarray:
+        #ascending service indices providing a capability, straight from the inverted index.
+        indices = self._capability_arrays.get(capability)
+        if indices is None:
+            indices = np.array(self._indices_by_capability.get(capability, []), dtype=np.intp)
+            self._capability_arrays[capability] = indices
+        return indices
+
+    def list_capabilities(self) -> list[str]:
+        #capabilities provided by at least one service in the catalog.
+        return sorted(cap for cap, indices in self._indices_by_capability.items() if len(indices))
+
+    def get_microservices_by_capability(self, capability: str) -> list[Microservice]:
+        #list of Microservice objects providing a specific capability.
+        return self.get_microservices_at(self.get_capability_indices(capability))
+
+    def add_microservice(self, record: dict) -> int:
+        # appends one service (same fields as a JSON catalog entry) and returns its dense index.
+        ms_id = record['id']
+        if ms_id in self.index_by_id:
+            raise ValueError(f"Error: Microservice with ID '{ms_id}' is already in the catalog.")
+
+        index = len(self.ids)
+        capacity = len(self._buffers[NUMERIC_FIELDS[0]])
+        if index >= capacity:
+            self._reallocate(max(2 * capacity, 16))
+        self._ensure_writeable()
+        for field in NUMERIC_FIELDS:
+            self._buffers[field][index] = record[field]
+
+        self.ids.append(ms_id)
+        self.names.append(record['name'])
+        self.types.append(record['type'])
+        self.capabilities.append(record['capabilities'])
+        self._refresh_column_views()
+
+        self.index_by_id[ms_id] = index
+        self._mutable_indices(self._indices_by_type, record['type']).append(index)
+        for cap in record['capabilities']:
+            self._mutable_indices(self._indices_by_capability, cap).append(index) # new index is the largest, order is kept
+            self._capability_arrays.pop(cap, None)
+        self._mark_changed([index])
+        return index
+
+    def remove_microservice(self, ms_id: str) -> bool:
+        # retires a service; its row stays in the columns so other dense indices remain valid.
+        index = self.index_by_id.pop(ms_id, None)
+        if index is None:
+            return False
+
+        self._mutable_indices(self._indices_by_type, self.types[index]).remove(index)
+        for cap in self.capabilities[index]:
+            self._mutable_indices(self._indices_by_capability, cap).remove(index)
+            self._capability_arrays.pop(cap, None)
+        self._mark_changed([index])
+        return True
+
+    def update_microservice(self, ms_id: str, fields: dict) -> int:
+        # overwrites numeric fields of a service in place (price or QoS changes) and returns its dense index.
+        index = self.index_by_id.get(ms_id)
+        if index is None:
+            raise ValueError(f"Error: Microservice with ID '{ms_id}' is not in the catalog.")
+        unknown = [field for field in fields if field not in NUMERIC_FIELDS]
+        if unknown:
+            raise ValueError(f"Error: Cannot update non-numeric or unknown field(s) {unknown} of '{ms_id}'.")
+        self._ensure_writeable()
+        for field, value in fields.items():
+            self._buffers[field][index] = value
+        self._mark_changed([index])
+        return index
+
+    def diff_from(self, data_file_path: str) -> CatalogDiff:
+        #diff from the live services of this catalog to a newer JSON catalog file.
+        live = sorted(self.index_by_id.values())
+        current = {
+            'ids': [self.ids[i] for i in live],
+            'names': [self.names[i] for i in live],
+            'types': [self.types[i] for i in live],
+            'capabilities': [self.capabilities[i] for i in live],
+            'numeric': {field: column[live] for field, column in self.columns.items()}
+        }
+        return diff_columns(current, read_json_columns(data_file_path))
+
+    def apply_diff(self, diff: CatalogDiff) -> np.ndarray:
+
+        # applies a CatalogDiff in place: numeric updates overwrite their rows, retired services are removed and
+        # new ones appended, keeping every other dense index (and everything cached for it) valid.
+        # returns the sorted dense indices of all updated, retired and added services.
+
+        affected = []
+        for ms_id, fields in diff.updated.items():
+            if ms_id not in self.index_by_id:
+                print(f"Warning: Cannot update '{ms_id}', it is not in the catalog. Skipping.")
+                continue
+            affected.append(self.update_microservice(ms_id, fields))
+        for ms_id in diff.removed:
+            index = self.index_by_id.get(ms_id, -1)
+            if self.remove_microservice(ms_id):
+                affected.append(index)
+        for record in diff.added:
+            affected.append(self.add_microservice(record))
+        return np.unique(np.array(affected, dtype=np.intp))
+
+    def changed_indices_since(self, version: int) -> np.ndarray | None:
+        # dense indices of services changed after `version`, or None if that is too far back to tell.
+        if version == self.version:
+            return np.empty(0, dtype=np.intp)
+        if not self._change_log or version < self._change_log[0][0] - 1 or version > self.version:
+            return None
+        return np.unique(np.concatenate([indices for logged, indices in self._change_log if logged > version]))
+
+    def _reallocate(self, capacity: int):
+        # over-allocated private copies of the numeric buffers (also turns memory-mapped columns writeable)
+        size = len(self.ids)
+        for field, buffer in self._buffers.items():
+            grown = np.empty(capacity, dtype=np.float64)
+            grown[:size] = buffer[:size]
+            self._buffers[field] = grown
+        self._refresh_column_views()
+
+    def _ensure_writeable(self):
+        # copy-on-write for memory-mapped columns
+        if not self._buffers[NUMERIC_FIELDS[0]].flags.writeable:
+            self._reallocate(max(len(self._buffers[NUMERIC_FIELDS[0]]), 16))
+
+    def _mark_changed(self, indices: list[int]):
+        self.version += 1
+        self._change_log.append((self.version, np.asarray(indices, dtype=np.intp)))
+        del self._change_log[:-CHANGE_LOG_SIZE]
+        self._catalog_df = None
 
 if __name__ == "__main__":
     catalog = MicroserviceCatalog()
@@ -58,4 +349,10 @@ if __name__ == "__main__":
         print(f"- {ms.name} (Cost/Req: {ms.cost_per_request})")
 
     all_services = catalog.get_all_microservices()
-    print(f"\nTotal services in catalog: {len(all_services)}")
\ No newline at end of file
+    print(f"\nTotal services in catalog: {len(all_services)}")
+
+    if catalog.index_by_id:
+        version = catalog.version
+        first_id = next(iter(catalog.index_by_id))
+        changed = catalog.apply_diff(CatalogDiff(updated={first_id: {"base_latency_ms": 25.0}}))
+        print(f"Applied diff: changed indices {changed.tolist()}, changed since v{version}: {catalog.changed_indices_since(version).tolist()}")
@@ -1,6 +1,11 @@
 import json
 
 class Microservice:
+    # __slots__ keeps the per-object footprint small, the catalog creates these views on demand from its columns
+    __slots__ = ('id', 'name', 'type', 'capabilities', 'base_latency_ms',
+                 'base_availability_percent', 'base_throughput_rps',
+                 'cost_per_request', 'fixed_hourly_cost')
+
     def __init__(self, id, name, type, capabilities, base_latency_ms,
                  base_availability_percent, base_throughput_rps,
                  cost_per_request, fixed_hourly_cost):
@@ -0,0 +1,359 @@
+# src/qos_providers.py
+import asyncio
+import json
+import random
+import ssl
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from src.microservice_catalog import MicroserviceCatalog
+
+# measured fields a provider may report, and the catalog column each one replaces
+MEASURED_FIELDS = {
+    'latency_ms': 'base_latency_ms',
+    'availability_percent': 'base_availability_percent',
+    'throughput_rps': 'base_throughput_rps'
+}
+
+class QoSProvider:
+
+    # source of live per-service QoS measurements. `measure` returns a dict with any subset of
+    # MEASURED_FIELDS (fields it cannot measure are left out) or None if nothing is known.
+
+    def service_ids(self) -> list[str]:
+        #ids this provider can measure.
+        raise NotImplementedError
+
+    async def measure(self, ms_id: str) -> dict | None:
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+class StubQoSProvider(QoSProvider):
+
+    # offline provider: the catalog's base values with random latency jitter and simulated probe failures.
+    # uses its own RNG so live measurements never disturb the GA's random stream.
+
+    def __init__(self, catalog: MicroserviceCatalog, latency_jitter: float = 0.1, failure_rate: float = 0.0,
+                 delay_s: float = 0.0, seed: int | None = 0):
+        self.catalog = catalog
+        self.latency_jitter = latency_jitter
+        self.failure_rate = failure_rate
+        self.delay_s = delay_s
+        self._rng = random.Random(seed)
+
+    def service_ids(self) -> list[str]:
+        return list(self.catalog.index_by_id)
+
+    async def measure(self, ms_id: str) -> dict | None:
+        if self.delay_s:
+            await asyncio.sleep(self.delay_s) # stands in for the network round trip
+        ms = self.catalog.get_microservice_by_id(ms_id)
+        if ms is None or self._rng.random() < self.failure_rate:
+            return None
+        return {
+            'latency_ms': ms.base_latency_ms * (1.0 + self.latency_jitter * self._rng.uniform(-1.0, 1.0)),
+            'availability_percent': ms.base_availability_percent
+        }
+
+class ReplayQoSProvider(QoSProvider):
+
+    # replays recorded measurements from a JSON lines file, one {"id": ..., <measured fields>} object per line.
+    # several lines for the same id form a time series: each measure() call returns the next one, wrapping around.
+
+    def __init__(self, replay_file_path: str, delay_s: float = 0.0):
+        self.replay_file_path = replay_file_path
+        self.delay_s = delay_s
+        self._series = {}
+        self._positions = {}
+        with open(replay_file_path, 'r') as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"Warning: Skipping malformed line {line_number} of {replay_file_path}.")
+                    continue
+                sample = {field: float(record[field]) for field in MEASURED_FIELDS if record.get(field) is not None}
+                self._series.setdefault(record['id'], []).append(sample)
+
+    def service_ids(self) -> list[str]:
+        return list(self._series)
+
+    async def measure(self, ms_id: str) -> dict | None:
+        if self.delay_s:
+            await asyncio.sleep(self.delay_s)
+        series = self._series.get(ms_id)
+        if not series:
+            return None
+        position = self._positions.get(ms_id, 0)
+        self._positions[ms_id] = (position + 1) % len(series)
+        return series[position]
+
+class HttpProbeProvider(QoSProvider):
+
+    # probes service endpoints with HTTP GET over asyncio streams. latency is the mean round trip of the
+    # successful probes in a sliding window, availability the share of successful probes in it.
+    # keep-alive connections are pooled per (host, port, tls), so repeated probes skip the handshake.
+
+    def __init__(self, endpoints: dict[str, str], timeout_s: float = 2.0, window: int = 20,
+                 max_idle_per_host: int = 4):
+        self.endpoints = endpoints
+        self.timeout_s = timeout_s
+        self.max_idle_per_host = max_idle_per_host
+        self._history = {ms_id: deque(maxlen=window) for ms_id in endpoints}
+        self._idle = {}
+        self._ssl_context = None
+
+    def service_ids(self) -> list[str]:
+        return list(self.endpoints)
+
+    async def _connect(self, host: str, port: int, use_tls: bool):
+        idle = self._idle.get((host, port, use_tls))
+        while idle:
+            reader, writer = idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer
+            writer.close()
+        if use_tls and self._ssl_context is None:
+            self._ssl_context = ssl.create_default_context()
+        return await asyncio.open_connection(host, port, ssl=self._ssl_context if use_tls else None)
+
+    def _release(self, key: tuple, reader, writer, reusable: bool):
+        idle = self._idle.setdefault(key, [])
+        if reusable and len(idle) < self.max_idle_per_host:
+            idle.append((reader, writer))
+        else:
+            writer.close()
+
+    async def _get(self, url: str) -> int:
+        # one GET request, returns the status code; the body is drained so the connection can be reused
+        parts = urlsplit(url)
+        use_tls = parts.scheme == 'https'
+        host = parts.hostname
+        port = parts.port or (443 if use_tls else 80)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        key = (host, port, use_tls)
+
+        reader, writer = await self._connect(host, port, use_tls)
+        try:
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\nConnection: keep-alive\r\n\r\n".encode('ascii'))
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode('latin-1').strip()
+                if not line:
+                    break
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+            reusable = 'content-length' in headers and headers.get('connection', '').lower() != 'close'
+            if reusable:
+                await reader.readexactly(int(headers['content-length']))
+        except BaseException:
+            writer.close()
+            raise
+        self._release(key, reader, writer, reusable)
+        return status
+
+    async def measure(self, ms_id: str) -> dict | None:
+        history = self._history[ms_id]
+        start = time.perf_counter()
+        try:
+            status = await asyncio.wait_for(self._get(self.endpoints[ms_id]), self.timeout_s)
+            history.append((time.perf_counter() - start) * 1000.0 if status < 400 else None)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError, IndexError):
+            history.append(None)
+
+        latencies = [latency for latency in history if latency is not None]
+        measurement = {'availability_percent': 100.0 * len(latencies) / len(history)}
+        if latencies:
+            measurement['latency_ms'] = sum(latencies) / len(latencies)
+        return measurement
+
+    async def close(self):
+        for idle in self._idle.values():
+            for _, writer in idle:
+                writer.close()
+        self._idle.clear()
+
+class LiveQoSCache:
+
+    # TTL cache of live measurements, refreshed concurrently (at most `max_concurrency` probes in flight).
+    # refreshes build a new snapshot and swap it in, so readers (the simulator) never wait for I/O and
+    # never see a half-updated snapshot; `version` is bumped on every swap. entries older than `ttl_s`
+    # are dropped and the static catalog values apply again: `overlay` skips them, and reading `version`
+    # after the oldest entry expired swaps in a snapshot without them (a new version), so simulators
+    # rebuild their metric arrays even between refreshes.
+
+    def __init__(self, provider: QoSProvider, catalog: MicroserviceCatalog, ttl_s: float = 60.0,
+                 refresh_interval_s: float | None = None, max_concurrency: int = 32,
+                 probe_timeout_s: float = 5.0):
+        self.provider = provider
+        self.catalog = catalog
+        self.ttl_s = ttl_s
+        self.refresh_interval_s = refresh_interval_s if refresh_interval_s is not None else ttl_s / 2
+        self.max_concurrency = max_concurrency
+        self.probe_timeout_s = probe_timeout_s
+        self.last_refresh = None
+        self._version = 0
+        self._snapshot = {} # ms_id -> (measured_at, measurement)
+        self._next_expiry = None # monotonic time at which the oldest snapshot entry expires
+        self._swap_lock = threading.Lock()
+        self._thread = None
+        self._loop = None
+        self._stop_event = None
+
+    async def refresh_async(self) -> int:
+        #measures every service once and swaps in the new snapshot, returns how many were measured.
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def probe(ms_id):
+            async with semaphore:
+                try:
+                    return ms_id, await asyncio.wait_for(self.provider.measure(ms_id), self.probe_timeout_s)
+                except Exception as e:
+                    print(f"Warning: QoS measurement of '{ms_id}' failed: {e!r}")
+                    return ms_id, None
+
+        results = await asyncio.gather(*(probe(ms_id) for ms_id in self.provider.service_ids()))
+        now = time.monotonic()
+        measured = 0
+        with self._swap_lock:
+            snapshot = self._live_entries(now)
+            for ms_id, measurement in results:
+                if measurement:
+                    snapshot[ms_id] = (now, measurement)
+                    measured += 1
+            self._swap(snapshot)
+        self.last_refresh = now
+        return measured
+
+    def _live_entries(self, now: float) -> dict:
+        return {ms_id: entry for ms_id, entry in self._snapshot.items() if now - entry[0] <= self.ttl_s}
+
+    def _swap(self, snapshot: dict):
+        #callers hold `_swap_lock`.
+        self._snapshot = snapshot
+        self._next_expiry = min(entry[0] for entry in snapshot.values()) + self.ttl_s if snapshot else None
+        self._version += 1
+
+    @property
+    def version(self) -> int:
+        # bumped whenever the set of live entries changes: on every refresh, and when entries expire
+        next_expiry = self._next_expiry
+        if next_expiry is not None and time.monotonic() > next_expiry:
+            with self._swap_lock:
+                now = time.monotonic()
+                if self._next_expiry is not None and now > self._next_expiry:
+                    self._swap(self._live_entries(now))
+        return self._version
+
+    def refresh(self) -> int:
+        #blocking single refresh, for scripts and tests without the background thread.
+        return asyncio.run(self._refresh_and_close())
+
+    async def _refresh_and_close(self) -> int:
+        try:
+            return await self.refresh_async()
+        finally:
+            await self.provider.close()
+
+    def start(self):
+        #starts refreshing every `refresh_interval_s` in a daemon thread with its own event loop.
+        if self._thread is not None:
+            return
+        started = threading.Event()
+        self._thread = threading.Thread(target=self._run_loop, args=(started,), name='qos-refresh', daemon=True)
+        self._thread.start()
+        started.wait()
+
+    def _run_loop(self, started: threading.Event):
+        async def refresh_forever():
+            self._loop = asyncio.get_running_loop()
+            self._stop_event = asyncio.Event()
+            started.set()
+            try:
+                while not self._stop_event.is_set():
+                    await self.refresh_async()
+                    try:
+                        await asyncio.wait_for(self._stop_event.wait(), self.refresh_interval_s)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                await self.provider.close()
+        asyncio.run(refresh_forever())
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._stop_event.set)
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def overlay(self) -> dict[str, np.ndarray]:
+        # measured values per catalog column, aligned with the catalog's dense indices (NaN = not measured).
+        snapshot = self._snapshot
+        now = time.monotonic()
+        size = len(self.catalog.ids)
+        overlay = {column: np.full(size, np.nan) for column in MEASURED_FIELDS.values()}
+        index_by_id = self.catalog.index_by_id
+        for ms_id, (measured_at, measurement) in snapshot.items():
+            index = index_by_id.get(ms_id)
+            if index is None or now - measured_at > self.ttl_s:
+                continue
+            for field, value in measurement.items():
+                column = MEASURED_FIELDS.get(field)
+                if column is not None:
+                    overlay[column][index] = value
+        return overlay
+
+    def __len__(self) -> int:
+        now = time.monotonic()
+        return sum(1 for measured_at, _ in self._snapshot.values() if now - measured_at <= self.ttl_s)
+
+    def __reduce__(self):
+        # the provider, thread and lock stay in this process: other processes (e.g. island workers
+        # receiving a simulator) get the measurements as they are now
+        self.version # drops expired entries first
+        with self._swap_lock:
+            return (LiveQoSSnapshot, (self.overlay(), self._version))
+
+class LiveQoSSnapshot:
+
+    # frozen overlay and version of a LiveQoSCache, what a LiveQoSCache is pickled as. a simulator using it
+    # evaluates with exactly the measurements of the cache at that moment, without probing or expiring.
+
+    def __init__(self, overlay: dict[str, np.ndarray], version: int):
+        self._overlay = overlay
+        self.version = version
+
+    def overlay(self) -> dict[str, np.ndarray]:
+        return {column: values.copy() for column, values in self._overlay.items()}
+
+if __name__ == "__main__":
+    catalog = MicroserviceCatalog()
+    live_qos = LiveQoSCache(StubQoSProvider(catalog, latency_jitter=0.2, delay_s=0.01), catalog, ttl_s=30.0)
+    start = time.perf_counter()
+    measured = live_qos.refresh()
+    print(f"Measured {measured} services in {time.perf_counter() - start:.3f}s (snapshot version {live_qos.version}).")
+    overlay = live_qos.overlay()
+    for ms_id in list(catalog.index_by_id)[:5]:
+        index = catalog.index_of(ms_id)
+        print(f"- {ms_id}: latency {catalog.column('base_latency_ms')[index]}ms -> {overlay['base_latency_ms'][index]:.1f}ms")
@@ -1,36 +1,183 @@
+import numpy as np
 from src.microservice_catalog import MicroserviceCatalog
 from src.microservice_model import Microservice
+from src.workflow_model import WorkflowNode, compile_workflow
+from src.load_model import LoadModel, SECONDS_PER_HOUR
+from src.composition_simulator import CompositionSimulator, SLAConstraints, METRIC_KEYS, aggregate_composite_metrics
+from src.dominance import dominated_mask
+
+# slots with more options than this skip the (quadratic) within-slot dominance pruning
+DOMINANCE_PRUNING_MAX_OPTIONS = 5000
+
+def slot_dominated_mask(metrics: dict[str, np.ndarray], minimized_keys: tuple = ()) -> np.ndarray:
+    # options of one slot strictly dominated by another option of it on every per-service value the
+    # aggregation uses (as returned by ServiceScenario.slot_service_metrics).
+    # larger is better: -latency, -fixed cost, -per-request cost, availability, capacity,
+    # and minus every value of `minimized_keys` (replicas / utilization when the SLA bounds them)
+    weighted = np.column_stack([-metrics['latency_ms'], -metrics['fixed_hourly_cost'], -metrics['request_cost'],
+                                metrics['availability'], metrics['throughput_rps']]
+                               + [-metrics[key] for key in minimized_keys])
+    return dominated_mask(weighted, weighted)
 
 class ServiceScenario:
 
     # defines the requirements for a composite service in the simulation.= capabilitiesfrom the composed microservices.
 
-    def __init__(self, name: str, required_capabilities: list[str], catalog: MicroserviceCatalog):
+    # `workflow` optionally describes how the slots are called (parallel fan-out, branches, loops, see
+    # src/workflow_model.py); it is compiled once into `workflow_plan`. None keeps the plain series composition.
+    # `target_rps` turns on the load-aware evaluation (src/load_model.py): services are sized to keep their
+    # utilization under `target_utilization` at that request rate and their latency includes queueing delay;
+    # `max_replicas` caps the replicas of each service (services that cannot keep up with it are unusable).
+    # `sla` (SLAConstraints) makes the scenario constrained: the option lists are pruned up front (see
+    # _prune_options) and evaluation ranks by constraint dominance and skips the unconstrained metrics of
+    # infeasible compositions.
+
+    def __init__(self, name: str, required_capabilities: list[str], catalog: MicroserviceCatalog,
+                 workflow: WorkflowNode | None = None, target_rps: float | None = None,
+                 target_utilization: float = 0.7, sla: SLAConstraints | None = None,
+                 max_replicas: int | None = None):
+        if target_rps is None and (max_replicas is not None or (sla is not None and sla.load_limits)):
+            raise ValueError(f"Error: Scenario '{name}' bounds replicas or utilization but has no target_rps.")
         self.name = name
         self.required_capabilities = required_capabilities
         self.catalog = catalog
-        self.available_options_by_type = self._map_available_options()
+        self.workflow = workflow
+        self.workflow_plan = compile_workflow(workflow, required_capabilities) if workflow is not None else None
+        self.target_rps = target_rps
+        self.load_model = LoadModel(target_rps, target_utilization, max_replicas) if target_rps is not None else None
+        self.sla = sla
+        self.option_indices_by_type = self._map_available_options()
 
-    def _map_available_options(self) -> dict[str, list[Microservice]]:
+    def _map_available_options(self) -> dict[str, np.ndarray]:
 
-       # maps each required capability to a list of microservices in the catalog that can provide that capability.
+       # maps each required capability to the catalog indices of the microservices that can provide it,
+       # resolved from the catalog's capability -> service inverted index.
 
+        self._catalog_version = self.catalog.version
         options = {}
         for cap in self.required_capabilities:
-            # This logic needs iterate through all services and check their capabilities list
-            matching_services = []
-            for ms in self.catalog.get_all_microservices():
-                if cap in ms.capabilities: # Check if the capability is in the MS's list
-                    matching_services.append(ms)
-            
-            if not matching_services:
+            matching_indices = self.catalog.get_capability_indices(cap)
+            if len(matching_indices) == 0:
                 print(f"Warning: No microservices found in catalog for required capability: {cap}")
-            options[cap] = matching_services
+            options[cap] = matching_indices
+        if self.sla is not None:
+            options = self._prune_options(options)
         return options
-    
+
+    @property
+    def bounded_load_keys(self) -> tuple:
+        #per-service load values the SLA bounds (through the composition's replicas / utilization), which
+        # within-slot dominance has to respect as well.
+        if self.load_model is None or self.sla is None or not self.sla.load_limits:
+            return ()
+        return ('replicas', 'utilization')
+
+    def slot_service_metrics(self, metric_arrays: dict[str, np.ndarray], slot: int, indices: np.ndarray) -> dict[str, np.ndarray]:
+        #the per-service values the aggregation actually consumes for these options in this slot
+        # (sized and queued at the slot's arrival rate under a load model)
+        if self.load_model is None:
+            return {key: metric_arrays[key][indices] for key in
+                    ('hourly_cost', 'request_cost', 'fixed_hourly_cost', 'latency_ms', 'availability', 'throughput_rps')}
+        invocations = self.workflow_plan.invocations[slot] if self.workflow_plan is not None else 1.0
+        loaded = self.load_model.service_metrics(metric_arrays, indices, self.load_model.target_rps * invocations)
+        loaded['request_cost'] = metric_arrays['cost_per_request'][indices] * (self.load_model.target_rps * SECONDS_PER_HOUR)
+        loaded['hourly_cost'] = loaded['request_cost'] + loaded['fixed_hourly_cost']
+        return loaded
+
+    def _prune_options(self, options: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+
+        # drops options that can never be part of a useful composition, using per-slot bounds from the catalog.
+        # 1. per slot, the best value of every metric over its options forms an ideal service; an option is
+        #    pruned if even combined with the ideal services of all other slots it violates the SLA. every
+        #    aggregation (series, workflow plan, load model) is monotone in the per-service values, so that
+        #    composition bounds all real ones containing the option.
+        # 2. options strictly dominated within their slot (no better on any per-service value, worse on one)
+        #    are pruned: swapping in the dominating option never makes a composition worse.
+        #    with replica / utilization bounds in the SLA, replicas and utilization count as per-service values
+        #    too, and options over the utilization bound, or whose replicas plus the fewest replicas of every
+        #    other slot exceed the replica budget, are pruned in step 1.
+        # duplicated capabilities keep the union of what their slots keep. a slot that would lose every
+        # option keeps them all (with a warning), so the GA still ranks by how far the SLA is missed.
+        # pruning uses the static catalog values, live QoS measurements may still move services later.
+
+        metric_arrays = CompositionSimulator(self.catalog).metric_arrays()
+        num_slots = len(self.required_capabilities)
+        slot_metrics = [self.slot_service_metrics(metric_arrays, slot, options[cap])
+                        for slot, cap in enumerate(self.required_capabilities)]
+        ideal = {}
+        for key in slot_metrics[0] if num_slots else ():
+            best = np.max if key in ('availability', 'throughput_rps') else np.min
+            ideal[key] = np.array([best(metrics[key]) if len(metrics[key]) else np.nan for metrics in slot_metrics])
+
+        load_keys = self.bounded_load_keys
+        keep_by_cap = {}
+        for slot, cap in enumerate(self.required_capabilities):
+            metrics = slot_metrics[slot]
+            count = len(options[cap])
+            if count == 0:
+                keep_by_cap.setdefault(cap, np.zeros(0, dtype=bool))
+                continue
+            # ideal services occupy entries 0..num_slots-1, this slot's options follow
+            virtual = {key: np.concatenate([ideal[key], metrics[key]]) for key in ideal}
+            # (slots without any option are skipped, like unknown services)
+            slot_entries = np.where(np.isnan(ideal['latency_ms']), -1, np.arange(num_slots)).astype(np.intp)
+            index_matrix = np.tile(slot_entries, (count, 1))
+            index_matrix[:, slot] = num_slots + np.arange(count)
+            bound = aggregate_composite_metrics(virtual, index_matrix, self.workflow_plan)
+            keep = self.sla.feasible(np.column_stack([bound[key] for key in METRIC_KEYS]))
+            if load_keys:
+                fewest_elsewhere = np.nansum(np.delete(ideal['replicas'], slot))
+                keep &= self.sla.metric_violation('total_replicas', metrics['replicas'] + fewest_elsewhere) <= 0.0
+                keep &= self.sla.metric_violation('max_utilization', metrics['utilization']) <= 0.0
+
+            candidates = np.flatnonzero(keep)
+            if 0 < len(candidates) <= DOMINANCE_PRUNING_MAX_OPTIONS:
+                keep[candidates[slot_dominated_mask({key: values[candidates] for key, values in metrics.items()}, load_keys)]] = False
+            keep_by_cap[cap] = keep_by_cap.get(cap, np.zeros(count, dtype=bool)) | keep
+
+        pruned = {}
+        for cap, matching_indices in options.items():
+            keep = keep_by_cap.get(cap, np.ones(len(matching_indices), dtype=bool))
+            if len(matching_indices) and not keep.any():
+                print(f"Warning: No option for capability '{cap}' can meet the SLA of scenario '{self.name}'; keeping all {len(matching_indices)}.")
+                keep = np.ones(len(matching_indices), dtype=bool)
+            pruned[cap] = matching_indices[keep]
+        return pruned
+
+    def evaluation_signature(self) -> tuple:
+        # hashable description of how this scenario turns a genotype into objectives (workflow plan, load
+        # model, SLA bounds), independent of its name and capabilities: scenarios with equal
+        # signatures give the same fitness for the same row of catalog indices.
+        plan = self.workflow_plan
+        load = self.load_model
+        return (
+            (tuple(plan.instructions), tuple(plan.invocations.tolist())) if plan is not None else None,
+            (load.target_rps, load.target_utilization, load.max_replicas) if load is not None else None,
+            tuple(self.sla.limits.items()) + tuple(self.sla.load_limits.items()) if self.sla is not None else None
+        )
+
+    def _ensure_current(self):
+        # re-resolve the options if services were added to or removed from the catalog since mapping.
+        if self._catalog_version != self.catalog.version:
+            self.option_indices_by_type = self._map_available_options()
+
+    @property
+    def available_options_by_type(self) -> dict[str, list[Microservice]]:
+        self._ensure_current()
+        return {cap: self.catalog.get_microservices_at(indices) for cap, indices in self.option_indices_by_type.items()}
+
+    def get_option_indices(self, capability: str) -> np.ndarray:
+        #ascending catalog indices of the options for a capability, for operators that sample directly.
+        self._ensure_current()
+        return self.option_indices_by_type.get(capability, np.empty(0, dtype=np.intp))
+
+    def get_slot_option_indices(self) -> list[np.ndarray]:
+        #option index arrays aligned with required_capabilities (one per capability slot).
+        return [self.get_option_indices(cap) for cap in self.required_capabilities]
+
     def get_options_for_capability(self, capability: str) -> list[Microservice]:
         #returns microservice options for a specific capability.= latency etc.
-        return self.available_options_by_type.get(capability, [])
+        return self.catalog.get_microservices_at(self.get_option_indices(capability))
 if __name__ == "__main__":
     catalog = MicroserviceCatalog()
     
@@ -50,4 +197,14 @@ if __name__ == "__main__":
 
     print("\nAvailable options for 'data_storage':")
     for ms in user_profile_scenario.get_options_for_capability("data_storage"):
-        print(f"- {ms.name} (ID: {ms.id})")
\ No newline at end of file
+        print(f"- {ms.name} (ID: {ms.id})")
+    # the same service under an SLA: options that cannot meet it, or are dominated in their slot, are pruned
+    sla_scenario = ServiceScenario(
+        name="User Profile Service (SLA)",
+        required_capabilities=["user_authentication", "process_payment", "data_storage"],
+        catalog=catalog,
+        sla=SLAConstraints(max_latency_ms=200.0, min_availability_percent=99.0)
+    )
+    print(f"\nScenario: {sla_scenario.name} with {sla_scenario.sla}")
+    for cap in sla_scenario.required_capabilities:
+        print(f"- {cap}: {len(sla_scenario.get_option_indices(cap))} of {len(user_profile_scenario.get_option_indices(cap))} options kept")
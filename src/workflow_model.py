@@ -0,0 +1,229 @@
+# src/workflow_model.py
+import numpy as np
+
+# The structure of a composite service: which capability slots are called, in which order and how often.
+# A workflow is a tree of Task / Sequence / Parallel / Branch / Loop nodes; compile_workflow turns it
+# once into a flat postfix plan that aggregates a whole population of compositions with array operations.
+
+class WorkflowNode:
+    # base class of the workflow nodes, only used for type checks and hints
+    pass
+
+class Task(WorkflowNode):
+    # one call to the microservice chosen for a capability slot (index into required_capabilities, or its name)
+    def __init__(self, slot: int | str):
+        self.slot = slot
+
+    def __repr__(self):
+        return f"Task({self.slot!r})"
+
+class Sequence(WorkflowNode):
+    # steps run one after another: latencies add up, all of them must succeed
+    def __init__(self, *steps: WorkflowNode):
+        self.steps = list(steps)
+
+    def __repr__(self):
+        return f"Sequence({', '.join(map(repr, self.steps))})"
+
+class Parallel(WorkflowNode):
+    # fan-out: every branch handles the request concurrently, latency is the slowest branch
+    def __init__(self, *branches: WorkflowNode):
+        self.branches = list(branches)
+
+    def __repr__(self):
+        return f"Parallel({', '.join(map(repr, self.branches))})"
+
+class Branch(WorkflowNode):
+    # conditional: exactly one option runs with the given probability; the remaining probability skips the branch
+    def __init__(self, *options: tuple[float, WorkflowNode]):
+        self.options = [(float(probability), node) for probability, node in options]
+
+    def __repr__(self):
+        return f"Branch({', '.join(f'({p}, {node!r})' for p, node in self.options)})"
+
+class Loop(WorkflowNode):
+    # the body runs `expected_iterations` times on average (retries, pagination, ...)
+    def __init__(self, body: WorkflowNode, expected_iterations: float):
+        self.body = body
+        self.expected_iterations = float(expected_iterations)
+
+    def __repr__(self):
+        return f"Loop({self.body!r}, {self.expected_iterations})"
+
+def workflow_from_dict(spec) -> WorkflowNode:
+    """
+    Builds a workflow from its JSON form, e.g.
+    {"sequence": [0, {"parallel": ["data_storage", 2]}, {"loop": 1, "iterations": 1.5},
+                  {"branch": [[0.7, 3], [0.3, 4]]}]}
+    where a bare int or string is a Task on that slot.
+    """
+    if isinstance(spec, (int, str)):
+        return Task(spec)
+    if 'sequence' in spec:
+        return Sequence(*map(workflow_from_dict, spec['sequence']))
+    if 'parallel' in spec:
+        return Parallel(*map(workflow_from_dict, spec['parallel']))
+    if 'branch' in spec:
+        return Branch(*((probability, workflow_from_dict(node)) for probability, node in spec['branch']))
+    if 'loop' in spec:
+        return Loop(workflow_from_dict(spec['loop']), spec.get('iterations', 1.0))
+    raise ValueError(f"Error: Unknown workflow node {spec!r}.")
+
+class WorkflowPlan:
+    """
+    Compiled form of a workflow for a fixed list of capability slots.
+
+    `instructions` is a postfix program over per-individual (latency, availability) vectors:
+    ('task', slot) pushes a slot's values, ('sequence', k) / ('parallel', k) combine the top k
+    entries, ('branch', probabilities) the top len(probabilities) entries, ('loop', n) rescales
+    the top entry. Cost and throughput do not need the program: `invocations[s]` is the
+    expected number of calls of slot s per request, so per-request cost is weighted by it
+    (fixed hourly cost is paid once per chosen service regardless), and a service sustains
+    throughput / invocations requests per second of the composite.
+    """
+    def __init__(self, instructions: list[tuple], invocations: np.ndarray):
+        self.instructions = instructions
+        self.invocations = invocations
+
+    def __repr__(self):
+        return f"WorkflowPlan({len(self.instructions)} instructions, invocations={self.invocations.tolist()})"
+
+    def aggregate(self, metric_arrays: dict[str, np.ndarray], index_matrix: np.ndarray) -> dict[str, np.ndarray]:
+        """
+        Workflow counterpart of composition_simulator.aggregate_composite_metrics: same inputs
+        (catalog indices per slot, -1 = unknown and skipped) and the same output metrics.
+        """
+        index_matrix = np.asarray(index_matrix, dtype=np.intp)
+        valid = index_matrix >= 0
+        safe_index = np.where(valid, index_matrix, 0)
+
+        latency = np.where(valid, metric_arrays['latency_ms'][safe_index], 0.0)
+        availability = np.where(valid, metric_arrays['availability'][safe_index], 1.0)
+        stack = []
+        for op, arg in self.instructions:
+            if op == 'task':
+                stack.append((latency[:, arg], availability[:, arg]))
+                continue
+            if op == 'loop':
+                step_latency, step_availability = stack.pop()
+                stack.append((step_latency * arg, step_availability ** arg))
+                continue
+            count = len(arg) if op == 'branch' else arg
+            latencies = [entry[0] for entry in stack[-count:]]
+            availabilities = [entry[1] for entry in stack[-count:]]
+            del stack[-count:]
+            if op == 'sequence':
+                stack.append((np.sum(latencies, axis=0), np.prod(availabilities, axis=0)))
+            elif op == 'parallel':
+                stack.append((np.max(latencies, axis=0), np.prod(availabilities, axis=0)))
+            else: # branch: expected latency, and success unless the taken option fails (skipping always succeeds)
+                probabilities = np.asarray(arg)[:, None]
+                stack.append(((probabilities * latencies).sum(axis=0),
+                              (probabilities * availabilities).sum(axis=0) + (1.0 - probabilities.sum())))
+        total_latency_ms, total_availability = stack.pop()
+
+        invocations = self.invocations
+        total_cost = np.where(valid, metric_arrays['fixed_hourly_cost'][safe_index]
+                              + metric_arrays['request_cost'][safe_index] * invocations, 0.0).sum(axis=1)
+        with np.errstate(divide='ignore'):
+            capacity = np.where(valid & (invocations > 0),
+                                metric_arrays['throughput_rps'][safe_index] / invocations, np.inf)
+        min_throughput_rps = capacity.min(axis=1)
+
+        # same "worst case" metrics as the series path for rows without any valid service
+        empty = ~valid.any(axis=1)
+        total_cost[empty] = np.inf
+        total_latency_ms = np.array(total_latency_ms, dtype=np.float64)
+        total_latency_ms[empty] = np.inf
+        total_availability_percent = total_availability * 100.0
+        total_availability_percent[empty] = 0.0
+        min_throughput_rps[empty] = 0.0
+
+        return {
+            'total_cost': total_cost,
+            'total_latency_ms': total_latency_ms,
+            'total_availability_percent': total_availability_percent,
+            'min_throughput_rps': min_throughput_rps
+        }
+
+def _flatten(node: Sequence | Parallel) -> list[WorkflowNode]:
+    # children of a sequence (parallel), with directly nested sequences (parallels) inlined
+    flat = []
+    for child in (node.steps if isinstance(node, Sequence) else node.branches):
+        if type(child) is type(node):
+            flat.extend(_flatten(child))
+        else:
+            flat.append(child)
+    return flat
+
+def compile_workflow(workflow: WorkflowNode, required_capabilities: list[str]) -> WorkflowPlan:
+    """
+    Compiles a workflow over the slots of `required_capabilities` into a WorkflowPlan.
+    Nested sequences and parallels are flattened. Raises ValueError for unknown slots,
+    invalid probabilities or iteration counts, and slots the workflow never calls.
+    """
+    num_slots = len(required_capabilities)
+    invocations = np.zeros(num_slots, dtype=np.float64)
+    instructions = []
+
+    def resolve(slot) -> int:
+        if isinstance(slot, str):
+            matches = [i for i, cap in enumerate(required_capabilities) if cap == slot]
+            if len(matches) != 1:
+                raise ValueError(f"Error: Workflow task '{slot}' must match exactly one required capability (found {len(matches)}); use a slot index.")
+            return matches[0]
+        if not 0 <= slot < num_slots:
+            raise ValueError(f"Error: Workflow task slot {slot} is out of range for {num_slots} capability slots.")
+        return slot
+
+    def emit(node: WorkflowNode, weight: float):
+        if isinstance(node, Task):
+            slot = resolve(node.slot)
+            invocations[slot] += weight
+            instructions.append(('task', slot))
+        elif isinstance(node, (Sequence, Parallel)):
+            op = 'sequence' if isinstance(node, Sequence) else 'parallel'
+            if not (node.steps if op == 'sequence' else node.branches):
+                raise ValueError(f"Error: Workflow {op} needs at least one step.")
+            flat = _flatten(node) # Sequence(Sequence(a, b), c) == Sequence(a, b, c), same for Parallel
+            for child in flat:
+                emit(child, weight)
+            if len(flat) > 1:
+                instructions.append((op, len(flat)))
+        elif isinstance(node, Branch):
+            probabilities = [probability for probability, _ in node.options]
+            if not probabilities or min(probabilities) < 0.0 or sum(probabilities) > 1.0 + 1e-9:
+                raise ValueError(f"Error: Branch probabilities must be non-negative and sum to at most 1, got {probabilities}.")
+            for probability, child in node.options:
+                emit(child, weight * probability)
+            instructions.append(('branch', tuple(probabilities)))
+        elif isinstance(node, Loop):
+            if node.expected_iterations <= 0.0:
+                raise ValueError(f"Error: Loop expected_iterations must be positive, got {node.expected_iterations}.")
+            emit(node.body, weight * node.expected_iterations)
+            instructions.append(('loop', node.expected_iterations))
+        else:
+            raise ValueError(f"Error: Unknown workflow node {node!r}.")
+
+    emit(workflow, 1.0)
+    unused = [required_capabilities[slot] for slot in range(num_slots) if not any(
+        op == 'task' and arg == slot for op, arg in instructions)]
+    if unused:
+        raise ValueError(f"Error: Workflow never calls the capability slot(s) {unused}.")
+    return WorkflowPlan(instructions, invocations)
+
+if __name__ == "__main__":
+    # authentication, then profile + recommendations in parallel, then payment (retried on average 1.2 times)
+    # and either e-mail or SMS notification
+    capabilities = ["user_authentication", "data_storage", "recommendation", "process_payment", "email", "sms"]
+    workflow = Sequence(
+        Task("user_authentication"),
+        Parallel(Task("data_storage"), Task("recommendation")),
+        Loop(Task("process_payment"), 1.2),
+        Branch((0.8, Task("email")), (0.2, Task("sms")))
+    )
+    plan = compile_workflow(workflow, capabilities)
+    print(workflow)
+    print(plan)
+    for instruction in plan.instructions:
+        print(" ", instruction)
@@ -0,0 +1,61 @@
+import json
+
+import numpy as np
+import pytest
+
+from src.microservice_catalog import MicroserviceCatalog
+from src.composition_simulator import CompositionSimulator
+from src.scenario_definition import ServiceScenario
+
+CAPABILITIES = [f'cap_{c}' for c in range(6)]
+SERVICE_TYPES = ('authentication', 'payment', 'database', 'search')
+
+def catalog_records(num_services: int = 80, seed: int = 0) -> list[dict]:
+    # small seeded catalog in the data/microservices.json format: few capabilities, so every slot has a
+    # handful of options, and continuous metrics, so equal objectives only come from equal compositions
+    rng = np.random.default_rng(seed)
+    records = []
+    for i in range(num_services):
+        capabilities = rng.choice(len(CAPABILITIES), size=int(rng.integers(1, 3)), replace=False)
+        records.append({
+            'id': f'svc-{i}',
+            'name': f'Test Service {i}',
+            'type': SERVICE_TYPES[i % len(SERVICE_TYPES)],
+            'capabilities': [CAPABILITIES[c] for c in sorted(capabilities.tolist())],
+            'base_latency_ms': float(rng.uniform(5.0, 150.0)),
+            'base_availability_percent': float(rng.uniform(98.0, 99.99)),
+            'base_throughput_rps': float(rng.uniform(20.0, 500.0)),
+            'cost_per_request': float(rng.uniform(1e-4, 5e-3)),
+            'fixed_hourly_cost': float(rng.uniform(0.01, 0.5))
+        })
+    return records
+
+@pytest.fixture(scope='session')
+def records() -> list[dict]:
+    return catalog_records()
+
+@pytest.fixture(scope='session')
+def catalog_path(tmp_path_factory, records) -> str:
+    path = tmp_path_factory.mktemp('catalog') / 'catalog.json'
+    with open(path, 'w') as f:
+        json.dump(records, f)
+    return str(path)
+
+@pytest.fixture(scope='session')
+def catalog(catalog_path) -> MicroserviceCatalog:
+    # shared by the read-only tests; tests that change a catalog load their own from catalog_path
+    return MicroserviceCatalog(catalog_path)
+
+@pytest.fixture(scope='session')
+def simulator(catalog) -> CompositionSimulator:
+    return CompositionSimulator(catalog)
+
+@pytest.fixture(scope='session')
+def capabilities(records) -> list[str]:
+    # the four capabilities with the fewest providers keep brute force cheap
+    providers = {cap: sum(cap in record['capabilities'] for record in records) for cap in CAPABILITIES}
+    return sorted(CAPABILITIES, key=providers.get)[:4]
+
+@pytest.fixture
+def scenario(catalog, capabilities) -> ServiceScenario:
+    return ServiceScenario('Test Scenario', capabilities, catalog)
@@ -0,0 +1,39 @@
+import contextlib
+import io
+import json
+
+import pytest
+
+from src.genetic_algo_logic.batch_optimizer import BatchOptimizer
+
+def _specs(capabilities: list[str]) -> list[dict]:
+    return [
+        {'name': 'small', 'required_capabilities': capabilities[:2]},
+        {'name': 'large', 'required_capabilities': capabilities},
+        {'name': 'small again', 'required_capabilities': capabilities[:2]},
+        {'name': 'loaded', 'required_capabilities': capabilities, 'target_rps': 150.0}
+    ]
+
+def _optimize(catalog, capabilities, output_path, n_workers: int = 1, **limits) -> list[dict]:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return BatchOptimizer(catalog, n_workers=n_workers).optimize(
+            _specs(capabilities), output_path=str(output_path), pop_size=20, num_generations=3, seed=1, **limits)
+
+def test_methods_duplicates_and_cache_stats(catalog, capabilities, tmp_path):
+    results = _optimize(catalog, capabilities, tmp_path / 'exact.json')
+    assert [result['method'] for result in results] == ['enumeration', 'enumeration', 'duplicate', 'enumeration']
+    assert results[2]['front'] == results[0]['front']
+    # the exact solvers do not use the fitness cache, so nothing is reported about it
+    assert all('fitness_cache_hits' not in result for result in results)
+    assert 'fitness_cache' not in json.load(open(tmp_path / 'exact.json'))['run']
+
+    results = _optimize(catalog, capabilities, tmp_path / 'ga.json', enumeration_max_size=0)
+    assert {result['method'] for result in results} == {'ga', 'duplicate'}
+    assert all(result['fitness_cache_hits'] >= 0 for result in results)
+    assert json.load(open(tmp_path / 'ga.json'))['run']['fitness_cache']
+
+@pytest.mark.parametrize('limits', [{}, {'enumeration_max_size': 0}])
+def test_serial_and_parallel_batches_match(catalog, capabilities, tmp_path, limits):
+    fronts = [[result['front'] for result in _optimize(catalog, capabilities, tmp_path / f'{n}.json', n, **limits)]
+              for n in (1, 2)]
+    assert fronts[0] == fronts[1]
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from src.microservice_catalog import MicroserviceCatalog, CHANGE_LOG_SIZE
+from src.catalog_io import NUMERIC_FIELDS
+
+def _record(ms_id: str, capabilities: list[str], latency: float = 12.5) -> dict:
+    return {'id': ms_id, 'name': f'Service {ms_id}', 'type': 'search', 'capabilities': capabilities,
+            'base_latency_ms': latency, 'base_availability_percent': 99.5, 'base_throughput_rps': 250.0,
+            'cost_per_request': 0.001, 'fixed_hourly_cost': 0.1}
+
+def _scan(catalog: MicroserviceCatalog, capability: str) -> list[int]:
+    # what the inverted index replaces: a linear scan over the live services
+    return [i for i in sorted(catalog.index_by_id.values()) if capability in catalog.capabilities[i]]
+
+def test_columns_and_views_match_records(catalog, records):
+    assert len(catalog) == len(records)
+    for field in NUMERIC_FIELDS:
+        assert catalog.column(field).tolist() == [record[field] for record in records]
+    for i, record in enumerate(records):
+        assert catalog.index_of(record['id']) == i
+        assert catalog.get_microservice_at(i).to_dict() == record
+        assert catalog.get_microservice_by_id(record['id']).to_dict() == record
+    assert catalog.index_of('missing') == -1
+    assert catalog.get_microservice_by_id('missing') is None
+    assert [ms.id for ms in catalog.get_microservices_by_type('payment')] == \
+        [record['id'] for record in records if record['type'] == 'payment']
+    assert catalog.catalog_df['id'].tolist() == [record['id'] for record in records]
+    assert catalog.catalog_df['base_latency_ms'].tolist() == [record['base_latency_ms'] for record in records]
+
+def test_capability_index_matches_linear_scan(catalog, records):
+    for capability in sorted({cap for record in records for cap in record['capabilities']}) + ['unknown']:
+        assert catalog.get_capability_indices(capability).tolist() == _scan(catalog, capability)
+
+def test_add_and_remove_keep_the_index_consistent(catalog_path, records):
+    catalog = MicroserviceCatalog(catalog_path)
+    version = catalog.version
+    index = catalog.add_microservice(_record('svc-new', ['cap_0', 'cap_new']))
+    assert index == len(records)
+    assert catalog.version == version + 1
+    assert catalog.get_microservice_by_id('svc-new').base_latency_ms == 12.5
+    with pytest.raises(ValueError):
+        catalog.add_microservice(_record('svc-new', ['cap_1']))
+
+    removed = records[3]
+    assert catalog.remove_microservice(removed['id'])
+    assert not catalog.remove_microservice(removed['id'])
+    assert catalog.index_of(removed['id']) == -1
+    # retired rows stay, so every other dense index is unchanged
+    assert catalog.index_of(records[4]['id']) == 4
+    assert len(catalog) == len(records)
+    for capability in sorted({cap for record in records for cap in record['capabilities']}) + ['cap_new']:
+        assert catalog.get_capability_indices(capability).tolist() == _scan(catalog, capability)
+
+def test_changed_indices_since(catalog_path, records):
+    catalog = MicroserviceCatalog(catalog_path)
+    start = catalog.version
+    assert catalog.changed_indices_since(start).tolist() == []
+    catalog.update_microservice(records[5]['id'], {'base_latency_ms': 1.0})
+    middle = catalog.version
+    catalog.remove_microservice(records[2]['id'])
+    added = catalog.add_microservice(_record('svc-new', ['cap_1']))
+    assert catalog.changed_indices_since(start).tolist() == [2, 5, added]
+    assert catalog.changed_indices_since(middle).tolist() == [2, added]
+    assert catalog.changed_indices_since(catalog.version + 1) is None
+    with pytest.raises(ValueError):
+        catalog.update_microservice(records[5]['id'], {'name': 'renamed'})
+
+    for _ in range(CHANGE_LOG_SIZE):
+        catalog.update_microservice(records[0]['id'], {'cost_per_request': 0.002})
+    assert catalog.changed_indices_since(start) is None # too far back to tell
+    assert catalog.changed_indices_since(catalog.version - 1).tolist() == [0]
+
+def test_apply_diff_from_a_newer_catalog(catalog_path, records, tmp_path):
+    newer = [dict(record) for record in records if record['id'] != records[2]['id']]
+    newer[4]['base_latency_ms'] = 1.0 # records[5]
+    newer[6]['capabilities'] = ['cap_new'] # records[7] changes its capabilities: retired and added again
+    newer.append(_record('svc-new', ['cap_0']))
+    path = tmp_path / 'newer.json'
+    path.write_text(json.dumps(newer))
+
+    catalog = MicroserviceCatalog(catalog_path)
+    diff = catalog.diff_from(str(path))
+    assert diff.updated == {records[5]['id']: {'base_latency_ms': 1.0}}
+    assert sorted(diff.removed) == sorted([records[2]['id'], records[7]['id']])
+    assert [record['id'] for record in diff.added] == [records[7]['id'], 'svc-new']
+
+    affected = catalog.apply_diff(diff)
+    assert affected.tolist() == [2, 5, 7, len(records), len(records) + 1]
+    assert catalog.diff_from(str(path)).to_dict() == {'updated': {}, 'added': [], 'removed': []}
+    assert catalog.get_capability_indices('cap_new').tolist() == [len(records)]
+    for capability in sorted({cap for record in newer for cap in record['capabilities']}):
+        assert catalog.get_capability_indices(capability).tolist() == _scan(catalog, capability)
@@ -0,0 +1,105 @@
+import json
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from src.microservice_catalog import MicroserviceCatalog
+from src.catalog_io import (MANIFEST_FILE, NUMERIC_FIELDS, columns_from_records, convert_json_to_binary,
+                            iter_json_array, read_json_columns)
+
+def _assert_same_catalog(catalog: MicroserviceCatalog, expected: MicroserviceCatalog):
+    live = sorted(expected.index_by_id.values())
+    assert len(catalog) == len(expected)
+    assert catalog.ids == [expected.ids[i] for i in live]
+    assert catalog.names == [expected.names[i] for i in live]
+    assert catalog.types == [expected.types[i] for i in live]
+    assert catalog.capabilities == [expected.capabilities[i] for i in live]
+    for field in NUMERIC_FIELDS:
+        assert catalog.column(field).tolist() == expected.column(field)[live].tolist()
+    for capability in sorted({cap for caps in expected.capabilities for cap in caps}):
+        assert [catalog.ids[i] for i in catalog.get_capability_indices(capability)] == \
+            [expected.ids[i] for i in expected.get_capability_indices(capability)]
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 64, 1 << 20])
+def test_iter_json_array_streams_in_chunks(records, tmp_path, chunk_size):
+    path = tmp_path / 'catalog.json'
+    path.write_text(json.dumps(records, indent=2)) # whitespace and numbers get split across chunks
+    assert list(iter_json_array(str(path), chunk_size)) == records
+    assert read_json_columns(str(path), chunk_size)['ids'] == [record['id'] for record in records]
+
+@pytest.mark.parametrize('text, expected', [('[]', []), (' [ ] ', []), ('[1, 2.5e3 ,{"a": [3]}]', [1, 2500.0, {'a': [3]}])])
+def test_iter_json_array_small_documents(tmp_path, text, expected):
+    path = tmp_path / 'small.json'
+    path.write_text(text)
+    for chunk_size in range(1, len(text) + 2): # every split, e.g. '2.' | '5e3' of a number
+        assert list(iter_json_array(str(path), chunk_size)) == expected
+
+@pytest.mark.parametrize('text', ['{"id": 1}', '[1 2]', '[1, 2', '[{"id": 1'])
+def test_iter_json_array_rejects_malformed_documents(tmp_path, text):
+    path = tmp_path / 'bad.json'
+    path.write_text(text)
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(str(path), chunk_size=3))
+
+def test_read_json_columns_matches_parsed_records(catalog_path, records):
+    streamed, parsed = read_json_columns(catalog_path, chunk_size=100), columns_from_records(records)
+    for name in ('ids', 'names', 'types', 'capabilities'):
+        assert streamed[name] == parsed[name]
+    for field in NUMERIC_FIELDS:
+        assert np.array_equal(streamed['numeric'][field], parsed['numeric'][field])
+
+def test_binary_catalog_round_trip(catalog, catalog_path, tmp_path):
+    directory = str(tmp_path / 'binary')
+    assert convert_json_to_binary(catalog_path, directory, chunk_size=100) == len(catalog)
+    mapped = MicroserviceCatalog(directory)
+    assert not mapped.column('base_latency_ms').flags.writeable
+    _assert_same_catalog(mapped, catalog)
+
+    # copy-on-write: changing the mapped catalog leaves the files alone
+    mapped.add_microservice(dict(catalog.get_microservice_at(0).to_dict(), id='svc-copy', base_latency_ms=1.0))
+    mapped.remove_microservice(mapped.ids[1])
+    assert mapped.column('base_latency_ms')[-1] == 1.0
+    _assert_same_catalog(MicroserviceCatalog(directory), catalog)
+
+    # save_binary writes only the live services
+    saved = str(tmp_path / 'saved')
+    mapped.save_binary(saved)
+    _assert_same_catalog(MicroserviceCatalog(saved), mapped)
+
+def test_binary_catalog_of_the_previous_format(catalog, tmp_path):
+    # format 1 directories have no stored inverted indices; the catalog builds them on load
+    directory = str(tmp_path / 'binary')
+    catalog.save_binary(directory)
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    for name in os.listdir(directory):
+        if 'member' in name:
+            os.remove(os.path.join(directory, name))
+    with open(manifest_path, 'w') as f:
+        json.dump(dict(manifest, format_version=1), f)
+    _assert_same_catalog(MicroserviceCatalog(directory), catalog)
+
+    with open(manifest_path, 'w') as f:
+        json.dump(dict(manifest, format_version=99), f)
+    with pytest.raises(ValueError):
+        MicroserviceCatalog(directory)
+
+def test_binary_catalog_pickles(catalog, tmp_path):
+    directory = str(tmp_path / 'binary')
+    catalog.save_binary(directory)
+    mapped = MicroserviceCatalog(directory)
+    # unmodified, it travels as its path and the receiving process maps the same files
+    payload = pickle.dumps(mapped)
+    assert len(payload) < 1000
+    restored = pickle.loads(payload)
+    assert not restored.column('base_latency_ms').flags.writeable
+    _assert_same_catalog(restored, catalog)
+
+    # once changed, its columns travel with it
+    mapped.add_microservice(dict(catalog.get_microservice_at(0).to_dict(), id='svc-copy', base_latency_ms=1.0))
+    restored = pickle.loads(pickle.dumps(mapped))
+    assert restored.get_microservice_by_id('svc-copy').base_latency_ms == 1.0
+    _assert_same_catalog(restored, mapped)
@@ -0,0 +1,50 @@
+import contextlib
+import io
+import random
+
+import pytest
+
+from src.genetic_algo_logic.ga_runner import MOGA_Runner
+from src.genetic_algo_logic.adaptive_control import AdaptiveControl
+from src.genetic_algo_logic.checkpoint import load_checkpoint, save_checkpoint
+
+def _start(runner: MOGA_Runner, mode: str, num_generations: int, **kwargs):
+    if mode == 'run':
+        random.seed(5)
+        return runner.run(pop_size=40, num_generations=num_generations, **kwargs)
+    return runner.run_encoded(pop_size=40, num_generations=num_generations, seed=5, **kwargs)
+
+@pytest.mark.parametrize('mode', ['run', 'run_encoded'])
+@pytest.mark.parametrize('measure', [None, 'hypervolume', 'front_change'])
+def test_resume_is_bit_identical(simulator, scenario, tmp_path, mode, measure):
+    path = str(tmp_path / 'checkpoint.npz')
+    adaptive = lambda: AdaptiveControl(measure=measure, window=3, min_generations=5) if measure else None
+    with contextlib.redirect_stdout(io.StringIO()):
+        full = _start(MOGA_Runner(scenario, simulator), mode, 30, adaptive=adaptive())
+        _start(MOGA_Runner(scenario, simulator), mode, 7, adaptive=adaptive(), checkpoint_path=path, checkpoint_interval=1000)
+        resumed = MOGA_Runner(scenario, simulator).resume(path, num_generations=30)
+    assert resumed.genotypes.tolist() == full.genotypes.tolist()
+    assert resumed.objectives.tolist() == full.objectives.tolist()
+
+def test_resume_keeps_unknown_services_unknown(simulator, scenario, tmp_path):
+    path = str(tmp_path / 'checkpoint.npz')
+    with contextlib.redirect_stdout(io.StringIO()):
+        _start(MOGA_Runner(scenario, simulator), 'run', 5, checkpoint_path=path, checkpoint_interval=1000)
+    arrays, meta = load_checkpoint(path)
+    genotypes = arrays['population_genotypes']
+    genotypes[0, 0] = -1 # a service that is not in the catalog
+    save_checkpoint(path, arrays, meta)
+
+    runner = MOGA_Runner(scenario, simulator)
+    restored = {}
+    run_generations = runner._run_generations
+    def capture(population, *args):
+        restored['population'] = [list(ind) for ind in population]
+        return run_generations(population, *args)
+    runner._run_generations = capture
+    with contextlib.redirect_stdout(io.StringIO()):
+        runner.resume(path, num_generations=8)
+    ids = scenario.catalog.ids
+    assert restored['population'][0][0] is None
+    assert restored['population'][0][1:] == [ids[index] for index in genotypes[0, 1:].tolist()]
+    assert restored['population'][1:] == [[ids[index] for index in row] for row in genotypes[1:].tolist()]
@@ -0,0 +1,71 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from src.cli import main
+from src.microservice_catalog import MicroserviceCatalog
+
+def test_optimize_writes_the_front(catalog, catalog_path, capabilities, tmp_path, capsys):
+    output = tmp_path / 'front.json'
+    assert main(['optimize', catalog_path, *capabilities[:3], '--output', str(output)]) == 0
+    assert capsys.readouterr().out.splitlines()[-1].startswith('enumeration: ')
+    front = json.loads(output.read_text())
+    assert front
+    for record in front:
+        assert list(record['composition']) == capabilities[:3]
+        for capability, ms_id in record['composition'].items():
+            assert capability in catalog.get_microservice_by_id(ms_id).capabilities
+
+def test_optimize_with_workflow_sla_and_solver_limits(catalog_path, capabilities, tmp_path, capsys):
+    workflow = tmp_path / 'workflow.json'
+    workflow.write_text(json.dumps({'sequence': [0, {'parallel': [1, 2]}]}))
+    assert main(['optimize', catalog_path, *capabilities[:3], '--workflow', str(workflow), '--max-latency-ms', '250',
+                 '--enumeration-max-size', '0', '--print-front']) == 0
+    out = capsys.readouterr().out
+    assert 'branch_and_bound: ' in out
+    assert json.loads(out[out.index('['):])
+
+    assert main(['optimize', catalog_path, *capabilities[:3], '--enumeration-max-size', '0', '--pop-size', '20',
+                 '--generations', '3']) == 0
+    assert capsys.readouterr().out.splitlines()[-1].startswith('ga: ')
+
+def test_paths_are_relative_to_the_working_directory(catalog_path, capabilities, tmp_path, monkeypatch, capsys):
+    shutil.copy(catalog_path, tmp_path / 'local.json')
+    monkeypatch.chdir(tmp_path)
+    assert main(['optimize', 'local.json', *capabilities[:2], '--output', 'front.json']) == 0
+    assert os.path.isfile(tmp_path / 'front.json')
+
+def test_batch(catalog_path, capabilities, tmp_path, capsys):
+    scenarios = tmp_path / 'scenarios.json'
+    scenarios.write_text(json.dumps([
+        {'name': 'small', 'required_capabilities': capabilities[:2]},
+        {'name': 'loaded', 'required_capabilities': capabilities[:3], 'target_rps': 150.0,
+         'sla': {'max_latency_ms': 400.0}}
+    ]))
+    output = tmp_path / 'results.json'
+    assert main(['batch', catalog_path, str(scenarios), str(output), '--pop-size', '20', '--generations', '3']) == 0
+    results = json.loads(output.read_text())
+    assert [scenario['name'] for scenario in results['scenarios']] == ['small', 'loaded']
+    assert all(scenario['front'] for scenario in results['scenarios'])
+    assert '- small: ' in capsys.readouterr().out
+
+def test_convert_and_diff(catalog, catalog_path, records, tmp_path, capsys):
+    directory = tmp_path / 'binary'
+    assert main(['convert', catalog_path, str(directory)]) == 0
+    assert MicroserviceCatalog(str(directory)).ids == catalog.ids
+
+    newer = tmp_path / 'newer.json'
+    newer.write_text(json.dumps([dict(record, cost_per_request=1.0) if i == 0 else record
+                                 for i, record in enumerate(records[1:])]))
+    output = tmp_path / 'diff.json'
+    assert main(['diff', str(directory), str(newer), '--output', str(output)]) == 0
+    assert json.loads(output.read_text()) == {'updated': {records[1]['id']: {'cost_per_request': 1.0}}, 'added': [],
+                                              'removed': [records[0]['id']]}
+
+@pytest.mark.parametrize('argv', [[], ['optimize'], ['optimize', 'catalog.json'], ['unknown']])
+def test_argument_errors(argv, capsys):
+    with pytest.raises(SystemExit) as error:
+        main(argv)
+    assert error.value.code == 2
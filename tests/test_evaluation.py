@@ -0,0 +1,51 @@
+import contextlib
+import io
+import random
+
+import numpy as np
+import pytest
+
+from src.scenario_definition import ServiceScenario
+from src.workflow_model import Loop, Parallel, Sequence, Task
+from src.genetic_algo_logic.ga_runner import MOGA_Runner
+from src.genetic_algo_logic.fitness_cache import FitnessCache
+from src.genetic_algo_logic.parallel_evaluator import ParallelEvaluator
+
+def _front(archive) -> tuple:
+    return archive.genotypes.tolist(), archive.objectives.tolist()
+
+def _run(runner: MOGA_Runner, mode: str):
+    with contextlib.redirect_stdout(io.StringIO()):
+        if mode == 'run':
+            random.seed(3)
+            return runner.run(pop_size=60, num_generations=8)
+        return runner.run_encoded(pop_size=60, num_generations=8, seed=3)
+
+@pytest.mark.parametrize('mode', ['run', 'run_encoded'])
+def test_serial_parallel_and_cached_fronts_match(catalog, simulator, scenario, mode):
+    serial = _front(_run(MOGA_Runner(scenario, simulator), mode))
+    cached = _front(_run(MOGA_Runner(scenario, simulator, fitness_cache=FitnessCache(catalog)), mode))
+    with ParallelEvaluator(simulator, n_workers=2, chunksize=16) as evaluator:
+        parallel = _front(_run(MOGA_Runner(scenario, simulator, evaluator=evaluator), mode))
+    assert cached == serial
+    assert parallel == serial
+
+def test_batch_evaluation_matches_scalar_evaluation(simulator):
+    rng = np.random.default_rng(0)
+    ids = simulator.catalog.ids
+    index_matrix = rng.integers(0, len(ids), size=(50, 4))
+    index_matrix[::7, 1] = -1 # unknown services are skipped by both paths
+    batch = simulator.calculate_composite_metrics_batch(index_matrix)
+    for row, indices in enumerate(index_matrix.tolist()):
+        scalar = simulator.calculate_composite_metrics([ids[index] if index >= 0 else 'unknown' for index in indices])
+        assert scalar == pytest.approx({key: values[row] for key, values in batch.items()}, rel=1e-12)
+
+def test_shared_cache_keeps_scenarios_apart(catalog, simulator, capabilities):
+    # the same genotypes evaluate differently under a workflow, so a shared cache must not mix them up
+    workflow = Sequence(Task(0), Parallel(Task(1), Task(2)), Loop(Task(3), 2.0))
+    cache = FitnessCache(catalog)
+    for scenario in (ServiceScenario('Series', capabilities, catalog),
+                     ServiceScenario('Workflow', capabilities, catalog, workflow=workflow)):
+        for mode in ('run', 'run_encoded'):
+            shared = _front(_run(MOGA_Runner(scenario, simulator, fitness_cache=cache), mode))
+            assert shared == _front(_run(MOGA_Runner(scenario, simulator), mode))
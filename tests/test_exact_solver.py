@@ -0,0 +1,59 @@
+import contextlib
+import io
+import itertools
+
+import numpy as np
+import pytest
+
+from src.composition_simulator import METRIC_KEYS, SLAConstraints
+from src.scenario_definition import ServiceScenario
+from src.workflow_model import workflow_from_dict
+from src.genetic_algo_logic.exact_solver import ExactSolver, solve
+from src.genetic_algo_logic.pareto_archive import ParetoArchive
+
+def _brute_force_front(scenario: ServiceScenario, simulator) -> ParetoArchive:
+    # every composition of the unpruned options, evaluated without the SLA, then filtered by it
+    plain = ServiceScenario('Plain', scenario.required_capabilities, scenario.catalog, workflow=scenario.workflow,
+                            target_rps=scenario.target_rps)
+    index_matrix = np.array(list(itertools.product(*plain.get_slot_option_indices())), dtype=np.int64)
+    metrics = simulator.calculate_composite_metrics_batch(index_matrix, plain.workflow_plan, plain.load_model)
+    objectives = np.column_stack([metrics[key] for key in METRIC_KEYS])
+    archive = ParetoArchive(catalog=scenario.catalog, constraints=scenario.sla)
+    for start in range(0, len(index_matrix), 2048):
+        archive.update(index_matrix[start:start + 2048], objectives[start:start + 2048])
+    return archive
+
+def _members(archive: ParetoArchive) -> list:
+    return sorted(zip(map(tuple, archive.genotypes.tolist()), map(tuple, archive.objectives.tolist())))
+
+SCENARIO_OPTIONS = {
+    'series': {},
+    'workflow': {'workflow': workflow_from_dict({'sequence': [0, {'parallel': [1, 2]}]})},
+    'load': {'target_rps': 150.0},
+    'sla': {'sla': SLAConstraints(max_latency_ms=250.0, min_availability_percent=99.0)},
+}
+
+@pytest.mark.parametrize('variant', sorted(SCENARIO_OPTIONS))
+def test_exact_solvers_match_brute_force(catalog, simulator, capabilities, variant):
+    scenario = ServiceScenario('Exact', capabilities[:3], catalog, **SCENARIO_OPTIONS[variant])
+    expected = _members(_brute_force_front(scenario, simulator))
+    assert expected
+    solver = ExactSolver(scenario, simulator)
+    assert _members(solver.enumerate()) == expected
+    assert _members(solver.branch_and_bound()) == expected
+
+def test_solve_picks_the_method_by_size(catalog, simulator, capabilities):
+    series = ServiceScenario('Series', capabilities[:3], catalog)
+    constrained = ServiceScenario('SLA', capabilities[:3], catalog, **SCENARIO_OPTIONS['sla'])
+    ga_settings = {'pop_size': 20, 'num_generations': 3, 'seed': 0}
+    with contextlib.redirect_stdout(io.StringIO()):
+        archive, method = solve(series, simulator)
+        assert method == 'enumeration'
+        assert _members(archive) == _members(_brute_force_front(series, simulator))
+        # without an SLA the bound prunes nothing, so spaces too large to enumerate go to the GA
+        assert solve(series, simulator, enumeration_max_size=0, **ga_settings)[1] == 'ga'
+
+        archive, method = solve(constrained, simulator, enumeration_max_size=0)
+        assert method == 'branch_and_bound'
+        assert _members(archive) == _members(_brute_force_front(constrained, simulator))
+        assert solve(constrained, simulator, enumeration_max_size=0, branch_and_bound_max_size=0, **ga_settings)[1] == 'ga'
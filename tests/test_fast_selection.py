@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+from deap import tools
+
+from src.genetic_algo_logic.individual_creator import creator
+from src.genetic_algo_logic.fast_selection import sel_nsga2_fast
+
+def _population(seed: int, size: int, levels: int) -> list:
+    # objective values on a small grid, so equal fitnesses and equal crowding distances are common
+    rng = np.random.default_rng(seed)
+    population = []
+    for position, values in enumerate(rng.integers(0, levels, size=(size, 4)).astype(np.float64).tolist()):
+        individual = creator.Individual([position])
+        individual.fitness.values = tuple(values)
+        population.append(individual)
+    return population
+
+def _crowding(population: list) -> list:
+    # crowding distances left by the last selection (None for individuals outside the sorted fronts), reset for the next
+    distances = [getattr(ind.fitness, 'crowding_dist', None) for ind in population]
+    for ind in population:
+        ind.fitness.__dict__.pop('crowding_dist', None)
+    return distances
+
+@pytest.mark.parametrize('seed', range(10))
+@pytest.mark.parametrize('levels', [3, 50])
+def test_sel_nsga2_fast_matches_deap(seed, levels):
+    population = _population(seed, 120, levels)
+    for k in (1, 37, 60, 120):
+        expected = tools.selNSGA2(population, k)
+        expected_crowding = _crowding(population)
+        chosen = sel_nsga2_fast(population, k)
+        assert [id(ind) for ind in chosen] == [id(ind) for ind in expected]
+        assert _crowding(population) == expected_crowding
@@ -0,0 +1,45 @@
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+from src.composition_simulator import CompositionSimulator
+from src.genetic_algo_logic.fitness_cache import FitnessCache
+from src.genetic_algo_logic.island_model import IslandModelRunner
+
+class ScaledLatencySimulator(CompositionSimulator):
+    # a metric source other than the static catalog values (like live QoS measurements)
+    def _build_metric_arrays(self):
+        super()._build_metric_arrays()
+        self._metric_arrays['latency_ms'] = self._metric_arrays['latency_ms'] * 3.0 + 7.0
+
+def _members(front) -> list:
+    return sorted((tuple(ind), ind.fitness.values) for ind in front)
+
+def run_islands(scenario, simulator, n_workers: int, fitness_cache=None) -> list:
+    runner = IslandModelRunner(scenario, simulator, num_islands=3, migration_interval=3, n_workers=n_workers,
+                               seed=11, fitness_cache=fitness_cache)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return _members(runner.run(pop_size=30, num_generations=7))
+
+def assert_evaluated_by(simulator, members: list):
+    assert members
+    for ms_ids, fitness in members:
+        metrics = simulator.calculate_composite_metrics(list(ms_ids))
+        expected = (metrics['total_cost'], metrics['total_latency_ms'], metrics['total_availability_percent'],
+                    metrics['min_throughput_rps'])
+        assert fitness == pytest.approx(expected, rel=1e-12)
+
+@pytest.mark.parametrize('n_workers', [1, 2])
+def test_islands_evaluate_with_the_runner_simulator(catalog, scenario, n_workers):
+    simulator = ScaledLatencySimulator(catalog)
+    members = run_islands(scenario, simulator, n_workers, fitness_cache=FitnessCache(catalog))
+    assert_evaluated_by(simulator, members)
+    assert not np.isclose([fitness[1] for _, fitness in members],
+                          [CompositionSimulator(catalog).calculate_composite_metrics(list(ms_ids))['total_latency_ms']
+                           for ms_ids, _ in members]).any()
+
+def test_serial_and_parallel_islands_match(catalog, scenario):
+    simulator = ScaledLatencySimulator(catalog)
+    assert run_islands(scenario, simulator, 1) == run_islands(scenario, simulator, 2)
@@ -0,0 +1,57 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.load_model import ERLANG_EXACT_SERVERS, LoadModel, erlang_c
+
+def reference_erlang_c(a: float, c: int) -> float:
+    # textbook form, with the Poisson terms a^k e^-a / k! in log space: B = P(X = c) / P(X <= c), then C from B
+    log_terms = [k * math.log(a) - a - math.lgamma(k + 1) for k in range(c + 1)]
+    top = max(log_terms)
+    erlang_b = math.exp(log_terms[-1] - top) / sum(math.exp(term - top) for term in log_terms)
+    rho = a / c
+    return erlang_b / (1.0 - rho * (1.0 - erlang_b))
+
+def test_erlang_c_known_values():
+    # M/M/1: the queueing probability is the utilization; M/M/2 at a = 1: 1/3; M/M/10 at a = 8: 0.4092
+    assert erlang_c(np.array([0.5, 1.0, 8.0]), np.array([1, 2, 10])) == pytest.approx([0.5, 1.0 / 3.0, 0.40918], abs=1e-5)
+    # no stable queue without enough replicas
+    assert erlang_c(np.array([2.0, 3.0]), np.array([2, 1])).tolist() == [1.0, 1.0]
+
+@pytest.mark.parametrize('servers', [3, 17, 64, ERLANG_EXACT_SERVERS])
+@pytest.mark.parametrize('utilization', [0.3, 0.7, 0.95])
+def test_erlang_c_exact_recursion(servers, utilization):
+    a = utilization * servers
+    assert erlang_c(np.array([a]), np.array([servers]))[0] == pytest.approx(reference_erlang_c(a, servers), rel=1e-10)
+
+@pytest.mark.parametrize('servers', [ERLANG_EXACT_SERVERS + 1, 1000, 5000])
+@pytest.mark.parametrize('utilization', [0.7, 0.9, 0.98])
+def test_erlang_c_normal_approximation(servers, utilization):
+    a = utilization * servers
+    assert erlang_c(np.array([a]), np.array([servers]))[0] == pytest.approx(reference_erlang_c(a, servers), rel=1e-2)
+
+def test_erlang_c_mixes_exact_and_approximated_services():
+    servers = np.array([2, 10, 300, 2000])
+    a = servers * 0.8
+    expected = [reference_erlang_c(load, count) for load, count in zip(a.tolist(), servers.tolist())]
+    assert erlang_c(a, servers) == pytest.approx(expected, rel=1e-2)
+
+def test_service_metrics_size_replicas_for_the_target_utilization():
+    metric_arrays = {'throughput_rps': np.array([100.0, 0.0]), 'latency_ms': np.array([20.0, 5.0]),
+                     'availability': np.array([0.999, 0.99]), 'fixed_hourly_cost': np.array([0.5, 0.1])}
+    metrics = LoadModel(target_rps=1.0, target_utilization=0.8).service_metrics(metric_arrays, np.array([0, 1]), 150.0)
+    # 150 rps at 100 rps per replica: 2 replicas at 75% utilization, W_q = C(2, 1.5) / (200 - 150) seconds
+    assert metrics['replicas'].tolist() == [2.0, np.inf]
+    assert metrics['utilization'][0] == pytest.approx(0.75)
+    assert metrics['latency_ms'][0] == pytest.approx(20.0 + reference_erlang_c(1.5, 2) / 50.0 * 1000.0)
+    assert metrics['fixed_hourly_cost'].tolist() == [1.0, np.inf]
+    # a service without throughput never drains its queue
+    assert metrics['latency_ms'][1] == np.inf
+    assert metrics['utilization'][1] == np.inf
+    assert metrics['throughput_rps'].tolist() == [200.0, 0.0]
+
+    capped = LoadModel(target_rps=1.0, target_utilization=0.8, max_replicas=1).service_metrics(metric_arrays, np.array([0]), 150.0)
+    assert capped['latency_ms'][0] == np.inf
+    with pytest.raises(ValueError):
+        LoadModel(target_rps=0.0)
@@ -0,0 +1,47 @@
+import random
+
+import numpy as np
+from deap import tools
+
+from src.genetic_algo_logic.individual_creator import creator
+from src.genetic_algo_logic.pareto_archive import ParetoArchive
+
+def _batches(seed: int, num_batches: int = 6, batch_size: int = 40, num_slots: int = 3):
+    # few services per slot with small integer metrics, so duplicate genotypes and equal fitnesses
+    # of different genotypes are common; objectives are a function of the genotype, as in a real run
+    rng = np.random.default_rng(seed)
+    metrics = rng.integers(0, 3, size=(num_slots, 6, 4)).astype(np.float64)
+    for _ in range(num_batches):
+        genotypes = rng.integers(0, 6, size=(batch_size, num_slots)).astype(np.int32)
+        objectives = metrics[np.arange(num_slots), genotypes].sum(axis=1)
+        yield genotypes, objectives
+
+def _individuals(genotypes, objectives):
+    population = []
+    for genotype, values in zip(genotypes.tolist(), objectives.tolist()):
+        individual = creator.Individual(genotype)
+        individual.fitness.values = tuple(values)
+        population.append(individual)
+    return population
+
+def test_archive_matches_pareto_front_order():
+    for seed in range(20):
+        front = tools.ParetoFront()
+        archive = ParetoArchive()
+        for genotypes, objectives in _batches(seed):
+            front.update(_individuals(genotypes, objectives))
+            archive.update(genotypes, objectives)
+        expected = [(list(ind), ind.fitness.values) for ind in front]
+        actual = [(list(ind), ind.fitness.values) for ind in archive]
+        assert actual == expected
+
+def test_archive_matches_pareto_front_on_ties_within_one_batch():
+    random.seed(0)
+    genotypes = np.array([[i, i + 1] for i in range(8)], dtype=np.int32)
+    objectives = np.tile([1.0, 2.0, 99.0, 10.0], (8, 1))
+    front = tools.ParetoFront()
+    front.update(_individuals(genotypes, objectives))
+    archive = ParetoArchive()
+    archive.update(genotypes, objectives)
+    assert [list(ind) for ind in archive] == [list(ind) for ind in front]
+    assert [list(ind) for ind in archive] == genotypes[::-1].tolist()
@@ -0,0 +1,64 @@
+import contextlib
+import io
+import pickle
+import time
+
+import numpy as np
+import pytest
+
+from src.composition_simulator import CompositionSimulator
+from src.qos_providers import LiveQoSCache, StubQoSProvider
+from src.genetic_algo_logic.fitness_cache import FitnessCache
+from src.genetic_algo_logic.island_model import IslandModelRunner
+
+def _live(catalog, ttl_s: float = 60.0) -> LiveQoSCache:
+    live_qos = LiveQoSCache(StubQoSProvider(catalog, latency_jitter=0.5, seed=1), catalog, ttl_s=ttl_s)
+    live_qos.refresh()
+    return live_qos
+
+def test_measurements_expire_after_ttl(catalog):
+    live_qos = _live(catalog, ttl_s=0.2)
+    simulator = CompositionSimulator(catalog, live_qos=live_qos)
+    version = live_qos.version
+    assert len(live_qos) == len(catalog)
+    assert not np.isnan(live_qos.overlay()['base_latency_ms']).any()
+    assert not np.array_equal(simulator.metric_arrays()['latency_ms'], catalog.column('base_latency_ms'))
+
+    time.sleep(0.3)
+    assert live_qos.version == version + 1
+    assert len(live_qos) == 0
+    assert np.isnan(live_qos.overlay()['base_latency_ms']).all()
+    # the simulator notices the new version and falls back to the static catalog values
+    assert np.array_equal(simulator.metric_arrays()['latency_ms'], catalog.column('base_latency_ms'))
+
+def test_refresh_bumps_version_and_invalidates_cache(catalog):
+    live_qos = _live(catalog)
+    simulator = CompositionSimulator(catalog, live_qos=live_qos)
+    cache = FitnessCache(catalog, simulator=simulator)
+    cache.put((0, 1), (1.0, 2.0, 99.0, 10.0))
+    version = live_qos.version
+    live_qos.refresh()
+    assert live_qos.version == version + 1
+    assert cache.get((0, 1)) is None
+
+def test_simulator_pickles_with_its_live_measurements(catalog):
+    # what worker processes receive when they are not forked from the caller
+    simulator = CompositionSimulator(catalog, live_qos=_live(catalog))
+    restored = pickle.loads(pickle.dumps(simulator))
+    assert restored.version == simulator.version
+    for key, values in simulator.metric_arrays().items():
+        assert np.array_equal(restored.metric_arrays()[key], values)
+
+@pytest.mark.parametrize('n_workers', [1, 2])
+def test_islands_evaluate_with_live_measurements(catalog, scenario, n_workers):
+    simulator = CompositionSimulator(catalog, live_qos=_live(catalog))
+    runner = IslandModelRunner(scenario, simulator, num_islands=2, migration_interval=2, n_workers=n_workers, seed=3,
+                               fitness_cache=FitnessCache(catalog, simulator=simulator))
+    with contextlib.redirect_stdout(io.StringIO()):
+        front = runner.run(pop_size=20, num_generations=4)
+    assert len(front)
+    for ind in front:
+        metrics = simulator.calculate_composite_metrics(list(ind))
+        assert ind.fitness.values == pytest.approx((metrics['total_cost'], metrics['total_latency_ms'],
+                                                    metrics['total_availability_percent'],
+                                                    metrics['min_throughput_rps']), rel=1e-12)
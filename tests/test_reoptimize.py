@@ -0,0 +1,42 @@
+import contextlib
+import io
+
+import numpy as np
+
+from src.microservice_catalog import MicroserviceCatalog
+from src.composition_simulator import CompositionSimulator, METRIC_KEYS
+from src.scenario_definition import ServiceScenario
+from src.catalog_io import CatalogDiff
+from src.genetic_algo_logic.ga_runner import MOGA_Runner
+from src.genetic_algo_logic.fitness_cache import FitnessCache
+
+def test_reoptimize_after_apply_diff(catalog_path, capabilities):
+    catalog = MicroserviceCatalog(catalog_path)
+    simulator = CompositionSimulator(catalog)
+    scenario = ServiceScenario('Test Scenario', capabilities, catalog)
+    runner = MOGA_Runner(scenario, simulator, fitness_cache=FitnessCache(catalog, simulator=simulator))
+    with contextlib.redirect_stdout(io.StringIO()):
+        previous = runner.run_encoded(pop_size=40, num_generations=10, seed=2)
+    front = previous.genotypes.copy()
+
+    # retire a service of the front, make another one of the front expensive and add one that beats every option
+    retired, updated = int(front[0, 0]), int(front[-1, 1])
+    if updated == retired:
+        updated = int(front[-1, 2])
+    diff = CatalogDiff(
+        updated={catalog.ids[updated]: {'cost_per_request': 1.0}},
+        removed=[catalog.ids[retired]],
+        added=[{'id': 'svc-best', 'name': 'Best Service', 'type': 'search', 'capabilities': [capabilities[0]],
+                'base_latency_ms': 0.1, 'base_availability_percent': 99.999, 'base_throughput_rps': 10000.0,
+                'cost_per_request': 1e-6, 'fixed_hourly_cost': 1e-3}])
+    changed = catalog.apply_diff(diff)
+    with contextlib.redirect_stdout(io.StringIO()):
+        archive = runner.reoptimize(previous, changed, pop_size=40, num_generations=10, seed=2)
+
+    assert previous.genotypes.tolist() == front.tolist()
+    assert len(archive)
+    assert not np.isin(archive.genotypes, [retired]).any()
+    assert (archive.genotypes[:, 0] == catalog.index_of('svc-best')).any()
+    # every member's objectives come from the changed catalog, including the ones kept from the previous front
+    metrics = simulator.calculate_composite_metrics_batch(archive.genotypes)
+    assert np.allclose(archive.objectives, np.column_stack([metrics[key] for key in METRIC_KEYS]), rtol=1e-12)
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from src.composition_simulator import aggregate_composite_metrics
+from src.workflow_model import (Branch, Loop, Parallel, Sequence, Task, compile_workflow, workflow_from_dict)
+
+CAPABILITIES = ['auth', 'profile', 'recommend', 'payment', 'email']
+
+# five services, service i is the only option considered for slot i
+METRIC_ARRAYS = {
+    'latency_ms': np.array([10.0, 20.0, 30.0, 40.0, 50.0]),
+    'availability': np.array([0.99, 0.98, 0.97, 0.96, 0.95]),
+    'request_cost': np.array([1.0, 2.0, 3.0, 4.0, 5.0]),
+    'fixed_hourly_cost': np.array([10.0, 20.0, 30.0, 40.0, 50.0]),
+    'throughput_rps': np.array([100.0, 200.0, 300.0, 150.0, 500.0])
+}
+METRIC_ARRAYS['hourly_cost'] = METRIC_ARRAYS['request_cost'] + METRIC_ARRAYS['fixed_hourly_cost']
+
+WORKFLOW = Sequence(Task('auth'), Parallel(Task(1), Task(2)), Loop(Task('payment'), 2.0), Branch((0.6, Task(4))))
+
+def test_compile_workflow():
+    plan = compile_workflow(WORKFLOW, CAPABILITIES)
+    assert plan.instructions == [('task', 0), ('task', 1), ('task', 2), ('parallel', 2), ('task', 3), ('loop', 2.0),
+                                 ('task', 4), ('branch', (0.6,)), ('sequence', 4)]
+    assert plan.invocations.tolist() == [1.0, 1.0, 1.0, 2.0, 0.6]
+    # nested sequences and parallels are flattened, the JSON form compiles to the same plan
+    nested = Sequence(Sequence(Task(0), Parallel(Parallel(Task(1)), Task(2))), Loop(Task(3), 2), Branch((0.6, Task(4))))
+    assert compile_workflow(nested, CAPABILITIES).instructions == plan.instructions
+    spec = {'sequence': ['auth', {'parallel': [1, 2]}, {'loop': 'payment', 'iterations': 2}, {'branch': [[0.6, 4]]}]}
+    assert compile_workflow(workflow_from_dict(spec), CAPABILITIES).instructions == plan.instructions
+
+def test_aggregate_matches_hand_computed_metrics():
+    metrics = compile_workflow(WORKFLOW, CAPABILITIES).aggregate(
+        METRIC_ARRAYS, np.array([[0, 1, 2, 3, 4], [0, 1, -1, 3, 4], [-1, -1, -1, -1, -1]]))
+    # row 0: 10 + max(20, 30) + 2 * 40 + 0.6 * 50; the branch is skipped (and succeeds) with probability 0.4
+    # cost: fixed costs once, request costs per invocation; throughput: service 3 is called twice per request
+    assert metrics['total_latency_ms'].tolist() == pytest.approx([150.0, 140.0, np.inf])
+    assert metrics['total_availability_percent'].tolist() == pytest.approx(
+        [0.99 * 0.98 * 0.97 * 0.96 ** 2 * (0.6 * 0.95 + 0.4) * 100.0,
+         0.99 * 0.98 * 0.96 ** 2 * (0.6 * 0.95 + 0.4) * 100.0, 0.0])
+    assert metrics['total_cost'].tolist() == pytest.approx([150.0 + 17.0, 120.0 + 14.0, np.inf])
+    assert metrics['min_throughput_rps'].tolist() == pytest.approx([75.0, 75.0, 0.0])
+    assert {key: values.tolist() for key, values in aggregate_composite_metrics(
+        METRIC_ARRAYS, np.array([[0, 1, 2, 3, 4]]), compile_workflow(WORKFLOW, CAPABILITIES)).items()} == \
+        {key: values[:1].tolist() for key, values in metrics.items()}
+
+def test_plain_sequence_matches_series_aggregation():
+    rows = np.array([[0, 1, 2, 3, 4], [4, 3, -1, 1, 0], [2, 2, 2, 2, 2]])
+    plan = compile_workflow(Sequence(*map(Task, range(5))), CAPABILITIES)
+    workflow_metrics, series_metrics = plan.aggregate(METRIC_ARRAYS, rows), aggregate_composite_metrics(METRIC_ARRAYS, rows)
+    for key, values in series_metrics.items():
+        assert workflow_metrics[key] == pytest.approx(values, rel=1e-12)
+
+@pytest.mark.parametrize('workflow', [
+    Sequence(Task(0), Task(1), Task(2), Task(3)), # slot 4 is never called
+    Sequence(Task(0), Task(1), Task(2), Task(3), Task(5)),
+    Sequence(Task('unknown'), Task(0), Task(1), Task(2), Task(3), Task(4)),
+    Sequence(Task(0), Task(1), Task(2), Task(3), Branch((0.7, Task(4)), (0.5, Task(0)))),
+    Sequence(Task(0), Task(1), Task(2), Task(3), Loop(Task(4), 0.0)),
+    Sequence(Task(0), Task(1), Task(2), Task(3), Task(4), Parallel())
+])
+def test_invalid_workflows(workflow):
+    with pytest.raises(ValueError):
+        compile_workflow(workflow, CAPABILITIES)